@@ -1,10 +1,20 @@
+from django.urls import path
 from django.contrib import admin
+from django.db.models import Count
+from django.contrib.admin.widgets import AutocompleteSelect, AutocompleteSelectMultiple
+from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from apps.applications.models import (
     Region, District, Branch, Specialty, Specialist,
     SpecialistsRequired, Equipment, EquipmentRequired,
     EquipmentRequiredItem, Application, ApplicationBranch
 )
+from apps.applications.filters import search_applications
+from apps.applications.reference_data import CATALOG_MODELS
+from apps.common.autocomplete import CachedAutocompleteJsonView
+from apps.common.changelist import LargeTableAdminMixin, RelatedAdminFieldListFilter
+
+CustomUser = get_user_model()
 
 
 @admin.register(Region)
@@ -21,16 +31,28 @@ class DistrictAdmin(admin.ModelAdmin):
     search_fields = ('district_name', 'region__region_name')
     autocomplete_fields = ['region']
     ordering = ('region', 'district_name')
+    list_select_related = ('region',)
+
+    def get_queryset(self, request):
+        # __str__ viloyat nomini ham ko'rsatadi (autocomplete ham shu querysetdan)
+        qs = super().get_queryset(request)
+        return qs.select_related('region')
 
 
 @admin.register(Branch)
 class BranchAdmin(admin.ModelAdmin):
     list_display = ('id', 'branch_name', 'district', 'get_region')
-    list_filter = ('district__region', 'district')
+    list_filter = ('district__region', ('district', RelatedAdminFieldListFilter))
     search_fields = ('branch_name', 'district__district_name', 'district__region__region_name')
     autocomplete_fields = ['district']
     ordering = ('district__region', 'district', 'branch_name')
+    list_select_related = ('district__region',)
     
+    def get_queryset(self, request):
+        # __str__ tuman va viloyat nomidan tuziladi (autocomplete ham shu querysetdan)
+        qs = super().get_queryset(request)
+        return qs.select_related('district__region')
+
     def get_region(self, obj):
         return obj.district.region.region_name
     get_region.short_description = _('Region')
@@ -58,6 +80,7 @@ class SpecialistsRequiredAdmin(admin.ModelAdmin):
     search_fields = ('specialty__name', 'required_specialists__title')
     autocomplete_fields = ['specialty', 'required_specialists']
     ordering = ('specialty', 'required_specialists')
+    list_select_related = ('specialty', 'required_specialists')
     
     fieldsets = (
         (_('Specialty Information'), {
@@ -102,23 +125,57 @@ class EquipmentRequiredAdmin(admin.ModelAdmin):
     autocomplete_fields = ['specialty']
     inlines = [EquipmentRequiredItemInline]
     ordering = ('specialty',)
+    list_select_related = ('specialty',)
     
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.select_related('specialty').annotate(equipment_count=Count('items'))
+
     def get_equipment_count(self, obj):
-        return obj.items.count()
+        return obj.equipment_count
     get_equipment_count.short_description = _('Equipment Count')
+    get_equipment_count.admin_order_field = 'equipment_count'
+
+
+class CatalogAutocompleteSelect(AutocompleteSelect):
+    url_name = "%s:applications_catalog_autocomplete"
+
+
+class CatalogAutocompleteSelectMultiple(AutocompleteSelectMultiple):
+    url_name = "%s:applications_catalog_autocomplete"
 
 
 class ApplicationBranchInline(admin.TabularInline):
     model = ApplicationBranch
     extra = 1
-    autocomplete_fields = ['branch']
-    filter_horizontal = ('specialties', 'selected_specialists', 'selected_equipment')
+    # Sahifada faqat tanlangan qiymatlar chiqadi, qolganlari keshlangan autocomplete orqali
+    autocomplete_fields = ['branch', 'specialties', 'selected_specialists', 'selected_equipment']
     verbose_name = _("Branch")
     verbose_name_plural = _("Branches")
 
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.select_related('branch__district__region').prefetch_related(
+            'specialties',
+            'selected_specialists',
+            'selected_equipment'
+        )
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in self.autocomplete_fields:
+            kwargs['widget'] = CatalogAutocompleteSelect(db_field, self.admin_site, using=kwargs.get('using'))
+        if db_field.name == 'branch':
+            kwargs['queryset'] = Branch.objects.select_related('district__region')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        if db_field.name in self.autocomplete_fields:
+            kwargs['widget'] = CatalogAutocompleteSelectMultiple(db_field, self.admin_site, using=kwargs.get('using'))
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
+
 
 @admin.register(Application)
-class ApplicationAdmin(admin.ModelAdmin):
+class ApplicationAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         'id',
         'registration_number', 
@@ -140,6 +197,8 @@ class ApplicationAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'updated_at', 'registration_number')
     autocomplete_fields = ['user']
     date_hierarchy = 'created_at'
+    # application_created_id_idx indeksi bilan bir xil tartib
+    ordering = ('-created_at', '-id')
     inlines = [ApplicationBranchInline]
     
     fieldsets = (
@@ -170,6 +229,26 @@ class ApplicationAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         return qs.select_related('user')
 
+    def get_urls(self):
+        catalog_autocomplete = CachedAutocompleteJsonView.as_view(admin_site=self.admin_site, cache_models=CATALOG_MODELS)
+        return [
+            path(
+                'catalog-autocomplete/',
+                self.admin_site.admin_view(catalog_autocomplete),
+                name='applications_catalog_autocomplete',
+            ),
+        ] + super().get_urls()
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        # Foydalanuvchi nomi faqat to'liq mos kelganda, users jadvali bilan JOIN qilinmaydi
+        by_username = queryset.filter(
+            user__in=CustomUser.objects.filter(username=search_term).values('pk')
+        )
+        return search_applications(queryset, search_term) | by_username, False
+
 
 @admin.register(ApplicationBranch)
 class ApplicationBranchAdmin(admin.ModelAdmin):
@@ -184,7 +263,7 @@ class ApplicationBranchAdmin(admin.ModelAdmin):
     )
     list_filter = (
         'branch__district__region',
-        'branch__district',
+        ('branch__district', RelatedAdminFieldListFilter),
         'specialties'
     )
     search_fields = (
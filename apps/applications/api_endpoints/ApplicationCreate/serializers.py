@@ -1,11 +1,11 @@
 from rest_framework import serializers
 from django.utils.translation import gettext as _
 
-from apps.applications.models import (
-    Application, ApplicationBranch, Specialty, 
-    Specialist, Equipment, SpecialistsRequired,
-    EquipmentRequired, EquipmentRequiredItem, Branch
-)
+from apps.applications.models import Application
+from apps.applications.catalog import CatalogResolver
+from apps.applications.uploads import validate_document_file
+from apps.applications.requirements import check_requirements, get_requirements_index
+from apps.applications.services import create_application_branches
 
 
 class ApplicationBranchSerializer(serializers.Serializer):
@@ -26,33 +26,41 @@ class ApplicationBranchSerializer(serializers.Serializer):
         allow_empty=True
     )
 
+    @property
+    def catalog_resolver(self):
+        return self.context.setdefault('catalog_resolver', CatalogResolver())
+
+    @property
+    def requirements_index(self):
+        if 'requirements_index' not in self.context:
+            self.context['requirements_index'] = get_requirements_index()
+        return self.context['requirements_index']
+
     def validate_branch(self, value):
-        try:
-            branch = Branch.objects.get(branch_name__iexact=value.strip())
-            return branch
-        except Branch.DoesNotExist:
+        branches = self.catalog_resolver.resolve('branch', value)
+        if not branches:
             raise serializers.ValidationError(
                f'Filial "{value}" topilmadi. Iltimos, to\'g\'ri filial nomini kiriting.'
             )
-        except Branch.MultipleObjectsReturned:
+        if len(branches) > 1:
             raise serializers.ValidationError(
                 f'"{value}" nomli bir nechta filial mavjud. Aniqroq nom kiriting.'
             )
+        return branches[0]
 
     def validate_specialties(self, value):
         specialty_objects = []
         not_found = []
         
-        for specialty_name in value:
-            try:
-                specialty = Specialty.objects.get(name__iexact=specialty_name.strip())
-                specialty_objects.append(specialty)
-            except Specialty.DoesNotExist:
+        for specialty_name, matches in self.catalog_resolver.resolve_many('specialties', value):
+            if not matches:
                 not_found.append(specialty_name)
-            except Specialty.MultipleObjectsReturned:
+            elif len(matches) > 1:
                 raise serializers.ValidationError(
                    f'"{specialty_name}" nomli bir nechta ixtisoslik mavjud. Aniqroq nom kiriting.'
                 )
+            else:
+                specialty_objects.append(matches[0])
         
         if not_found:
             raise serializers.ValidationError(
@@ -68,16 +76,15 @@ class ApplicationBranchSerializer(serializers.Serializer):
         specialist_objects = []
         not_found = []
         
-        for specialist_title in value:
-            try:
-                specialist = Specialist.objects.get(title__iexact=specialist_title.strip())
-                specialist_objects.append(specialist)
-            except Specialist.DoesNotExist:
+        for specialist_title, matches in self.catalog_resolver.resolve_many('selected_specialists', value):
+            if not matches:
                 not_found.append(specialist_title)
-            except Specialist.MultipleObjectsReturned:
+            elif len(matches) > 1:
                 raise serializers.ValidationError(
                     f'"{specialist_title}" lavozimli bir nechta mutaxassis mavjud. Aniqroq lavozim kiriting.'
                 )
+            else:
+                specialist_objects.append(matches[0])
         
         if not_found:
             raise serializers.ValidationError(
@@ -93,16 +100,15 @@ class ApplicationBranchSerializer(serializers.Serializer):
         equipment_objects = []
         not_found = []
         
-        for equipment_name in value:
-            try:
-                equipment = Equipment.objects.get(name__iexact=equipment_name.strip())
-                equipment_objects.append(equipment)
-            except Equipment.DoesNotExist:
+        for equipment_name, matches in self.catalog_resolver.resolve_many('selected_equipment', value):
+            if not matches:
                 not_found.append(equipment_name)
-            except Equipment.MultipleObjectsReturned:
+            elif len(matches) > 1:
                 raise serializers.ValidationError(
                    f'"{equipment_name}" nomli bir nechta uskuna mavjud. Aniqroq nom kiriting.'
                 )
+            else:
+                equipment_objects.append(matches[0])
         
         if not_found:
             raise serializers.ValidationError(
@@ -116,26 +122,28 @@ class ApplicationBranchSerializer(serializers.Serializer):
         selected_specialists = data.get('selected_specialists', [])
         selected_equipment = data.get('selected_equipment', [])
         
-        specialist_requirements = self._get_specialist_requirements(specialties)
-        equipment_requirements = self._get_equipment_requirements(specialties)
-        
-        specialist_errors = self._validate_specialist_requirements(
-            specialties,
-            selected_specialists,
-            specialist_requirements
-        )
-        
-        equipment_errors = self._validate_equipment_requirements(
-            specialties,
-            selected_equipment,
-            equipment_requirements
+        report = check_requirements(
+            [specialty.id for specialty in specialties],
+            [specialist.id for specialist in selected_specialists],
+            [equipment.id for equipment in selected_equipment],
+            index=self.requirements_index,
         )
         
-        if specialist_errors or equipment_errors:
+        if not report.is_satisfied:
+            specialty_names = {specialty.id: specialty.name for specialty in specialties}
+            specialist_errors = self._validate_specialist_requirements(
+                specialty_names,
+                report.specialist_deficits
+            )
+            equipment_errors = self._validate_equipment_requirements(
+                specialty_names,
+                report.equipment_deficits
+            )
+            
             error_details = {
                 'requirements_not_met': True,
-                'specialist_requirements': specialist_requirements,
-                'equipment_requirements': equipment_requirements,
+                'specialist_requirements': self._get_specialist_requirements(specialties),
+                'equipment_requirements': self._get_equipment_requirements(specialties),
             }
             
             if specialist_errors:
@@ -151,15 +159,11 @@ class ApplicationBranchSerializer(serializers.Serializer):
         requirements = []
         
         for specialty in specialties:
-            required_qs = SpecialistsRequired.objects.filter(
-                specialty=specialty
-            ).select_related('required_specialists')
-            
-            for req in required_qs:
+            for specialist_id, title, min_count in self.requirements_index.specialists.get(specialty.id, ()):
                 requirements.append({
                     'specialty': specialty.name,
-                    'specialist_title': req.required_specialists.title,
-                    'min_count': req.min_count
+                    'specialist_title': title,
+                    'min_count': min_count
                 })
         
         return requirements
@@ -168,66 +172,99 @@ class ApplicationBranchSerializer(serializers.Serializer):
         requirements = []
         
         for specialty in specialties:
-            try:
-                equipment_req = EquipmentRequired.objects.get(specialty=specialty)
-                items = EquipmentRequiredItem.objects.filter(
-                    equipment_required=equipment_req
-                ).select_related('equipment')
-                
-                for item in items:
-                    requirements.append({
-                        'specialty': specialty.name,
-                        'equipment_name': item.equipment.name,
-                        'min_count': item.min_count
-                    })
-            except EquipmentRequired.DoesNotExist:
-                continue
+            for equipment_id, name, min_count in self.requirements_index.equipment.get(specialty.id, ()):
+                requirements.append({
+                    'specialty': specialty.name,
+                    'equipment_name': name,
+                    'min_count': min_count
+                })
         
         return requirements
 
-    def _validate_specialist_requirements(self, specialties, selected_specialists, requirements):
+    def _validate_specialist_requirements(self, specialty_names, deficits):
         errors = []
         
-        for req in requirements:
-            count = sum(1 for sp in selected_specialists if sp.title == req['specialist_title'])
-            
-            if count < req['min_count']:
-                errors.append({
-                    'specialty': req['specialty'],
-                    'specialist_title': req['specialist_title'],
-                    'required': req['min_count'],
-                    'provided': count,
-                    'message': (
-                        f'"{req["specialty"]}" ixtisosligi uchun "{req["specialist_title"]}" '
-                        f'lavozimidan kamida {req["min_count"]} ta kerak '
-                        f'(Siz {count} ta tanladingiz)'
-                    )
-                })
+        for deficit in deficits:
+            specialty = ", ".join(specialty_names[specialty_id] for specialty_id in deficit['specialty_ids'])
+            errors.append({
+                'specialty': specialty,
+                'specialist_id': deficit['id'],
+                'specialist_title': deficit['name'],
+                'required': deficit['required'],
+                'provided': deficit['provided'],
+                'missing': deficit['missing'],
+                'message': (
+                    f'"{specialty}" ixtisosligi uchun "{deficit["name"]}" '
+                    f'lavozimidan kamida {deficit["required"]} ta kerak '
+                    f'(Siz {deficit["provided"]} ta tanladingiz)'
+                )
+            })
         
         return errors
 
-    def _validate_equipment_requirements(self, specialties, selected_equipment, requirements):
+    def _validate_equipment_requirements(self, specialty_names, deficits):
         errors = []
         
-        for req in requirements:
-            count = sum(1 for eq in selected_equipment if eq.name == req['equipment_name'])
-            
-            if count < req['min_count']:
-                errors.append({
-                    'specialty': req['specialty'],
-                    'equipment_name': req['equipment_name'],
-                    'required': req['min_count'],
-                    'provided': count,
-                    'message': (
-                        f'"{req["specialty"]}" ixtisosligi uchun "{req["equipment_name"]}" '
-                        f'dan kamida {req["min_count"]} ta kerak '
-                        f'(Siz {count} ta tanladingiz)'
-                    )
-                })
+        for deficit in deficits:
+            specialty = ", ".join(specialty_names[specialty_id] for specialty_id in deficit['specialty_ids'])
+            errors.append({
+                'specialty': specialty,
+                'equipment_id': deficit['id'],
+                'equipment_name': deficit['name'],
+                'required': deficit['required'],
+                'provided': deficit['provided'],
+                'missing': deficit['missing'],
+                'message': (
+                    f'"{specialty}" ixtisosligi uchun "{deficit["name"]}" '
+                    f'dan kamida {deficit["required"]} ta kerak '
+                    f'(Siz {deficit["provided"]} ta tanladingiz)'
+                )
+            })
         
         return errors
 
 
+def validate_application_branches(value, context):
+    """
+    Validate the ``branches`` list of an application with one reused
+    ApplicationBranchSerializer. Names are resolved through the
+    ``catalog_resolver`` of ``context`` (collected up front) or a new one;
+    errors are keyed ``branch_<n>``.
+    """
+    if not isinstance(value, list):
+        raise serializers.ValidationError(_("Branches must be a list"))
+    
+    if len(value) == 0:
+        raise serializers.ValidationError(_("At least one branch is required"))
+    
+    validated_branches = []
+    errors = {}
+    catalog_resolver = context.get('catalog_resolver')
+    if catalog_resolver is None:
+        catalog_resolver = CatalogResolver.for_branches(value)
+    else:
+        for branch_data in value:
+            catalog_resolver.collect(branch_data)
+
+    branch_context = {
+        'catalog_resolver': catalog_resolver,
+        'requirements_index': context.get('requirements_index') or get_requirements_index(),
+    }
+    
+    # Bitta serializer barcha filiallar uchun qayta ishlatiladi
+    serializer = ApplicationBranchSerializer(context=branch_context)
+    for idx, branch_data in enumerate(value):
+        try:
+            validated_branches.append(serializer.run_validation(branch_data))
+        except serializers.ValidationError as exc:
+            errors[f"branch_{idx}"] = exc.detail
+    
+    if errors:
+        raise serializers.ValidationError(errors)
+    
+    return validated_branches
+
+
 class ApplicationCreateSerializer(serializers.ModelSerializer):
     branches = serializers.ListField(
         child=serializers.DictField(),
@@ -243,42 +280,11 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
         ]
     
     def validate_branches(self, value):
-        if not isinstance(value, list):
-            raise serializers.ValidationError(_("Branches must be a list"))
-        
-        if len(value) == 0:
-            raise serializers.ValidationError(_("At least one branch is required"))
-        
-        validated_branches = []
-        errors = {}
-        
-        for idx, branch_data in enumerate(value):
-            serializer = ApplicationBranchSerializer(data=branch_data)
-            if serializer.is_valid():
-                validated_branches.append(serializer.validated_data)
-            else:
-                errors[f"branch_{idx}"] = serializer.errors
-        
-        if errors:
-            raise serializers.ValidationError(errors)
-        
-        return validated_branches
+        return validate_application_branches(value, self.context)
         
     def validate_document_file(self, document_file):
         if document_file:
-            MAX_FILE_SIZE = 10 * 1024 * 1024 
-            if document_file.size > MAX_FILE_SIZE:
-                raise serializers.ValidationError(
-                    _("Fayl hajmi 10 MB dan oshmasligi kerak.")
-                )
-                
-            file_extension = document_file.name.split('.')[-1].lower()
-            ALLOWED_EXTENSIONS = ['pdf', 'jpg', 'png']
-            
-            if file_extension not in ALLOWED_EXTENSIONS:
-                raise serializers.ValidationError(
-                    _("Faqat PDF, JPG va PNG formatlari ruxsat etiladi.")
-                )
+            validate_document_file(document_file)
                 
         return document_file
     
@@ -286,23 +292,6 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
         branches_data = validated_data.pop('branches')
         
         application_instance = Application.objects.create(**validated_data)
+        create_application_branches(application_instance, branches_data)
         
-        for branch_data in branches_data:
-            specialties = branch_data.pop('specialties', [])
-            selected_specialists = branch_data.pop('selected_specialists', [])
-            selected_equipment = branch_data.pop('selected_equipment', [])
-            branch_instance = branch_data.pop('branch')
-            
-            app_branch = ApplicationBranch.objects.create(
-                application=application_instance,
-                branch=branch_instance
-            )
-            
-            if specialties:
-                app_branch.specialties.set(specialties)
-            if selected_specialists:
-                app_branch.selected_specialists.set(selected_specialists)
-            if selected_equipment:
-                app_branch.selected_equipment.set(selected_equipment)
-        
-        return application_instance
\ No newline at end of file
+        return application_instance
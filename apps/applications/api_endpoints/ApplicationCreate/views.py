@@ -8,11 +8,12 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 
 from apps.applications.choices import ApplicationStatus
-from apps.applications.utils import generate_registration_number, send_application_email
+from apps.applications.uploads import DocumentUploadMixin
+from apps.applications.utils import allocate_registration_number, send_application_email
 from apps.applications.api_endpoints.ApplicationCreate.serializers import ApplicationCreateSerializer
 
 
-class ApplicationCreateAPIView(CreateAPIView):
+class ApplicationCreateAPIView(DocumentUploadMixin, CreateAPIView):
     """
     POST /api/applications/application-create/
     Create a new application with branches
@@ -58,19 +59,17 @@ class ApplicationCreateAPIView(CreateAPIView):
             
             status_value = ApplicationStatus.SUBMITTED if action == 'submit' else ApplicationStatus.DRAFT
             
+            # Registratsiya raqami status bilan bitta INSERT ichida yoziladi
+            registration_number = allocate_registration_number() if action == 'submit' else None
+            
             application = serializer.save(
                 user=self.request.user if self.request.user.is_authenticated else None,
-                status=status_value
+                status=status_value,
+                registration_number=registration_number
             )
             
             if action == 'submit':
-                application.registration_number = generate_registration_number()
-                application.save(update_fields=['registration_number'])
-                
-                try:
-                    send_application_email(application)
-                except Exception as e:
-                    print(f"Email sending failed: {str(e)}")
+                send_application_email(application)
                 
                 message = _("Ariza muvaffaqiyatli yuborildi! Ro'yxatdan o'tish raqamingiz: {reg_number}").format(
                     reg_number=application.registration_number
@@ -0,0 +1 @@
+from .views import ApplicationDocumentAPIView
\ No newline at end of file
@@ -0,0 +1,40 @@
+import posixpath
+
+from django.utils.translation import gettext as _
+
+from rest_framework.views import APIView
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+
+from apps.common.media import serve_file
+from apps.applications.models import Application
+
+
+class ApplicationDocumentAPIView(APIView):
+    """
+    GET /api/applications/application/{id}/document/
+
+    Download the document of an application. Only its owner and staff users
+    can read it. Supports Range, If-Range and If-None-Match requests; behind
+    a proxy the transfer is handed over with X-Accel-Redirect or X-Sendfile
+    (MEDIA_SENDFILE_BACKEND).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        # Egasi yoki staff tekshiruvi bitta (pk bo'yicha) so'rovda
+        queryset = Application.objects.filter(pk=pk)
+        if not request.user.is_staff:
+            queryset = queryset.filter(user=request.user)
+        name = queryset.values_list('document_file', flat=True).first()
+        if not name:
+            raise NotFound(_("Hujjat topilmadi."))
+
+        storage = Application._meta.get_field('document_file').storage
+        filename = f"document-{pk}{posixpath.splitext(name)[1]}"
+        return serve_file(request, storage, name, filename=filename)
+
+
+__all__ = [
+    'ApplicationDocumentAPIView'
+]
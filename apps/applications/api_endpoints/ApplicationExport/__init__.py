@@ -0,0 +1 @@
+from .views import ApplicationExportAPIView
\ No newline at end of file
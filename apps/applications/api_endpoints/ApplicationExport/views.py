@@ -0,0 +1,49 @@
+from django.utils import timezone
+from django.http import StreamingHttpResponse
+from django.utils.translation import gettext as _
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+
+from apps.applications.export import stream_applications_csv, stream_applications_ndjson
+from apps.applications.api_endpoints.ApplicationList.views import ApplicationListAPIView
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_applications_csv, 'text/csv; charset=utf-8'),
+    'ndjson': (stream_applications_ndjson, 'application/x-ndjson; charset=utf-8'),
+}
+
+
+class ApplicationExportAPIView(ApplicationListAPIView):
+    """
+    GET /api/applications/application-export/?export_format=csv
+    GET /api/applications/application-export/?export_format=ndjson&include_branches=true&status=submitted
+
+    Stream all applications matching the list filters (status, document_type,
+    search, ordering) as CSV or NDJSON. With include_branches=true each
+    application's branches and their specialty, specialist and equipment
+    selections are included.
+    """
+    permission_classes = [IsAdminUser]
+    pagination_class = None
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.query_params.get('export_format', 'csv').lower()
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError({'export_format': _("Noma'lum format. csv yoki ndjson tanlang.")})
+        include_branches = request.query_params.get('include_branches', '').lower() in ('1', 'true', 'yes')
+
+        stream, content_type = EXPORT_FORMATS[export_format]
+        queryset = self.filter_queryset(self.get_queryset())
+        filename = f"applications-{timezone.localtime():%Y%m%d-%H%M%S}.{export_format}"
+
+        response = StreamingHttpResponse(stream(queryset, include_branches=include_branches), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['Cache-Control'] = 'no-store'
+        return response
+
+
+__all__ = [
+    'ApplicationExportAPIView'
+]
@@ -1,13 +1,12 @@
-from django.utils.translation import gettext as _
 from django_filters.rest_framework import DjangoFilterBackend
 
-from rest_framework import status
 from rest_framework import filters
-from rest_framework.response import Response
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 
+from apps.common.pagination import KeysetCursorPagination
 from apps.applications.models import Application
+from apps.applications.filters import ApplicationSearchFilter
 from apps.applications.api_endpoints.ApplicationList.serializers import ApplicationListSerializer
 
 class ApplicationListAPIView(ListAPIView):
@@ -17,15 +16,17 @@ class ApplicationListAPIView(ListAPIView):
     GET /api/applications/?status=DRAFT
     GET /api/applications/?status=SUBMITTED
     GET /api/applications/?search=john
-    List all applications with filtering and search
+    GET /api/applications/?ordering=updated_at&cursor=<next>
+    List all applications with filtering and search, paginated by cursor
     """
     serializer_class = ApplicationListSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, ApplicationSearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'document_type']
     search_fields = ['first_name', 'last_name', 'email', 'phone_number', 'registration_number']
     ordering_fields = ['created_at', 'updated_at']
     ordering = ['-created_at']
+    pagination_class = KeysetCursorPagination
     
     def get_queryset(self):
         queryset = Application.objects.all()
@@ -33,16 +34,6 @@ class ApplicationListAPIView(ListAPIView):
             queryset = queryset.filter(user=self.request.user)
 
         return queryset
-    
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        if not queryset.exists():
-            return Response({
-                "message": _("Sizda hali arizalar mavjud emas.")
-            },
-            status=status.HTTP_204_NO_CONTENT)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
 
 
 __all__ = [
@@ -1,11 +1,12 @@
-from django.utils.translation import gettext as _
+from django.urls import reverse
 
 from rest_framework import serializers
 
-from apps.applications.models import (Application, ApplicationBranch, 
-                                      SpecialistsRequired, EquipmentRequired,
-                                      EquipmentRequiredItem) 
-from apps.applications.api_endpoints.ApplicationCreate.serializers import ApplicationBranchSerializer
+from apps.applications.models import Application, ApplicationBranch
+from apps.applications.uploads import validate_document_file
+from apps.applications.requirements import get_requirements_index
+from apps.applications.services import sync_application_branches
+from apps.applications.api_endpoints.ApplicationCreate.serializers import validate_application_branches
 
 
 class ApplicationUpdateSerializer(serializers.ModelSerializer):
@@ -28,42 +29,11 @@ class ApplicationUpdateSerializer(serializers.ModelSerializer):
     
     def validate_branches(self, value):
         """Validate branches data using string inputs"""
-        if not isinstance(value, list):
-            raise serializers.ValidationError(_("Branches must be a list"))
-        
-        if len(value) == 0:
-            raise serializers.ValidationError(_("At least one branch is required"))
-        
-        validated_branches = []
-        errors = {}
-        
-        for idx, branch_data in enumerate(value):
-            serializer = ApplicationBranchSerializer(data=branch_data)
-            if serializer.is_valid():
-                validated_branches.append(serializer.validated_data)
-            else:
-                errors[f"branch_{idx}"] = serializer.errors
-        
-        if errors:
-            raise serializers.ValidationError(errors)
-        
-        return validated_branches
+        return validate_application_branches(value, self.context)
     
     def validate_document_file(self, document_file):
         if document_file:
-            MAX_FILE_SIZE = 10 * 1024 * 1024 
-            if document_file.size > MAX_FILE_SIZE:
-                raise serializers.ValidationError(
-                    _("Fayl hajmi 10 MB dan oshmasligi kerak.")
-                )
-                
-            file_extension = document_file.name.split('.')[-1].lower()
-            ALLOWED_EXTENSIONS = ['pdf', 'jpg', 'png']
-            
-            if file_extension not in ALLOWED_EXTENSIONS:
-                raise serializers.ValidationError(
-                    _("Faqat PDF, JPG va PNG formatlari ruxsat etiladi.")
-                )
+            validate_document_file(document_file)
                 
         return document_file
     
@@ -75,23 +45,7 @@ class ApplicationUpdateSerializer(serializers.ModelSerializer):
         instance.save()
         
         if branches_data is not None:
-            for branch_data in branches_data:
-                specialties = branch_data.pop('specialties', [])
-                selected_specialists = branch_data.pop('selected_specialists', [])
-                selected_equipment = branch_data.pop('selected_equipment', [])
-                branch_instance = branch_data.pop('branch')
-                
-                app_branch = ApplicationBranch.objects.create(
-                    application=instance,
-                    branch=branch_instance
-                )
-                
-                if specialties:
-                    app_branch.specialties.set(specialties)
-                if selected_specialists:
-                    app_branch.selected_specialists.set(selected_specialists)
-                if selected_equipment:
-                    app_branch.selected_equipment.set(selected_equipment)
+            sync_application_branches(instance, branches_data)
         
         return instance
                                       
@@ -120,28 +74,32 @@ class ApplicationBranchRetrieveSerializer(serializers.ModelSerializer):
     def get_specialties_details(self, obj):
         return [{'id': s.id, 'name': s.name} for s in obj.specialties.all()]
     
+    @property
+    def requirements_index(self):
+        if 'requirements_index' not in self.context:
+            self.context['requirements_index'] = get_requirements_index()
+        return self.context['requirements_index']
+    
+    def _get_min_requirements(self, obj, requirements):
+        # {mutaxassis/jihoz id: [{'specialty_name': ..., 'min_count': ...}, ...]}
+        min_requirements = {}
+        for specialty in obj.specialties.all():
+            for item_id, _name, min_count in requirements.get(specialty.id, ()):
+                min_requirements.setdefault(item_id, []).append({
+                    'specialty_name': specialty.name,
+                    'min_count': min_count
+                })
+        return min_requirements
+    
     def get_selected_specialists_details(self, obj):
         specialists_data = []
+        min_requirements = self._get_min_requirements(obj, self.requirements_index.specialists)
         
         for sp in obj.selected_specialists.all():
             specialist_info = {'id': sp.id, 'title': sp.title}
             
-            min_requirements = []
-            for specialty in obj.specialties.all():
-                try:
-                    requirement = SpecialistsRequired.objects.get(
-                        specialty=specialty,
-                        required_specialists=sp
-                    )
-                    min_requirements.append({
-                        'specialty_name': specialty.name,
-                        'min_count': requirement.min_count
-                    })
-                except SpecialistsRequired.DoesNotExist:
-                    continue
-            
-            if min_requirements:
-                specialist_info['requirements'] = min_requirements
+            if sp.id in min_requirements:
+                specialist_info['requirements'] = min_requirements[sp.id]
             
             specialists_data.append(specialist_info)
         
@@ -149,27 +107,13 @@ class ApplicationBranchRetrieveSerializer(serializers.ModelSerializer):
     
     def get_selected_equipment_details(self, obj):
         equipment_data = []
+        min_requirements = self._get_min_requirements(obj, self.requirements_index.equipment)
         
         for eq in obj.selected_equipment.all():
             equipment_info = {'id': eq.id, 'name': eq.name}
             
-            min_requirements = []
-            for specialty in obj.specialties.all():
-                try:
-                    equipment_req = EquipmentRequired.objects.get(specialty=specialty)
-                    equipment_item = EquipmentRequiredItem.objects.get(
-                        equipment_required=equipment_req,
-                        equipment=eq
-                    )
-                    min_requirements.append({
-                        'specialty_name': specialty.name,
-                        'min_count': equipment_item.min_count
-                    })
-                except (EquipmentRequired.DoesNotExist, EquipmentRequiredItem.DoesNotExist):
-                    continue
-            
-            if min_requirements:
-                equipment_info['requirements'] = min_requirements
+            if eq.id in min_requirements:
+                equipment_info['requirements'] = min_requirements[eq.id]
             
             equipment_data.append(equipment_info)
         
@@ -183,6 +127,7 @@ class ApplicationRetrieveSerializer(serializers.ModelSerializer):
         many=True,
         read_only=True
     )
+    document_file = serializers.SerializerMethodField()
     
     class Meta:
         model = Application
@@ -201,4 +146,12 @@ class ApplicationRetrieveSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
             'branches'
-        ]
\ No newline at end of file
+        ]
+
+    def get_document_file(self, obj):
+        # Hujjat faqat himoyalangan manzil orqali beriladi
+        if not obj.document_file:
+            return None
+        url = reverse('applications:application-document', kwargs={'pk': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
@@ -9,12 +9,13 @@ from rest_framework.permissions import IsAuthenticated
 
 from apps.applications.models import Application
 from apps.applications.choices import ApplicationStatus
-from apps.applications.utils import generate_registration_number, send_application_email
+from apps.applications.uploads import DocumentUploadMixin
+from apps.applications.utils import allocate_registration_number, send_application_email
 from apps.applications.api_endpoints.ApplicationUpdateDetail.serializers import ApplicationUpdateSerializer
 from apps.applications.api_endpoints.ApplicationUpdateDetail.serializers import ApplicationRetrieveSerializer
 
 
-class ApplicationDetailUpdateAPIView(RetrieveUpdateAPIView):
+class ApplicationDetailUpdateAPIView(DocumentUploadMixin, RetrieveUpdateAPIView):
     """
     Updating/Getting information of application on special ID.
 
@@ -77,25 +78,19 @@ class ApplicationDetailUpdateAPIView(RetrieveUpdateAPIView):
         try:
             serializer.is_valid(raise_exception=True)
             
-            if 'branches' in request.data:
-                instance.applicationbranch_set.all().delete()
+            extra_fields = {}
+            if action == 'submit':
+                # Status va registratsiya raqami arizaning qolgan maydonlari bilan bitta UPDATE'da yoziladi
+                extra_fields = {
+                    'status': ApplicationStatus.SUBMITTED,
+                    'registration_number': instance.registration_number or allocate_registration_number(),
+                }
             
-            application = serializer.save()
+            application = serializer.save(**extra_fields)
             
-            if action == ApplicationStatus.SUBMITTED:
-                if not application.registration_number:
-                    registration_number = generate_registration_number()
-                    application.registration_number = registration_number
-                
-                # Update status to SUBMITTED
-                application.status = ApplicationStatus.SUBMITTED
-                application.save(update_fields=['status', 'registration_number'])
-                
-                # Send email notification if status is SUBMITTED
-                try:
-                    send_application_email(application)
-                except Exception as e:
-                    print(f"Email sending failed: {str(e)}")
+            if action == 'submit':
+                # Queue email notification if status is SUBMITTED
+                send_application_email(application)
                 
                 message = _("Ariza muvaffaqiyatli yuborildi! Ro'yxatdan o'tish raqamingiz: {reg_number}").format(
                     reg_number=application.registration_number
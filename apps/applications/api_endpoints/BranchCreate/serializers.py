@@ -27,5 +27,8 @@ class BranchCreateSerializer(serializers.ModelSerializer):
         except District.MultipleObjectsReturned:
             raise serializers.ValidationError({"district": _("Bunday nomda bir nechta tuman mavjud, aniq nom kiriting.")})
         
+        if Branch.objects.filter(district=district_name, branch_name__iexact=validated_data.get("branch_name")).exists():
+            raise serializers.ValidationError({"branch_name": _("Bu tumanda shunday nomli filial mavjud.")})
+
         branch = Branch.objects.create(district=district_name, **validated_data)
         return branch
\ No newline at end of file
@@ -4,25 +4,33 @@ from rest_framework import filters
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 
-from apps.applications.models import Branch
+from apps.common.response_cache import CachedListMixin
+from apps.common.pagination import KeysetCursorPagination
+from apps.applications.models import Branch, District, Region
 from apps.applications.api_endpoints.BranchList.serializers import BranchListSerializer
 
 
-class BranchListAPIView(ListAPIView):
+class BranchListAPIView(CachedListMixin, ListAPIView):
     """
     GET api/applications/branch-list/
     
     Get a list of all branchs with region and district data.
+    Paginated by cursor: follow "next"/"previous", set the size with ?page_size=.
     """
     serializer_class = BranchListSerializer
     permission_classes = [IsAuthenticated]
+    cache_name = 'branch-list'
+    cache_models = [Branch, District, Region]
+    cache_query_params = ('search', 'ordering', 'district', 'region', 'page_size', 'cursor')
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['district']
     search_fields = ['branch_name', 'district__district_name', 'district__region__region_name']
     ordering_fields = ['branch_name', 'district__district_name']
+    ordering = ['district__region__region_name', 'district__district_name', 'branch_name']
+    pagination_class = KeysetCursorPagination
     
     def get_queryset(self):
-        queryset = Branch.objects.select_related('district__region').order_by('district__region__region_name', 'district__district_name', 'branch_name')
+        queryset = Branch.objects.select_related('district__region')
         
         district_id = self.request.query_params.get('district', None)
         if district_id:
@@ -43,6 +43,11 @@ class BranchUpdateSerializer(serializers.ModelSerializer):
         
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-            
+
+        if Branch.objects.filter(
+            district_id=instance.district_id, branch_name__iexact=instance.branch_name
+        ).exclude(pk=instance.pk).exists():
+            raise serializers.ValidationError({"branch_name": _("Bu tumanda shunday nomli filial mavjud.")})
+
         instance.save()
         return instance
\ No newline at end of file
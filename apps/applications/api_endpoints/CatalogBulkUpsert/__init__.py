@@ -0,0 +1,6 @@
+from .views import (
+    SpecialtyBulkUpsertAPIView,
+    SpecialistBulkUpsertAPIView,
+    EquipmentBulkUpsertAPIView,
+    BranchBulkUpsertAPIView,
+)
\ No newline at end of file
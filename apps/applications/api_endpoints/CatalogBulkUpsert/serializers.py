@@ -0,0 +1,19 @@
+from rest_framework import serializers
+
+
+class SpecialtyBulkItemSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255)
+
+
+class SpecialistBulkItemSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=128)
+
+
+class EquipmentBulkItemSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255)
+    description = serializers.CharField(required=False, allow_blank=True)
+
+
+class BranchBulkItemSerializer(serializers.Serializer):
+    district_name_input = serializers.CharField(max_length=100)
+    branch_name = serializers.CharField(max_length=255)
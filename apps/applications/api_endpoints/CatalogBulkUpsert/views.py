@@ -0,0 +1,193 @@
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.utils.translation import gettext as _
+
+from rest_framework import status
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAdminUser
+
+from apps.applications.models import Specialty, Specialist, Equipment, Branch, District
+from apps.applications.services import bulk_upsert_catalog
+from apps.applications.api_endpoints.CatalogBulkUpsert.serializers import (
+    SpecialtyBulkItemSerializer,
+    SpecialistBulkItemSerializer,
+    EquipmentBulkItemSerializer,
+    BranchBulkItemSerializer,
+)
+
+
+ROW_STATUSES = ("created", "updated", "duplicate", "invalid")
+
+
+class CatalogBulkUpsertAPIView(GenericAPIView):
+    """
+    Base view for the bulk catalog upserts.
+
+    The body is a JSON array of records. Each record is validated on its own;
+    valid ones are written by natural key with ``bulk_upsert_catalog`` and the
+    response has one result per record, in request order.
+    """
+    permission_classes = [IsAdminUser]
+    model = None
+    unique_fields = ()
+    update_fields = None
+    max_rows = 5000
+
+    def get_max_rows(self):
+        return getattr(settings, "CATALOG_BULK_MAX_ROWS", self.max_rows)
+
+    def build_instances(self, rows, results):
+        """Turn validated ``(index, data)`` pairs into unsaved model instances."""
+        return [(index, self.model(**data)) for index, data in rows]
+
+    def upsert(self, instances):
+        return bulk_upsert_catalog(self.model, instances, self.unique_fields, self.update_fields)
+
+    def post(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {"detail": _("So'rov tanasi yozuvlar ro'yxatidan iborat bo'lishi kerak.")},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > self.get_max_rows():
+            return Response(
+                {"detail": _("Bitta so'rovda ko'pi bilan %(count)s ta yozuv yuborish mumkin.") % {"count": self.get_max_rows()}},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = [None] * len(items)
+        serializer = self.get_serializer()
+        valid = []
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, serializer.run_validation(item)))
+            except serializers.ValidationError as exc:
+                results[index] = {"index": index, "status": "invalid", "errors": exc.detail}
+
+        for index, instance, row_status in self.upsert(self.build_instances(valid, results)):
+            results[index] = {"index": index, "status": row_status, "id": instance.pk}
+
+        summary = Counter(result["status"] for result in results)
+        return Response(
+            {
+                "summary": {row_status: summary[row_status] for row_status in ROW_STATUSES},
+                "results": results,
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class SpecialtyBulkUpsertAPIView(CatalogBulkUpsertAPIView):
+    """
+    POST /api/applications/specialty-bulk-upsert/
+    Add many specialties at once; existing names are left as they are.
+
+    Example request body:
+    [
+        {"name": "Pediatriya"},
+        {"name": "Kardiologiya"}
+    ]
+    """
+    serializer_class = SpecialtyBulkItemSerializer
+    model = Specialty
+    unique_fields = ["name"]
+
+
+class SpecialistBulkUpsertAPIView(CatalogBulkUpsertAPIView):
+    """
+    POST /api/applications/specialist-bulk-upsert/
+    Add many specialists at once; existing titles are left as they are.
+
+    Example request body:
+    [
+        {"title": "Pediatr"},
+        {"title": "Hamshira"}
+    ]
+    """
+    serializer_class = SpecialistBulkItemSerializer
+    model = Specialist
+    unique_fields = ["title"]
+
+
+class EquipmentBulkUpsertAPIView(CatalogBulkUpsertAPIView):
+    """
+    POST /api/applications/equipment-bulk-upsert/
+    Add many equipment items at once. For an existing name the description
+    is replaced when one is sent and kept otherwise.
+
+    Example request body:
+    [
+        {"name": "Rentgen apparati", "description": "Raqamli"},
+        {"name": "EKG apparati"}
+    ]
+    """
+    serializer_class = EquipmentBulkItemSerializer
+    model = Equipment
+    unique_fields = ["name"]
+
+    def upsert(self, instances):
+        # Tavsifi yuborilgan va yuborilmagan yozuvlar alohida yoziladi,
+        # aks holda mavjud tavsiflar bo'sh qatorga almashib qoladi
+        with_description = [(index, instance) for index, instance in instances if instance.description is not None]
+        without_description = [(index, instance) for index, instance in instances if instance.description is None]
+        for _index, instance in without_description:
+            instance.description = ""
+
+        results = bulk_upsert_catalog(Equipment, with_description, self.unique_fields, ["description"])
+        results += bulk_upsert_catalog(Equipment, without_description, self.unique_fields)
+        return results
+
+    def build_instances(self, rows, results):
+        return [
+            (index, Equipment(name=data["name"], description=data.get("description")))
+            for index, data in rows
+        ]
+
+
+class BranchBulkUpsertAPIView(CatalogBulkUpsertAPIView):
+    """
+    POST /api/applications/branch-bulk-upsert/
+    Add many branches at once. Districts are looked up by name in one query;
+    a branch that already exists in its district is left as it is.
+
+    Example request body:
+    [
+        {"district_name_input": "Olmazor tumani", "branch_name": "Olmazor tuman branch"},
+        {"district_name_input": "Chilonzor tumani", "branch_name": "Chilonzor 1-filial"}
+    ]
+    """
+    serializer_class = BranchBulkItemSerializer
+    model = Branch
+    unique_fields = ["district", "branch_name"]
+
+    def build_instances(self, rows, results):
+        districts = defaultdict(list)
+        names = {data["district_name_input"] for _index, data in rows}
+        for district in District.objects.filter(district_name__in=names).only("id", "district_name"):
+            districts[district.district_name].append(district)
+
+        instances = []
+        for index, data in rows:
+            matches = districts.get(data["district_name_input"], [])
+            if len(matches) == 1:
+                instances.append((index, Branch(district=matches[0], branch_name=data["branch_name"])))
+                continue
+
+            if matches:
+                message = _("Bunday nomda bir nechta tuman mavjud, aniq nom kiriting.")
+            else:
+                message = _("Bunday nomdagi tuman mavjud emas.")
+            results[index] = {"index": index, "status": "invalid", "errors": {"district_name_input": [message]}}
+        return instances
+
+
+__all__ = [
+    "SpecialtyBulkUpsertAPIView",
+    "SpecialistBulkUpsertAPIView",
+    "EquipmentBulkUpsertAPIView",
+    "BranchBulkUpsertAPIView",
+]
@@ -1,3 +1,5 @@
+from django.utils.translation import gettext as _
+
 from rest_framework import serializers
 
 from apps.applications.models import Equipment
@@ -6,4 +8,13 @@ from apps.applications.models import Equipment
 class EquipmentCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Equipment
-        fields = ['name', 'description']
\ No newline at end of file
+        fields = ['name', 'description']
+
+    def validate_name(self, value):
+        # Nomlar katta-kichik harfsiz noyob (unique_equipment_name_ci)
+        queryset = Equipment.objects.filter(name__iexact=value)
+        if self.instance is not None:
+            queryset = queryset.exclude(pk=self.instance.pk)
+        if queryset.exists():
+            raise serializers.ValidationError(_("Bunday nomli jihoz mavjud."))
+        return value
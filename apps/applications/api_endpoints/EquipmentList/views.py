@@ -2,11 +2,12 @@ from rest_framework import filters
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 
+from apps.common.response_cache import CachedListMixin
 from apps.applications.models import Equipment
 from apps.applications.api_endpoints.EquipmentList.serializers import EquipmentListSerializer
 
 
-class EquipmentListAPIView(ListAPIView):
+class EquipmentListAPIView(CachedListMixin, ListAPIView):
     """
     GET /api/applications/equipment-list/
     
@@ -15,6 +16,8 @@ class EquipmentListAPIView(ListAPIView):
     queryset = Equipment.objects.all().order_by('name')
     serializer_class = EquipmentListSerializer
     permission_classes = [IsAuthenticated]
+    cache_name = 'equipment-list'
+    cache_models = [Equipment]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name']
     ordering_fields = ['name']
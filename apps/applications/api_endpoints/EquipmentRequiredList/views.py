@@ -2,11 +2,13 @@ from rest_framework import filters
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 
-from apps.applications.models import EquipmentRequiredItem
+from apps.common.response_cache import CachedListMixin
+from apps.common.pagination import TiebreakOrderingFilter
+from apps.applications.models import EquipmentRequiredItem, EquipmentRequired, Specialty, Equipment
 from apps.applications.api_endpoints.EquipmentRequiredList.serializers import EquipmentRequiredItemListSerializer
 
 
-class EquipmentRequiredItemListAPIView(ListAPIView):
+class EquipmentRequiredItemListAPIView(CachedListMixin, ListAPIView):
     """
     GET /api/applications/equipment-required-list/
     
@@ -14,10 +16,13 @@ class EquipmentRequiredItemListAPIView(ListAPIView):
     """
     serializer_class = EquipmentRequiredItemListSerializer
     permission_classes = [IsAuthenticated]
-    queryset = EquipmentRequiredItem.objects.select_related('equipment_required', 'equipment')
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    cache_name = 'equipment-required-list'
+    cache_models = [EquipmentRequiredItem, EquipmentRequired, Specialty, Equipment]
+    queryset = EquipmentRequiredItem.objects.select_related('equipment_required__specialty', 'equipment')
+    filter_backends = [filters.SearchFilter, TiebreakOrderingFilter]
     search_fields = ['equipment_required__specialty__name', 'equipment__name']
     ordering_fields = ['equipment_required__specialty__name', 'equipment__name']
+    ordering = ['equipment_required__specialty__name', 'equipment__name', 'id']
 
 
 
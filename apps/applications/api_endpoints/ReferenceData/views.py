@@ -0,0 +1,40 @@
+from django.utils.http import parse_etags
+from django.http import HttpResponse, HttpResponseNotModified
+
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+
+from apps.applications.reference_data import get_reference_snapshot
+
+
+class ReferenceDataAPIView(APIView):
+    """
+    GET /api/applications/reference-data/
+
+    The whole reference catalog in one response: regions, districts, branches,
+    specialties, specialists, equipment and the requirement matrix.
+
+    The response carries a strong ETag. Send it back in If-None-Match and
+    you get 304 Not Modified with no body until the catalog changes.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        snapshot = get_reference_snapshot()
+
+        if_none_match = request.headers.get("If-None-Match")
+        etags = [etag.removeprefix("W/") for etag in parse_etags(if_none_match or "")]
+        if snapshot.etag in etags or "*" in etags:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(snapshot.body, content_type="application/json")
+
+        response["ETag"] = snapshot.etag
+        response["Cache-Control"] = "private, no-cache"
+        response["X-Catalog-Version"] = snapshot.version
+        return response
+
+
+__all__ = [
+    "ReferenceDataAPIView"
+]
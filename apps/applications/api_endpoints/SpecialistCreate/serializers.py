@@ -1,3 +1,5 @@
+from django.utils.translation import gettext as _
+
 from rest_framework import serializers
 
 from apps.applications.models import Specialist
@@ -7,3 +9,12 @@ class SpecialistCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Specialist
         fields = ['title', ]
+
+    def validate_title(self, value):
+        # Nomlar katta-kichik harfsiz noyob (unique_specialist_title_ci)
+        queryset = Specialist.objects.filter(title__iexact=value)
+        if self.instance is not None:
+            queryset = queryset.exclude(pk=self.instance.pk)
+        if queryset.exists():
+            raise serializers.ValidationError(_("Bunday nomli mutaxassis mavjud."))
+        return value
@@ -4,11 +4,12 @@ from rest_framework import filters
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 
+from apps.common.response_cache import CachedListMixin
 from apps.applications.models import Specialist
 from apps.applications.api_endpoints.SpecialistList.serializers import SpecialistListSerializer
 
 
-class SpecialistListAPIView(ListAPIView):
+class SpecialistListAPIView(CachedListMixin, ListAPIView):
     """
     GET /api/applications/specialist-list/
     
@@ -17,6 +18,8 @@ class SpecialistListAPIView(ListAPIView):
     queryset = Specialist.objects.all().order_by('title')
     serializer_class = SpecialistListSerializer
     permission_classes = [IsAuthenticated]
+    cache_name = 'specialist-list'
+    cache_models = [Specialist]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title']
     ordering_fields = ['title']
@@ -4,11 +4,13 @@ from rest_framework import filters
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 
-from apps.applications.models import SpecialistsRequired
+from apps.common.response_cache import CachedListMixin
+from apps.common.pagination import TiebreakOrderingFilter
+from apps.applications.models import SpecialistsRequired, Specialty, Specialist
 from apps.applications.api_endpoints.SpecialistsRequiredList.serializers import SpecialistsRequiredListSerializer
 
 
-class SpecialistsRequiredListAPIView(ListAPIView):
+class SpecialistsRequiredListAPIView(CachedListMixin, ListAPIView):
     """
     GET /api/applications/specialist-required-list/
     
@@ -16,10 +18,13 @@ class SpecialistsRequiredListAPIView(ListAPIView):
     """
     serializer_class = SpecialistsRequiredListSerializer
     permission_classes = [IsAuthenticated]
+    cache_name = 'specialist-required-list'
+    cache_models = [SpecialistsRequired, Specialty, Specialist]
     queryset = SpecialistsRequired.objects.select_related('specialty', 'required_specialists')
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [filters.SearchFilter, TiebreakOrderingFilter]
     search_fields = ['specialty', 'required_specialists__title']
     ordering_fields = ['specialty', 'required_specialists__title']
+    ordering = ['specialty__name', 'required_specialists__title', 'id']
 
 
 
@@ -1,3 +1,5 @@
+from django.utils.translation import gettext as _
+
 from rest_framework import serializers
 
 from apps.applications.models import Specialty
@@ -6,4 +8,13 @@ from apps.applications.models import Specialty
 class SpecialtyCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Specialty
-        fields = ['name', ]
\ No newline at end of file
+        fields = ['name', ]
+
+    def validate_name(self, value):
+        # Nomlar katta-kichik harfsiz noyob (unique_specialty_name_ci)
+        queryset = Specialty.objects.filter(name__iexact=value)
+        if self.instance is not None:
+            queryset = queryset.exclude(pk=self.instance.pk)
+        if queryset.exists():
+            raise serializers.ValidationError(_("Bunday nomli ixtisoslik mavjud."))
+        return value
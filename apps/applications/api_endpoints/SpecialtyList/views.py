@@ -2,11 +2,12 @@ from rest_framework import filters
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 
+from apps.common.response_cache import CachedListMixin
 from apps.applications.models import Specialty
 from apps.applications.api_endpoints.SpecialtyList.serializers import SpecialtyListSerializer
 
 
-class SpecialtyListAPIView(ListAPIView):
+class SpecialtyListAPIView(CachedListMixin, ListAPIView):
     """
     GET /api/applications/specialty-list/
     
@@ -15,6 +16,8 @@ class SpecialtyListAPIView(ListAPIView):
     queryset = Specialty.objects.all().order_by('name')
     serializer_class = SpecialtyListSerializer
     permission_classes = [IsAuthenticated]
+    cache_name = 'specialty-list'
+    cache_models = [Specialty]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name']
     ordering_fields = ['name']
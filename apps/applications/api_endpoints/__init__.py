@@ -8,6 +8,8 @@ from .BranchDelete import * # noqa
 from .ApplicationCreate import * # noqa
 from .ApplicationList import * # noqa
 from .ApplicationUpdateDetail import * # noqa
+from .ApplicationExport import * # noqa
+from .ApplicationDocument import * # noqa
 
 # Specialty
 from .SpecialtyCreate import * # noqa
@@ -37,4 +39,10 @@ from .EquipmentDelete import * # noqa
 from .EquipmentRequiredCreate import * # noqa
 from .EquipmentRequiredList import * # noqa
 from .EquipmentRequiredUpdateDetail import * # noqa
-from .EquipmentRequiredDelete import * # noqa
\ No newline at end of file
+from .EquipmentRequiredDelete import * # noqa
+
+# ReferenceData
+from .ReferenceData import * # noqa
+
+# CatalogBulkUpsert
+from .CatalogBulkUpsert import * # noqa
\ No newline at end of file
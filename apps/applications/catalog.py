@@ -0,0 +1,103 @@
+from django.db.models.functions import Lower
+
+from apps.applications.models import Branch, Specialty, Specialist, Equipment
+
+
+# ApplicationBranchSerializer maydoni -> (katalog modeli, nom saqlanadigan maydon)
+CATALOG_LOOKUPS = {
+    'branch': (Branch, 'branch_name'),
+    'specialties': (Specialty, 'name'),
+    'selected_specialists': (Specialist, 'title'),
+    'selected_equipment': (Equipment, 'name'),
+}
+
+
+def normalize_name(name):
+    return name.strip().lower()
+
+
+class CatalogResolver:
+    """
+    Request-scoped resolver for branch, specialty, specialist and equipment names.
+
+    Names from every submitted branch are collected up front and each catalog
+    is loaded with one case-insensitive ``IN`` query, so per-branch validators
+    only read from memory. Names that were not collected beforehand are
+    resolved lazily, one query per catalog and call.
+    """
+
+    def __init__(self):
+        self._pending = {field: set() for field in CATALOG_LOOKUPS}
+        self._resolved = {field: {} for field in CATALOG_LOOKUPS}
+        self._complete = False
+
+    @classmethod
+    def for_branches(cls, branches):
+        resolver = cls()
+        for branch_data in branches:
+            resolver.collect(branch_data)
+        return resolver
+
+    @classmethod
+    def preloaded(cls):
+        """
+        Resolver with every catalog loaded in full (one query per catalog).
+        Unknown names resolve to no matches without touching the database,
+        so it can be shared by long-running bulk validation.
+        """
+        resolver = cls()
+        for field, (model, name_field) in CATALOG_LOOKUPS.items():
+            resolved = resolver._resolved[field]
+            for obj in model.objects.annotate(_lookup_name=Lower(name_field)):
+                resolved.setdefault(obj._lookup_name, []).append(obj)
+        resolver._complete = True
+        return resolver
+
+    def collect(self, branch_data):
+        if self._complete or not isinstance(branch_data, dict):
+            return
+
+        for field in CATALOG_LOOKUPS:
+            value = branch_data.get(field)
+            names = value if isinstance(value, (list, tuple)) else [value]
+            for name in names:
+                if isinstance(name, str) and name.strip():
+                    key = normalize_name(name)
+                    if key not in self._resolved[field]:
+                        self._pending[field].add(key)
+
+    def resolve(self, field, name):
+        """Return every catalog object whose name matches ``name`` case-insensitively."""
+        key = normalize_name(name)
+        if self._complete:
+            return self._resolved[field].get(key, [])
+        if key not in self._resolved[field]:
+            self._pending[field].add(key)
+            self._load(field)
+        return self._resolved[field][key]
+
+    def resolve_many(self, field, names):
+        """Same as ``resolve`` for a list, keeping order and duplicates."""
+        for name in names:
+            key = normalize_name(name)
+            if not self._complete and key not in self._resolved[field]:
+                self._pending[field].add(key)
+        return [(name, self.resolve(field, name)) for name in names]
+
+    def _load(self, field):
+        names = self._pending[field]
+        if not names:
+            return
+
+        model, name_field = CATALOG_LOOKUPS[field]
+        resolved = self._resolved[field]
+        for key in names:
+            resolved[key] = []
+
+        queryset = model.objects.annotate(
+            _lookup_name=Lower(name_field)
+        ).filter(_lookup_name__in=names)
+        for obj in queryset:
+            resolved.setdefault(obj._lookup_name, []).append(obj)
+
+        self._pending[field] = set()
@@ -0,0 +1,165 @@
+import io
+import csv
+import json
+from datetime import datetime
+from itertools import islice
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.applications.models import ApplicationBranch
+
+
+APPLICATION_EXPORT_FIELDS = (
+    'id', 'registration_number', 'status', 'first_name', 'last_name', 'paternal_name',
+    'email', 'phone_number', 'document_type', 'full_address', 'created_at', 'updated_at',
+)
+BRANCH_EXPORT_FIELDS = ('region', 'district', 'branch', 'specialties', 'specialists', 'equipment')
+
+# ApplicationBranch M2M maydoni -> (eksportdagi kalit, katalogdagi nom maydoni)
+BRANCH_SELECTIONS = (
+    ('specialties', 'specialties', 'name'),
+    ('selected_specialists', 'specialists', 'title'),
+    ('selected_equipment', 'equipment', 'name'),
+)
+
+
+def _export_chunk_size():
+    return getattr(settings, "APPLICATION_EXPORT_CHUNK_SIZE", 2000)
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).strftime("%Y-%m-%d %H:%M:%S")
+    return value
+
+
+# Jadval dasturlari shu belgilardan boshlangan katakni formula deb o'qiydi
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value):
+    """Spreadsheet-safe CSV cell: a string that could start a formula gets a leading ``'``."""
+    value = _format_value(value)
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_application_chunks(queryset, chunk_size=None):
+    """
+    Yield lists of application rows (tuples in ``APPLICATION_EXPORT_FIELDS``
+    order), read through a server-side cursor so memory stays flat however
+    many rows the queryset has.
+    """
+    chunk_size = chunk_size or _export_chunk_size()
+    rows = queryset.values_list(*APPLICATION_EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def load_branch_selections(application_ids):
+    """
+    Return ``{application_id: [branch, ...]}`` for the given applications,
+    each branch a dict with its names and the names of its selections.
+    Runs four queries however many applications are given.
+    """
+    branches = {}
+    by_application = {}
+    branch_rows = ApplicationBranch.objects.filter(application_id__in=application_ids).values_list(
+        'id',
+        'application_id',
+        'branch__district__region__region_name',
+        'branch__district__district_name',
+        'branch__branch_name',
+    ).order_by('application_id', 'id')
+    for pk, application_id, region, district, branch in branch_rows:
+        entry = {
+            'region': region,
+            'district': district,
+            'branch': branch,
+            'specialties': [],
+            'specialists': [],
+            'equipment': [],
+        }
+        branches[pk] = entry
+        by_application.setdefault(application_id, []).append(entry)
+
+    if not branches:
+        return by_application
+
+    for field_name, key, name_field in BRANCH_SELECTIONS:
+        field = ApplicationBranch._meta.get_field(field_name)
+        links = field.remote_field.through.objects.filter(
+            **{f"{field.m2m_column_name()}__in": list(branches)}
+        ).values_list(
+            field.m2m_column_name(),
+            f"{field.m2m_reverse_field_name()}__{name_field}",
+        ).order_by('id')
+        for application_branch_id, name in links:
+            branches[application_branch_id][key].append(name)
+
+    return by_application
+
+
+def _branch_columns(branch):
+    if branch is None:
+        return [""] * len(BRANCH_EXPORT_FIELDS)
+    return [branch['region'], branch['district'], branch['branch']] + [
+        "; ".join(branch[key]) for _, key, _ in BRANCH_SELECTIONS
+    ]
+
+
+def _iter_chunks_with_branches(queryset, include_branches):
+    for chunk in iter_application_chunks(queryset):
+        selections = load_branch_selections([row[0] for row in chunk]) if include_branches else {}
+        yield chunk, selections
+
+
+def stream_applications_csv(queryset, include_branches=False):
+    """
+    Yield the applications as CSV, one chunk of rows at a time. With
+    ``include_branches`` there is one line per application branch and the
+    selections of a branch are joined with ``"; "``. Cells that a
+    spreadsheet would read as a formula are prefixed with ``'``.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data
+
+    header = list(APPLICATION_EXPORT_FIELDS)
+    if include_branches:
+        header += BRANCH_EXPORT_FIELDS
+    writer.writerow(header)
+    yield flush()
+
+    for chunk, selections in _iter_chunks_with_branches(queryset, include_branches):
+        for row in chunk:
+            values = [_csv_cell(value) for value in row]
+            if not include_branches:
+                writer.writerow(values)
+                continue
+            # Filiallari yo'q ariza ham bitta qator bo'lib chiqadi
+            for branch in selections.get(row[0]) or [None]:
+                writer.writerow(values + [_csv_cell(value) for value in _branch_columns(branch)])
+        yield flush()
+
+
+def stream_applications_ndjson(queryset, include_branches=False):
+    """Yield the applications as newline-delimited JSON, one object per application."""
+    for chunk, selections in _iter_chunks_with_branches(queryset, include_branches):
+        lines = []
+        for row in chunk:
+            record = {field: _format_value(value) for field, value in zip(APPLICATION_EXPORT_FIELDS, row)}
+            if include_branches:
+                record['branches'] = selections.get(row[0], [])
+            lines.append(json.dumps(record, ensure_ascii=False))
+        yield "\n".join(lines) + "\n"
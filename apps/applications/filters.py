@@ -0,0 +1,79 @@
+import re
+import operator
+from functools import reduce
+
+from django.db.models import Q
+
+from rest_framework import filters
+from rest_framework.filters import search_smart_split
+
+from apps.applications.utils import is_valid_registration_number
+
+
+APPLICATION_SEARCH_FIELDS = ('first_name', 'last_name', 'email', 'phone_number', 'registration_number')
+
+PHONE_NUMBER_RE = re.compile(r"^\+?\d{9,13}$")
+PHONE_NUMBER_SEPARATORS_RE = re.compile(r"[\s\-()]")
+
+
+def exact_application_lookup(search):
+    """
+    Q for a search term that is a whole registration number or phone number,
+    or None. Both columns are unique, so the lookup is a single index probe.
+    """
+    conditions = []
+    if is_valid_registration_number(search):
+        conditions.append(Q(registration_number=search.upper()))
+
+    phone_number = PHONE_NUMBER_SEPARATORS_RE.sub('', search)
+    if PHONE_NUMBER_RE.match(phone_number):
+        digits = phone_number.lstrip('+')
+        conditions.append(Q(phone_number__in=[digits, '+' + digits]))
+
+    return reduce(operator.or_, conditions) if conditions else None
+
+
+def search_applications(queryset, search, fields=APPLICATION_SEARCH_FIELDS):
+    """
+    Filter applications by a free-text ``search`` string.
+
+    A whole registration number or phone number is matched exactly and, when
+    it finds something, the substring search is skipped. Otherwise every term
+    must be contained in one of ``fields``; those ``ILIKE '%term%'`` lookups
+    are served by the trigram GIN indexes on ``UPPER(field)``.
+    """
+    search = (search or '').strip()
+    if not search:
+        return queryset
+
+    exact = exact_application_lookup(search)
+    if exact is not None:
+        matches = queryset.filter(exact)
+        if matches.exists():
+            return matches
+
+    conditions = [
+        reduce(operator.or_, (Q(**{f'{field}__icontains': term}) for field in fields))
+        for term in search_smart_split(search)
+    ]
+    return queryset.filter(*conditions)
+
+
+class ApplicationSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter for applications that goes through ``search_applications``,
+    so exact registration/phone numbers and indexed substring search are used.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search = request.query_params.get(self.search_param, '')
+        fields = self.get_search_fields(view, request) or APPLICATION_SEARCH_FIELDS
+        return search_applications(queryset, search, fields=fields)
+
+
+__all__ = [
+    'APPLICATION_SEARCH_FIELDS',
+    'exact_application_lookup',
+    'search_applications',
+    'ApplicationSearchFilter',
+]
@@ -0,0 +1,314 @@
+import csv
+import json
+from collections import deque
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connections
+from django.utils.translation import gettext as _
+from django.contrib.auth import get_user_model
+
+from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+
+from apps.applications.choices import ApplicationStatus
+from apps.applications.catalog import CatalogResolver
+from apps.applications.requirements import get_requirements_index
+from apps.applications.services import bulk_create_application_branches
+from apps.applications.utils import allocate_registration_numbers
+from apps.applications.models import Application, Branch, Specialty, Specialist, Equipment
+from apps.applications.api_endpoints.ApplicationCreate.serializers import ApplicationCreateSerializer
+
+
+CustomUser = get_user_model()
+
+APPLICATION_IMPORT_FIELDS = (
+    'first_name', 'last_name', 'paternal_name', 'phone_number',
+    'email', 'document_type', 'full_address',
+)
+IMPORT_STATUSES = (ApplicationStatus.DRAFT, ApplicationStatus.SUBMITTED)
+
+# Eksport fayllaridagi kalitlar -> ApplicationBranchSerializer maydonlari
+BRANCH_KEY_ALIASES = {
+    'specialists': 'selected_specialists',
+    'equipment': 'selected_equipment',
+}
+BRANCH_SELECTION_MODELS = (
+    ('specialties', Specialty),
+    ('selected_specialists', Specialist),
+    ('selected_equipment', Equipment),
+)
+
+
+class ApplicationImportSerializer(ApplicationCreateSerializer):
+    """
+    ApplicationCreateSerializer for imported rows: same field and branch rules,
+    without the document file. Phone and email uniqueness is checked per batch
+    by ``save_import_batch`` instead of one query per row.
+    """
+    status = serializers.ChoiceField(choices=IMPORT_STATUSES, default=ApplicationStatus.DRAFT)
+    user = serializers.CharField(required=False, allow_blank=True)
+
+    class Meta(ApplicationCreateSerializer.Meta):
+        fields = list(APPLICATION_IMPORT_FIELDS) + ['branches', 'status', 'user']
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for field in fields.values():
+            field.validators = [
+                validator for validator in field.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+        return fields
+
+
+def _split_names(value):
+    if isinstance(value, list):
+        return value
+    return [name.strip() for name in (value or '').split(';') if name.strip()]
+
+
+def _normalize_branch(branch_data):
+    if not isinstance(branch_data, dict):
+        return branch_data
+    branch_data = {BRANCH_KEY_ALIASES.get(key, key): value for key, value in branch_data.items()}
+    for field, _model in BRANCH_SELECTION_MODELS:
+        if field in branch_data:
+            branch_data[field] = _split_names(branch_data[field])
+    return branch_data
+
+
+def _normalize_record(record):
+    record = dict(record)
+    # API'dagi "action" (save/submit) ham qabul qilinadi
+    action = str(record.pop('action', '') or '').strip().lower()
+    if not record.get('status') and action:
+        record['status'] = ApplicationStatus.SUBMITTED if action == 'submit' else ApplicationStatus.DRAFT
+    if isinstance(record.get('status'), str):
+        record['status'] = record['status'].strip().lower()
+    if isinstance(record.get('branches'), list):
+        record['branches'] = [_normalize_branch(branch_data) for branch_data in record['branches']]
+    return record
+
+
+def read_jsonl(file):
+    """
+    Yield ``(position, record)`` for every non-empty line of a JSONL file.
+    Records have the application-create payload plus ``status`` and ``user``;
+    the NDJSON export format is accepted as well.
+    """
+    position = 0
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+        position += 1
+        try:
+            yield position, json.loads(line)
+        except ValueError:
+            yield position, line
+
+
+def read_csv(file):
+    """
+    Yield ``(position, record)`` from a CSV file with one line per branch,
+    the layout of the CSV export. Consecutive lines with the same phone
+    number are one application; selections are separated with ``";"``.
+    """
+    def phone(row):
+        return (row.get('phone_number') or '').strip()
+
+    def to_record(rows):
+        record = {
+            field: value for field, value in rows[0].items()
+            if field not in ('branch', 'specialties', 'specialists', 'equipment')
+        }
+        record['branches'] = [
+            {
+                'branch': row['branch'],
+                'specialties': row.get('specialties'),
+                'specialists': row.get('specialists') or row.get('selected_specialists'),
+                'equipment': row.get('equipment') or row.get('selected_equipment'),
+            }
+            for row in rows if (row.get('branch') or '').strip()
+        ]
+        return record
+
+    position = 0
+    group = []
+    for row in csv.DictReader(file):
+        if group and not (phone(row) and phone(row) == phone(group[0])):
+            position += 1
+            yield position, to_record(group)
+            group = []
+        group.append(row)
+    if group:
+        yield position + 1, to_record(group)
+
+
+def build_validation_context():
+    """Catalog and requirement rules shared by every record of an import."""
+    return {
+        'catalog_resolver': CatalogResolver.preloaded(),
+        'requirements_index': get_requirements_index(),
+    }
+
+
+_validation_context = None
+
+
+def _set_validation_context(context):
+    global _validation_context
+    _validation_context = context
+
+
+def validate_import_batch(records):
+    """
+    Validate ``(position, record)`` pairs against the preloaded context.
+
+    Returns ``("ok", position, data)`` or ``("rejected", position, record,
+    errors)`` per record, with selections reduced to ids so results are cheap
+    to send back from a worker process. Runs no queries.
+    """
+    results = []
+    serializer = ApplicationImportSerializer(context=_validation_context)
+    for position, record in records:
+        if not isinstance(record, dict):
+            errors = {'non_field_errors': [_("Yozuv JSON obyekti bo'lishi kerak.")]}
+            results.append(('rejected', position, record, errors))
+            continue
+
+        try:
+            data = serializer.run_validation(_normalize_record(record))
+        except serializers.ValidationError as exc:
+            results.append(('rejected', position, record, json.loads(json.dumps(exc.detail))))
+            continue
+
+        results.append(('ok', position, {
+            'fields': {field: data[field] for field in APPLICATION_IMPORT_FIELDS},
+            'status': data['status'],
+            'user': data.get('user') or None,
+            'branches': [
+                [branch_data['branch'].pk] + [
+                    [obj.pk for obj in branch_data.get(field) or []]
+                    for field, _model in BRANCH_SELECTION_MODELS
+                ]
+                for branch_data in data['branches']
+            ],
+            'record': record,
+        }))
+    return results
+
+
+def iter_validated_batches(batches, context, workers=1):
+    """
+    Validate batches in order, in this process or in a pool of ``workers``
+    forked processes. At most ``2 * workers`` batches are in flight, so
+    memory does not grow with the file.
+    """
+    if workers <= 1:
+        _set_validation_context(context)
+        for batch in batches:
+            yield validate_import_batch(batch)
+        return
+
+    # Fork qilingan jarayonlar ota jarayonning ochiq ulanishini meros qilib olmasligi kerak
+    connections.close_all()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context('fork'),
+        initializer=_set_validation_context,
+        initargs=(context,),
+    ) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(validate_import_batch, batch))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def save_import_batch(results, default_user=None, batch_size=1000):
+    """
+    Insert the valid rows of a validated batch.
+
+    Owners are resolved by username and phone/email uniqueness is checked
+    against the database and the batch itself, one query each. Submitted rows
+    get registration numbers from one sequence call; applications and their
+    branch selections are written with ``bulk_create``. Call it inside a
+    transaction. Returns ``(created, rejected)`` where ``rejected`` has
+    ``(position, record, errors)`` triples, in input order.
+    """
+    rows = []
+    rejected = []
+    for outcome, position, *payload in results:
+        if outcome == 'ok':
+            rows.append((position, payload[0]))
+        else:
+            rejected.append((position, *payload))
+
+    usernames = {data['user'] for _position, data in rows if data['user']}
+    users = {
+        user.username: user
+        for user in CustomUser.objects.filter(username__in=usernames, is_deleted=False).only('id', 'username')
+    } if usernames else {}
+    phones = set(Application.objects.filter(
+        phone_number__in=[data['fields']['phone_number'] for _position, data in rows]
+    ).values_list('phone_number', flat=True))
+    emails = set(Application.objects.filter(
+        email__in=[data['fields']['email'] for _position, data in rows]
+    ).values_list('email', flat=True))
+
+    accepted = []
+    for position, data in rows:
+        errors = {}
+        user = users.get(data['user']) if data['user'] else default_user
+        if user is None:
+            errors['user'] = [_("Foydalanuvchi topilmadi.")]
+        if data['fields']['phone_number'] in phones:
+            errors['phone_number'] = [_("Bu telefon raqami bilan ariza mavjud.")]
+        if data['fields']['email'] in emails:
+            errors['email'] = [_("Bu email bilan ariza mavjud.")]
+        if errors:
+            rejected.append((position, data['record'], errors))
+            continue
+
+        phones.add(data['fields']['phone_number'])
+        emails.add(data['fields']['email'])
+        accepted.append((user, data))
+    rejected.sort(key=lambda item: item[0])
+
+    if not accepted:
+        return 0, rejected
+
+    submitted = sum(1 for _user, data in accepted if data['status'] == ApplicationStatus.SUBMITTED)
+    registration_numbers = iter(allocate_registration_numbers(submitted) if submitted else [])
+    applications = Application.objects.bulk_create(
+        [
+            Application(
+                user=user,
+                status=data['status'],
+                registration_number=next(registration_numbers) if data['status'] == ApplicationStatus.SUBMITTED else None,
+                **data['fields'],
+            )
+            for user, data in accepted
+        ],
+        batch_size=batch_size,
+    )
+
+    bulk_create_application_branches(
+        (
+            (application, {
+                'branch': Branch(pk=branch_id),
+                **{
+                    field: [model(pk=pk) for pk in pks]
+                    for (field, model), pks in zip(BRANCH_SELECTION_MODELS, selections)
+                },
+            })
+            for application, (_user, data) in zip(applications, accepted)
+            for branch_id, *selections in data['branches']
+        ),
+        batch_size=batch_size,
+    )
+    return len(applications), rejected
@@ -0,0 +1,116 @@
+import time
+import statistics
+
+from django.db import connection, transaction
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.applications.models import Application
+from apps.applications.filters import search_applications
+from apps.applications.utils import encode_registration_number
+
+
+SEED_SQL = """
+INSERT INTO applications_application (
+    user_id, first_name, last_name, paternal_name, full_address, phone_number,
+    email, document_type, registration_number, created_at, updated_at, status
+)
+SELECT
+    %(user_id)s,
+    (ARRAY['Aziz', 'Dilnoza', 'Jasur', 'Malika', 'Sardor', 'Nodira', 'Bekzod', 'Gulnora'])[1 + g %% 8] || g,
+    (ARRAY['Karimov', 'Rahimova', 'Toshmatov', 'Yusupova', 'Aliyev', 'Qodirova'])[1 + g %% 6] || g,
+    'Otasining ismi',
+    'Toshkent shahri, ' || g || '-uy',
+    '+998' || lpad(g::text, 9, '0'),
+    'bench' || g || '@example.uz',
+    'passport',
+    'B' || lpad(g::text, 11, '0'),
+    now() - g * interval '1 minute',
+    now() - g * interval '1 minute',
+    'submitted'
+FROM generate_series(1, %(rows)s) AS g
+"""
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large applications table inside a transaction, time application "
+        "search with and without index scans, then roll everything back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--page-size", type=int, default=50)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("This benchmark needs PostgreSQL.")
+
+        try:
+            with transaction.atomic():
+                self.seed(options["rows"])
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("Seeded rows rolled back.")
+
+    def seed(self, rows):
+        user = get_user_model().objects.create(
+            username="search-benchmark",
+            phone_number="+998000000000",
+            email="search-benchmark@example.uz",
+        )
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(SEED_SQL, {"user_id": user.pk, "rows": rows})
+            middle = rows // 2
+            self.registration_number = encode_registration_number(10 ** 12 + middle)
+            cursor.execute(
+                "UPDATE applications_application SET registration_number = %s WHERE email = %s",
+                [self.registration_number, f"bench{middle}@example.uz"],
+            )
+            cursor.execute("ANALYZE applications_application")
+        self.phone_number = f"+998{middle:09d}"
+        self.stdout.write(f"Seeded {rows} applications in {time.perf_counter() - started:.1f} s")
+
+    def run(self, options):
+        searches = [
+            ("registration number", self.registration_number),
+            ("phone number", self.phone_number),
+            ("first name", "dilnoza12"),
+            ("last name + name", "yusupova 4711"),
+            ("email fragment", "bench98765@"),
+            ("no match", "zzqxy"),
+        ]
+        self.stdout.write(f"{'search':>20} {'indexed ms':>11} {'seq scan ms':>12}  plan")
+        for label, term in searches:
+            indexed, plan = self.measure(term, options)
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_indexscan = off")
+                cursor.execute("SET LOCAL enable_bitmapscan = off")
+            seq_scan, _ = self.measure(term, options)
+            with connection.cursor() as cursor:
+                cursor.execute("RESET enable_indexscan")
+                cursor.execute("RESET enable_bitmapscan")
+            self.stdout.write(f"{label:>20} {indexed:11.2f} {seq_scan:12.2f}  {plan}")
+
+    def measure(self, term, options):
+        timings = []
+        for _ in range(options["repeat"]):
+            started = time.perf_counter()
+            queryset = search_applications(Application.objects.all(), term)
+            page = queryset.order_by("-created_at", "-id")[:options["page_size"] + 1]
+            list(page)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        sql, params = page.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN " + sql, params)
+            plan = [row[0].strip() for row in cursor.fetchall()]
+        scans = [line.split("  (")[0] for line in plan if "Scan" in line]
+        return statistics.median(timings), "; ".join(scans)
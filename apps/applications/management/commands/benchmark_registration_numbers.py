@@ -0,0 +1,58 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.applications.utils import allocate_registration_number, is_valid_registration_number
+
+
+class Command(BaseCommand):
+    help = (
+        "Allocate registration numbers from many threads at once and verify that "
+        "every number is unique and carries a valid check character."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=32)
+        parser.add_argument("--per-thread", type=int, default=200, help="Allocations per thread.")
+
+    def handle(self, *args, **options):
+        threads = options["threads"]
+        per_thread = options["per_thread"]
+        start_barrier = threading.Barrier(threads)
+
+        def worker(_):
+            try:
+                start_barrier.wait()
+                numbers = []
+                latencies = []
+                for _ in range(per_thread):
+                    started = time.perf_counter()
+                    numbers.append(allocate_registration_number())
+                    latencies.append(time.perf_counter() - started)
+                return numbers, latencies
+            finally:
+                # Har bir thread o'z ulanishini ochadi, uni yopish kerak
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(worker, range(threads)))
+        elapsed = time.perf_counter() - started
+
+        numbers = [number for thread_numbers, _ in results for number in thread_numbers]
+        latencies = sorted(latency for _, thread_latencies in results for latency in thread_latencies)
+        duplicates = len(numbers) - len(set(numbers))
+        invalid = sum(1 for number in numbers if not is_valid_registration_number(number))
+
+        self.stdout.write(f"Allocated {len(numbers)} numbers from {threads} threads in {elapsed:.2f} s")
+        self.stdout.write(f"Throughput: {len(numbers) / elapsed:.0f} numbers/s")
+        self.stdout.write(
+            f"Latency p50 {latencies[len(latencies) // 2] * 1000:.2f} ms, "
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms"
+        )
+        if duplicates or invalid:
+            raise CommandError(f"{duplicates} duplicate and {invalid} invalid registration numbers.")
+        self.stdout.write(self.style.SUCCESS("All registration numbers are unique and valid."))
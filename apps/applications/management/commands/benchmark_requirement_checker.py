@@ -0,0 +1,71 @@
+import random
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from apps.applications.requirements import RequirementsIndex, check_requirements
+
+
+def legacy_check(specialty_ids, specialist_titles, equipment_names, index):
+    """The per-requirement scan used before check_requirements existed."""
+    errors = []
+    for specialty_id in specialty_ids:
+        for _, title, min_count in index.specialists.get(specialty_id, ()):
+            count = sum(1 for selected in specialist_titles if selected == title)
+            if count < min_count:
+                errors.append((specialty_id, title, min_count, count))
+        for _, name, min_count in index.equipment.get(specialty_id, ()):
+            count = sum(1 for selected in equipment_names if selected == name)
+            if count < min_count:
+                errors.append((specialty_id, name, min_count, count))
+    return errors
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark the requirement checker on large synthetic branches. Does not touch the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--specialties", type=int, default=15, help="Specialties chosen per branch.")
+        parser.add_argument("--rules", type=int, default=40, help="Requirement rows per specialty and kind.")
+        parser.add_argument("--catalog", type=int, default=2000, help="Distinct specialists/equipment in the catalog.")
+        parser.add_argument("--selections", type=int, default=1500, help="Selected specialists and equipment per branch.")
+        parser.add_argument("--repeat", type=int, default=50, help="Checks per measurement.")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        catalog = options["catalog"]
+        specialty_ids = list(range(1, options["specialties"] + 1))
+
+        def rules():
+            return tuple(
+                (item_id, f"item-{item_id}", rng.randint(1, 3))
+                for item_id in rng.sample(range(catalog), options["rules"])
+            )
+
+        index = RequirementsIndex(
+            "benchmark",
+            {specialty_id: rules() for specialty_id in specialty_ids},
+            {specialty_id: rules() for specialty_id in specialty_ids},
+        )
+        specialist_ids = [rng.randrange(catalog) for _ in range(options["selections"])]
+        equipment_ids = [rng.randrange(catalog) for _ in range(options["selections"])]
+        specialist_titles = [f"item-{item_id}" for item_id in specialist_ids]
+        equipment_names = [f"item-{item_id}" for item_id in equipment_ids]
+
+        repeat = options["repeat"]
+        engine = timeit.repeat(
+            lambda: check_requirements(specialty_ids, specialist_ids, equipment_ids, index=index),
+            number=repeat, repeat=5,
+        )
+        legacy = timeit.repeat(
+            lambda: legacy_check(specialty_ids, specialist_titles, equipment_names, index),
+            number=repeat, repeat=5,
+        )
+
+        self.stdout.write(
+            f"Branch: {len(specialty_ids)} specialties x {options['rules']} rules per kind, "
+            f"{options['selections']} selections per kind"
+        )
+        for label, timings in (("check_requirements", engine), ("per-rule scan", legacy)):
+            self.stdout.write(f"{label:>18}: {min(timings) / repeat * 1000:8.3f} ms per branch")
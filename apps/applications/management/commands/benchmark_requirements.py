@@ -0,0 +1,130 @@
+import time
+from statistics import mean
+
+from django.db import connection
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.exceptions import ValidationError
+
+from apps.applications.models import (
+    Branch, Specialty, SpecialistsRequired,
+    EquipmentRequired, EquipmentRequiredItem
+)
+from apps.applications.requirements import get_requirements_index
+from apps.applications.api_endpoints.ApplicationCreate.serializers import ApplicationCreateSerializer
+
+
+class _PerSpecialtyLookup:
+    """Dict-like stand-in that queries the database on every ``get`` call."""
+
+    def __init__(self, loader):
+        self.loader = loader
+
+    def get(self, specialty_id, default=()):
+        return self.loader(specialty_id) or default
+
+
+class QueryRequirements:
+    """Reproduces the pre-index behaviour: requirement rows are queried per specialty."""
+
+    version = "uncached"
+
+    def __init__(self):
+        self.specialists = _PerSpecialtyLookup(self._load_specialists)
+        self.equipment = _PerSpecialtyLookup(self._load_equipment)
+
+    def _load_specialists(self, specialty_id):
+        return tuple(
+            (req.required_specialists_id, req.required_specialists.title, req.min_count)
+            for req in SpecialistsRequired.objects.filter(
+                specialty_id=specialty_id
+            ).select_related('required_specialists')
+        )
+
+    def _load_equipment(self, specialty_id):
+        try:
+            equipment_req = EquipmentRequired.objects.get(specialty_id=specialty_id)
+        except EquipmentRequired.DoesNotExist:
+            return ()
+        return tuple(
+            (item.equipment_id, item.equipment.name, item.min_count)
+            for item in EquipmentRequiredItem.objects.filter(
+                equipment_required=equipment_req
+            ).select_related('equipment')
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark branch validation of an application payload with the compiled "
+        "requirements index and with per-specialty queries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--branches", type=int, default=30, help="Number of branches in the payload.")
+        parser.add_argument("--specialties", type=int, default=3, help="Specialties per branch.")
+        parser.add_argument("--iterations", type=int, default=20, help="Validation runs per mode.")
+
+    def handle(self, *args, **options):
+        payload = self.build_payload(options["branches"], options["specialties"])
+
+        results = [
+            ("with index", self.run(payload, None, options["iterations"])),
+            ("without index", self.run(payload, QueryRequirements(), options["iterations"])),
+        ]
+
+        self.stdout.write(f"Payload: {len(payload)} branches, {options['specialties']} specialties each")
+        for label, (timings, queries) in results:
+            self.stdout.write(
+                f"{label:>14}: avg {mean(timings) * 1000:8.2f} ms, "
+                f"min {min(timings) * 1000:8.2f} ms, {queries} queries per validation"
+            )
+
+    def build_payload(self, branch_count, specialties_per_branch):
+        branches = list(
+            Branch.objects.exclude(branch_name__isnull=True).exclude(branch_name="")
+            .order_by('id').values_list('branch_name', flat=True)[:branch_count]
+        )
+        specialties = list(Specialty.objects.order_by('id'))
+        if not branches or not specialties:
+            raise CommandError("Benchmark needs at least one named branch and one specialty.")
+
+        index = get_requirements_index()
+        payload = []
+        for i in range(branch_count):
+            chosen = [
+                specialties[(i + offset) % len(specialties)]
+                for offset in range(specialties_per_branch)
+            ]
+            selected_specialists = []
+            selected_equipment = []
+            for specialty in chosen:
+                for specialist_id, title, min_count in index.specialists.get(specialty.id, ()):
+                    selected_specialists.extend([title] * min_count)
+                for equipment_id, name, min_count in index.equipment.get(specialty.id, ()):
+                    selected_equipment.extend([name] * min_count)
+
+            payload.append({
+                'branch': branches[i % len(branches)],
+                'specialties': [specialty.name for specialty in chosen],
+                'selected_specialists': selected_specialists,
+                'selected_equipment': selected_equipment,
+            })
+        return payload
+
+    def run(self, payload, requirements, iterations):
+        timings = []
+        queries = 0
+        for _ in range(iterations):
+            context = {'requirements_index': requirements} if requirements else {}
+            serializer = ApplicationCreateSerializer(context=context)
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                try:
+                    serializer.validate_branches(payload)
+                except ValidationError as e:
+                    raise CommandError(f"Generated payload did not validate: {e.detail}")
+                timings.append(time.perf_counter() - started)
+            queries = len(captured)
+        return timings, queries
@@ -0,0 +1,124 @@
+import os
+import json
+import time
+from itertools import islice
+
+from django.db import transaction
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.applications.importer import (
+    read_csv,
+    read_jsonl,
+    save_import_batch,
+    iter_validated_batches,
+    build_validation_context,
+)
+
+
+READERS = {
+    'csv': read_csv,
+    'jsonl': read_jsonl,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import applications with their branch selections from a CSV or JSONL file. "
+        "Rows are validated with the same rules as the application-create endpoint, "
+        "rejected rows are written to a side file and the import can be resumed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSONL file to import.")
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=sorted(READERS),
+            help="Input format; taken from the file extension by default.",
+        )
+        parser.add_argument("--user", help="Username that owns rows without a \"user\" value.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Records validated and inserted together.")
+        parser.add_argument("--workers", type=int, default=1, help="Validation processes (1 = validate in this process).")
+        parser.add_argument("--rejects", help="Rejected rows file (JSONL). Default: <path>.rejects.jsonl")
+        parser.add_argument("--checkpoint", help="Progress file. Default: <path>.checkpoint")
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the records already handled according to the checkpoint.",
+        )
+
+    def handle(self, *args, **options):
+        path = os.path.abspath(options["path"])
+        if not os.path.exists(path):
+            raise CommandError(f"{path} does not exist.")
+        file_format = options["file_format"] or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+        rejects_path = options["rejects"] or f"{path}.rejects.jsonl"
+        checkpoint_path = options["checkpoint"] or f"{path}.checkpoint"
+        batch_size = options["batch_size"]
+
+        default_user = None
+        if options["user"]:
+            CustomUser = get_user_model()
+            default_user = CustomUser.objects.filter(username=options["user"], is_deleted=False).first()
+            if default_user is None:
+                raise CommandError(f"User {options['user']!r} not found.")
+
+        progress = {"source": path, "records": 0, "created": 0, "rejected": 0, "completed": False}
+        if options["resume"] and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as checkpoint_file:
+                progress = json.load(checkpoint_file)
+            if progress["source"] != path:
+                raise CommandError(f"{checkpoint_path} belongs to {progress['source']}.")
+            if progress["completed"]:
+                self.stdout.write("This file has already been imported.")
+                return
+            self.stdout.write(f"Resuming after record {progress['records']}.")
+
+        context = build_validation_context()
+        started = time.perf_counter()
+        handled = 0
+
+        with open(path, newline="", encoding="utf-8-sig") as source, \
+                open(rejects_path, "a" if options["resume"] else "w", encoding="utf-8") as rejects:
+            records = islice(READERS[file_format](source), progress["records"], None)
+            batches = iter(lambda: list(islice(records, batch_size)), [])
+
+            for results in iter_validated_batches(batches, context, workers=options["workers"]):
+                try:
+                    with transaction.atomic():
+                        created, rejected = save_import_batch(results, default_user, batch_size=batch_size)
+                except Exception as exc:
+                    raise CommandError(
+                        f"Batch after record {progress['records']} failed: {exc}. "
+                        f"Fix the cause and run again with --resume."
+                    )
+
+                for position, record, errors in rejected:
+                    rejects.write(json.dumps({"position": position, "record": record, "errors": errors}, ensure_ascii=False) + "\n")
+                rejects.flush()
+
+                handled += len(results)
+                progress["records"] = results[-1][1]
+                progress["created"] += created
+                progress["rejected"] += len(rejected)
+                self._write_checkpoint(checkpoint_path, progress)
+                self.stdout.write(
+                    f"{progress['records']} records: {progress['created']} created, {progress['rejected']} rejected"
+                )
+
+        progress["completed"] = True
+        self._write_checkpoint(checkpoint_path, progress)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"Handled {handled} records in {elapsed:.2f} s ({handled / elapsed if elapsed else 0:.0f} records/s)")
+        if progress["rejected"]:
+            self.stdout.write(self.style.WARNING(f"{progress['rejected']} rejected rows are in {rejects_path}"))
+        self.stdout.write(self.style.SUCCESS(f"Imported {progress['created']} applications."))
+
+    def _write_checkpoint(self, checkpoint_path, progress):
+        # Yarim yozilgan fayl qolmasligi uchun avval vaqtinchalik faylga yoziladi
+        temporary_path = f"{checkpoint_path}.tmp"
+        with open(temporary_path, "w") as checkpoint_file:
+            json.dump(progress, checkpoint_file)
+        os.replace(temporary_path, checkpoint_path)
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.applications.requirements import get_requirements_index, get_requirements_version
+
+
+class Command(BaseCommand):
+    help = "Show the version and size of the compiled requirements index."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--version-only",
+            action="store_true",
+            help="Print only the current rule set version.",
+        )
+
+    def handle(self, *args, **options):
+        if options["version_only"]:
+            self.stdout.write(get_requirements_version())
+            return
+
+        index = get_requirements_index()
+        specialist_rows = sum(len(rows) for rows in index.specialists.values())
+        equipment_rows = sum(len(rows) for rows in index.equipment.values())
+
+        self.stdout.write(f"Version: {index.version or '- (no shared cache, built per request)'}")
+        self.stdout.write(f"Specialties with specialist requirements: {len(index.specialists)} ({specialist_rows} rows)")
+        self.stdout.write(f"Specialties with equipment requirements: {len(index.equipment)} ({equipment_rows} rows)")
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0003_application_application_status_1508e0_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE SEQUENCE IF NOT EXISTS applications_registration_number_seq",
+            reverse_sql="DROP SEQUENCE IF EXISTS applications_registration_number_seq",
+        ),
+        migrations.RunSQL(
+            sql="UPDATE applications_application SET registration_number = NULL WHERE registration_number = ''",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='registration_number',
+            field=models.CharField(blank=True, max_length=128, null=True, unique=True, verbose_name='Registration number'),
+        ),
+    ]
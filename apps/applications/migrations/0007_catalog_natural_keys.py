@@ -0,0 +1,67 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:32
+
+from django.db import migrations, models
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+# Katalog kalitlari (katta-kichik harfsiz) bo'yicha takroriy qatorlar cheklovdan oldin aniqlanadi:
+# cheklov xatosi o'rniga qaysi qatorlarni birlashtirish yoki qayta nomlash kerakligi ko'rsatiladi.
+CATALOG_KEYS = [
+    ("Specialty", (), "name"),
+    ("Specialist", (), "title"),
+    ("Equipment", (), "name"),
+    ("Branch", ("district_id",), "branch_name"),
+]
+
+
+def check_duplicate_keys(apps, schema_editor):
+    problems = []
+    for model_name, scope, field in CATALOG_KEYS:
+        model = apps.get_model("applications", model_name)
+        duplicates = (
+            model.objects.filter(**{f"{field}__isnull": False})
+            .values(*scope, key=Lower(field))
+            .annotate(ids=ArrayAgg("id"), count=Count("id"))
+            .filter(count__gt=1)
+            .order_by("key")
+        )
+        for row in duplicates:
+            ids = ", ".join(str(pk) for pk in sorted(row["ids"]))
+            problems.append(f"{model_name}.{field} {row['key']!r}: id {ids}")
+    if problems:
+        raise RuntimeError(
+            "Catalog rows whose keys differ only in case; merge or rename them, then migrate again:\n"
+            + "\n".join(problems)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0006_application_search_trgm_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='equipment',
+            name='name',
+            field=models.CharField(max_length=255, unique=True, verbose_name='Equipment name'),
+        ),
+        migrations.AlterField(
+            model_name='specialist',
+            name='title',
+            field=models.CharField(max_length=128, unique=True, verbose_name='Specialist title'),
+        ),
+        migrations.AlterField(
+            model_name='specialty',
+            name='name',
+            field=models.CharField(max_length=255, unique=True, verbose_name='Specialty name'),
+        ),
+        migrations.AddConstraint(
+            model_name='branch',
+            constraint=models.UniqueConstraint(fields=('district', 'branch_name'), name='unique_branch_name_per_district'),
+        ),
+    ]
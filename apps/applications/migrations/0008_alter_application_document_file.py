@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:49
+
+import apps.common.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0007_catalog_natural_keys'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='document_file',
+            field=models.FileField(blank=True, null=True, storage=apps.common.storage.get_content_storage, upload_to='documents/', verbose_name='Document file'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:37
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+# Katalog kalitlari (katta-kichik harfsiz) bo'yicha takroriy qatorlar cheklovdan oldin aniqlanadi:
+# cheklov xatosi o'rniga qaysi qatorlarni birlashtirish yoki qayta nomlash kerakligi ko'rsatiladi.
+CATALOG_KEYS = [
+    ("Specialty", (), "name"),
+    ("Specialist", (), "title"),
+    ("Equipment", (), "name"),
+    ("Branch", ("district_id",), "branch_name"),
+]
+
+
+def check_duplicate_keys(apps, schema_editor):
+    problems = []
+    for model_name, scope, field in CATALOG_KEYS:
+        model = apps.get_model("applications", model_name)
+        duplicates = (
+            model.objects.filter(**{f"{field}__isnull": False})
+            .values(*scope, key=Lower(field))
+            .annotate(ids=ArrayAgg("id"), count=Count("id"))
+            .filter(count__gt=1)
+            .order_by("key")
+        )
+        for row in duplicates:
+            ids = ", ".join(str(pk) for pk in sorted(row["ids"]))
+            problems.append(f"{model_name}.{field} {row['key']!r}: id {ids}")
+    if problems:
+        raise RuntimeError(
+            "Catalog rows whose keys differ only in case; merge or rename them, then migrate again:\n"
+            + "\n".join(problems)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0009_catalog_search_trgm_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_keys, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='equipment',
+            name='application_name_ae352b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='specialist',
+            name='application_title_831e51_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='specialty',
+            name='application_name_9eb263_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='branch',
+            constraint=models.UniqueConstraint(models.F('district'), django.db.models.functions.text.Lower('branch_name'), name='unique_branch_name_per_district_ci'),
+        ),
+        migrations.AddConstraint(
+            model_name='equipment',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='unique_equipment_name_ci'),
+        ),
+        migrations.AddConstraint(
+            model_name='specialist',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('title'), name='unique_specialist_title_ci'),
+        ),
+        migrations.AddConstraint(
+            model_name='specialty',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='unique_specialty_name_ci'),
+        ),
+    ]
@@ -1,8 +1,11 @@
 from django.db import models
+from django.db.models.functions import Lower, Upper
 from django.contrib.auth import get_user_model
 from django.core.validators import RegexValidator
 from django.utils.translation import gettext_lazy as _
+from django.contrib.postgres.indexes import GinIndex, OpClass
 
+from apps.common.storage import get_content_storage
 from apps.applications.choices import ApplicationStatus
 
 CustomUser = get_user_model()
@@ -53,33 +56,46 @@ class Branch(models.Model):
             models.Index(fields=["district"]),
             models.Index(fields=["branch_name"])
             ]
+        constraints = [
+            models.UniqueConstraint(fields=["district", "branch_name"], name="unique_branch_name_per_district"),
+            # Nomlar katta-kichik harfsiz solishtiriladi (bulk_upsert_catalog kabi)
+            models.UniqueConstraint("district", Lower("branch_name"), name="unique_branch_name_per_district_ci"),
+        ]
         verbose_name = _("Branch")
         verbose_name_plural = _("Branches")
 
 
 class Specialty(models.Model):
-    name = models.CharField(max_length=255, verbose_name=_("Specialty name"))
+    name = models.CharField(max_length=255, unique=True, verbose_name=_("Specialty name"))
 
     def __str__(self):
         return self.name
     
     class Meta:
         indexes = [
-            models.Index(fields=["name"])
+            # Admin autocomplete qidiruvi (icontains) uchun trigram indeks
+            GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="specialty_name_trgm"),
+        ]
+        constraints = [
+            models.UniqueConstraint(Lower("name"), name="unique_specialty_name_ci"),
         ]
         verbose_name = _("Specialty")
         verbose_name_plural = _("Specialties")
 
 
 class Specialist(models.Model):
-    title = models.CharField(max_length=128, verbose_name=_("Specialist title"))
+    title = models.CharField(max_length=128, unique=True, verbose_name=_("Specialist title"))
 
     def __str__(self):
         return self.title
     
     class Meta:
         indexes = [
-            models.Index(fields=["title"])
+            # Admin autocomplete qidiruvi (icontains) uchun trigram indeks
+            GinIndex(OpClass(Upper("title"), name="gin_trgm_ops"), name="specialist_title_trgm"),
+        ]
+        constraints = [
+            models.UniqueConstraint(Lower("title"), name="unique_specialist_title_ci"),
         ]
         verbose_name = _("Specialist")
         verbose_name_plural = _("Specialists")
@@ -110,7 +126,7 @@ class SpecialistsRequired(models.Model):
 
 
 class Equipment(models.Model):
-    name = models.CharField(max_length=255, verbose_name=_("Equipment name"))
+    name = models.CharField(max_length=255, unique=True, verbose_name=_("Equipment name"))
     description = models.TextField(blank=True, verbose_name=_("Description"))
 
     def __str__(self):
@@ -118,7 +134,12 @@ class Equipment(models.Model):
     
     class Meta:
         indexes = [
-            models.Index(fields=["name"])
+            # Admin autocomplete qidiruvi (icontains) uchun trigram indeks
+            GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="equipment_name_trgm"),
+            GinIndex(OpClass(Upper("description"), name="gin_trgm_ops"), name="equipment_description_trgm"),
+        ]
+        constraints = [
+            models.UniqueConstraint(Lower("name"), name="unique_equipment_name_ci"),
         ]
         verbose_name = _("Equipment")
         verbose_name_plural = _("Equipments")
@@ -193,6 +214,7 @@ class Application(models.Model):
     document_type = models.CharField(max_length=50, verbose_name=_("Document type"))
     document_file = models.FileField(
         upload_to='documents/', 
+        storage=get_content_storage,
         blank=True, 
         null=True,
         verbose_name=_("Document file"))
@@ -200,6 +222,7 @@ class Application(models.Model):
         max_length=128, 
         blank=True, 
         null=True, 
+        unique=True,
         verbose_name=_("Registration number"))
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -219,6 +242,17 @@ class Application(models.Model):
         indexes = [
             models.Index(fields=["user"]),
             models.Index(fields=["status"]),
+            # Ro'yxatning kursorli sahifalashi uchun (tartib maydoni, id)
+            models.Index(fields=["-created_at", "-id"], name="application_created_id_idx"),
+            models.Index(fields=["-updated_at", "-id"], name="application_updated_id_idx"),
+            models.Index(fields=["user", "-created_at", "-id"], name="application_user_created_idx"),
+            models.Index(fields=["user", "-updated_at", "-id"], name="application_user_updated_idx"),
+            # ILIKE '%...%' qidiruvi uchun trigram indekslar (UPPER(...) icontains bilan mos keladi)
+            GinIndex(OpClass(Upper("first_name"), name="gin_trgm_ops"), name="application_first_name_trgm"),
+            GinIndex(OpClass(Upper("last_name"), name="gin_trgm_ops"), name="application_last_name_trgm"),
+            GinIndex(OpClass(Upper("email"), name="gin_trgm_ops"), name="application_email_trgm"),
+            GinIndex(OpClass(Upper("phone_number"), name="gin_trgm_ops"), name="application_phone_number_trgm"),
+            GinIndex(OpClass(Upper("registration_number"), name="gin_trgm_ops"), name="application_reg_number_trgm"),
         ]
         verbose_name = "Application"
         verbose_name_plural = "Applications"
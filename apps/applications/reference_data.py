@@ -0,0 +1,160 @@
+import time
+import hashlib
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from apps.applications.models import (
+    Region, District, Branch, Specialty, Specialist,
+    SpecialistsRequired, Equipment, EquipmentRequired,
+    EquipmentRequiredItem
+)
+from apps.common.generations import get_generations, generations_are_shared
+
+
+# Ma'lumotnoma katalogi: shu modellardan biri o'zgarsa, katalog versiyasi o'zgaradi.
+CATALOG_MODELS = (
+    Region,
+    District,
+    Branch,
+    Specialty,
+    Specialist,
+    Equipment,
+    SpecialistsRequired,
+    EquipmentRequired,
+    EquipmentRequiredItem,
+)
+
+REFERENCE_SNAPSHOT_KEY = "reference-data:{version}"
+
+
+def get_catalog_version():
+    """Current version of the reference catalog, e.g. ``"3.8.41.7.12.5.9.2.6"``."""
+    return ".".join(str(generation) for generation in get_generations(CATALOG_MODELS))
+
+
+def _build_catalog():
+    requirements = defaultdict(lambda: {'specialists': [], 'equipment': []})
+
+    specialist_rows = SpecialistsRequired.objects.values_list(
+        'specialty_id', 'required_specialists_id', 'min_count'
+    ).order_by('specialty_id', 'id')
+    for specialty_id, specialist_id, min_count in specialist_rows:
+        requirements[specialty_id]['specialists'].append(
+            {'specialist': specialist_id, 'min_count': min_count}
+        )
+
+    equipment_rows = EquipmentRequiredItem.objects.values_list(
+        'equipment_required__specialty_id', 'equipment_id', 'min_count'
+    ).order_by('equipment_required__specialty_id', 'id')
+    for specialty_id, equipment_id, min_count in equipment_rows:
+        requirements[specialty_id]['equipment'].append(
+            {'equipment': equipment_id, 'min_count': min_count}
+        )
+
+    return {
+        'regions': [
+            {'id': pk, 'region_name': region_name}
+            for pk, region_name in Region.objects.values_list('id', 'region_name').order_by('region_name', 'id')
+        ],
+        'districts': [
+            {'id': pk, 'region': region_id, 'district_name': district_name}
+            for pk, region_id, district_name in District.objects.values_list(
+                'id', 'region_id', 'district_name'
+            ).order_by('district_name', 'id')
+        ],
+        'branches': [
+            {'id': pk, 'district': district_id, 'branch_name': branch_name}
+            for pk, district_id, branch_name in Branch.objects.values_list(
+                'id', 'district_id', 'branch_name'
+            ).order_by('branch_name', 'id')
+        ],
+        'specialties': [
+            {'id': pk, 'name': name}
+            for pk, name in Specialty.objects.values_list('id', 'name').order_by('name', 'id')
+        ],
+        'specialists': [
+            {'id': pk, 'title': title}
+            for pk, title in Specialist.objects.values_list('id', 'title').order_by('title', 'id')
+        ],
+        'equipment': [
+            {'id': pk, 'name': name, 'description': description}
+            for pk, name, description in Equipment.objects.values_list(
+                'id', 'name', 'description'
+            ).order_by('name', 'id')
+        ],
+        'requirements': [
+            {'specialty': specialty_id, **requirements[specialty_id]}
+            for specialty_id in sorted(requirements)
+        ],
+    }
+
+
+class ReferenceSnapshot:
+    """
+    The whole reference catalog rendered to JSON once per catalog version.
+
+    ``etag`` is a strong validator derived from the body, so it is the same in
+    every process that renders the same data.
+    """
+
+    def __init__(self, version, body):
+        self.version = version
+        self.body = body
+        self.etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def build(cls, version):
+        return cls(version, JSONRenderer().render(_build_catalog()))
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_reference_local_max_age():
+    return getattr(settings, "REFERENCE_DATA_LOCAL_MAX_AGE", 30)
+
+
+def get_reference_snapshot():
+    """
+    Return the ReferenceSnapshot of the current catalog version. It is kept in
+    this process and in the shared cache, and rebuilt only after the version
+    has changed.
+
+    Without a shared cache (``generations_are_shared()``) the version does not
+    change when another process edits the catalog, so the snapshot of this
+    process is also rebuilt once it is ``REFERENCE_DATA_LOCAL_MAX_AGE``
+    seconds old.
+    """
+    global _snapshot
+
+    version = get_catalog_version()
+    shared = generations_are_shared()
+
+    def is_current(snapshot):
+        if snapshot is None or snapshot.version != version:
+            return False
+        return shared or time.monotonic() - snapshot.built_at < get_reference_local_max_age()
+
+    snapshot = _snapshot
+    if is_current(snapshot):
+        return snapshot
+
+    with _snapshot_lock:
+        if not is_current(_snapshot):
+            if not shared:
+                _snapshot = ReferenceSnapshot.build(version)
+                return _snapshot
+
+            key = REFERENCE_SNAPSHOT_KEY.format(version=version)
+            snapshot = cache.get(key)
+            if snapshot is None:
+                snapshot = ReferenceSnapshot.build(version)
+                cache.set(key, snapshot, timeout=getattr(settings, "REFERENCE_DATA_CACHE_TIMEOUT", 60 * 60 * 24))
+            _snapshot = snapshot
+        return _snapshot
@@ -0,0 +1,207 @@
+import time
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+
+from apps.applications.models import (
+    Specialist, Equipment, SpecialistsRequired,
+    EquipmentRequired, EquipmentRequiredItem
+)
+from apps.common.generations import get_generations, generations_are_shared
+
+
+# Indeksga ta'sir qiladigan modellar: talablar jadvallari va ularda ko'rsatiladigan nomlar.
+REQUIREMENT_MODELS = (
+    SpecialistsRequired,
+    EquipmentRequired,
+    EquipmentRequiredItem,
+    Specialist,
+    Equipment,
+)
+
+
+class RequirementsIndex:
+    """
+    Compiled specialist and equipment minimums keyed by specialty id.
+
+    ``specialists[specialty_id]`` is a tuple of ``(specialist_id, title, min_count)``
+    and ``equipment[specialty_id]`` a tuple of ``(equipment_id, name, min_count)``.
+    """
+
+    def __init__(self, version, specialists, equipment):
+        self.version = version
+        self.specialists = specialists
+        self.equipment = equipment
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def build(cls, version):
+        specialists = defaultdict(list)
+        specialist_rows = SpecialistsRequired.objects.values_list(
+            'specialty_id',
+            'required_specialists_id',
+            'required_specialists__title',
+            'min_count',
+        ).order_by('id')
+        for specialty_id, specialist_id, title, min_count in specialist_rows:
+            specialists[specialty_id].append((specialist_id, title, min_count))
+
+        equipment = defaultdict(list)
+        equipment_rows = EquipmentRequiredItem.objects.values_list(
+            'equipment_required__specialty_id',
+            'equipment_id',
+            'equipment__name',
+            'min_count',
+        ).order_by('id')
+        for specialty_id, equipment_id, name, min_count in equipment_rows:
+            equipment[specialty_id].append((equipment_id, name, min_count))
+
+        return cls(
+            version,
+            {key: tuple(rows) for key, rows in specialists.items()},
+            {key: tuple(rows) for key, rows in equipment.items()},
+        )
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_requirements_version():
+    """Current version of the requirement rule set, e.g. ``"12.4.97.3.8"``."""
+    return ".".join(str(generation) for generation in get_generations(REQUIREMENT_MODELS))
+
+
+def get_requirements_local_max_age():
+    return getattr(settings, "REQUIREMENTS_INDEX_LOCAL_MAX_AGE", 30)
+
+
+def get_requirements_index():
+    """
+    Return the process-wide RequirementsIndex, rebuilding it when the
+    rule set version has changed since it was compiled.
+
+    Without a shared cache (``generations_are_shared()``) the version does not
+    change when another process edits the rules, so the index is also rebuilt
+    once it is ``REQUIREMENTS_INDEX_LOCAL_MAX_AGE`` seconds old.
+    """
+    global _index
+
+    version = get_requirements_version()
+    shared = generations_are_shared()
+
+    def is_current(index):
+        if index is None or index.version != version:
+            return False
+        return shared or time.monotonic() - index.built_at < get_requirements_local_max_age()
+
+    index = _index
+    if is_current(index):
+        return index
+
+    with _index_lock:
+        if not is_current(_index):
+            _index = RequirementsIndex.build(version)
+        return _index
+
+
+def clear_requirements_index():
+    """Drop the compiled index of this process; the next read rebuilds it."""
+    global _index
+    _index = None
+
+
+class RequirementReport:
+    """
+    Result of a requirement check.
+
+    Each deficit is a dict with the specialist or equipment ``id`` and ``name``,
+    the combined ``required`` minimum, the ``provided`` and ``missing`` counts
+    and the ``specialty_ids`` that demand it.
+    """
+
+    def __init__(self, specialist_deficits, equipment_deficits):
+        self.specialist_deficits = specialist_deficits
+        self.equipment_deficits = equipment_deficits
+
+    @property
+    def is_satisfied(self):
+        return not (self.specialist_deficits or self.equipment_deficits)
+
+    def as_dict(self):
+        return {
+            'is_satisfied': self.is_satisfied,
+            'specialist_deficits': self.specialist_deficits,
+            'equipment_deficits': self.equipment_deficits,
+        }
+
+
+def _find_deficits(specialty_ids, requirements, selected_ids):
+    # Bir nechta ixtisoslik bir xil mutaxassis/jihozni talab qilsa, eng katta minimum olinadi.
+    required = {}
+    for specialty_id in specialty_ids:
+        for item_id, name, min_count in requirements.get(specialty_id, ()):
+            entry = required.get(item_id)
+            if entry is None:
+                required[item_id] = entry = {'name': name, 'min_count': 0, 'specialty_ids': []}
+            entry['min_count'] = max(entry['min_count'], min_count)
+            entry['specialty_ids'].append(specialty_id)
+
+    if not required:
+        return []
+
+    provided = Counter(selected_ids)
+    deficits = []
+    for item_id, entry in required.items():
+        count = provided[item_id]
+        if count < entry['min_count']:
+            deficits.append({
+                'id': item_id,
+                'name': entry['name'],
+                'required': entry['min_count'],
+                'provided': count,
+                'missing': entry['min_count'] - count,
+                'specialty_ids': entry['specialty_ids'],
+            })
+    return deficits
+
+
+def check_requirements(specialty_ids, specialist_ids, equipment_ids, index=None):
+    """
+    Check selected specialist and equipment ids against the combined minimums
+    of the given specialties. Selections are counted in one pass, by id, and
+    repeated ids count towards ``min_count``.
+    """
+    index = index or get_requirements_index()
+    specialty_ids = list(dict.fromkeys(specialty_ids))
+
+    return RequirementReport(
+        _find_deficits(specialty_ids, index.specialists, specialist_ids),
+        _find_deficits(specialty_ids, index.equipment, equipment_ids),
+    )
+
+
+def check_application_branch(application_branch, index=None):
+    """
+    Re-check a saved ApplicationBranch. Saved selections are sets, so every
+    specialist or equipment counts at most once.
+    """
+    return check_requirements(
+        [specialty.id for specialty in application_branch.specialties.all()],
+        [specialist.id for specialist in application_branch.selected_specialists.all()],
+        [equipment.id for equipment in application_branch.selected_equipment.all()],
+        index=index,
+    )
+
+
+def recheck_application_branches(queryset, index=None, chunk_size=500):
+    """
+    Yield ``(application_branch, report)`` for every ApplicationBranch in
+    ``queryset``, e.g. after the requirement rules were changed.
+    """
+    index = index or get_requirements_index()
+    queryset = queryset.prefetch_related('specialties', 'selected_specialists', 'selected_equipment')
+
+    for application_branch in queryset.iterator(chunk_size=chunk_size):
+        yield application_branch, check_application_branch(application_branch, index=index)
@@ -0,0 +1,204 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+
+from apps.applications.models import ApplicationBranch
+from apps.common.generations import bump_generation
+
+
+BRANCH_SELECTION_FIELDS = ('specialties', 'selected_specialists', 'selected_equipment')
+
+
+def _unique_pks(objects):
+    return list(dict.fromkeys(obj.pk for obj in objects))
+
+
+def bulk_create_application_branches(rows, batch_size=1000):
+    """
+    Persist ``(application, branch_data)`` pairs, where ``branch_data`` is the
+    validated output of ApplicationBranchSerializer.
+
+    Runs one INSERT for the ApplicationBranch rows and one INSERT per
+    through table, however many branches and applications are given.
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+
+    application_branches = ApplicationBranch.objects.bulk_create(
+        [
+            ApplicationBranch(application=application, branch=branch_data['branch'])
+            for application, branch_data in rows
+        ],
+        batch_size=batch_size,
+    )
+
+    for field_name in BRANCH_SELECTION_FIELDS:
+        field = ApplicationBranch._meta.get_field(field_name)
+        through = field.remote_field.through
+        source_column = field.m2m_column_name()
+        target_column = field.m2m_reverse_name()
+
+        links = [
+            through(**{source_column: application_branch.pk, target_column: pk})
+            for application_branch, (_, branch_data) in zip(application_branches, rows)
+            for pk in _unique_pks(branch_data.get(field_name) or [])
+        ]
+        if links:
+            through.objects.bulk_create(links, batch_size=batch_size)
+
+    return application_branches
+
+
+def create_application_branches(application, branches_data):
+    return bulk_create_application_branches(
+        (application, branch_data) for branch_data in branches_data
+    )
+
+
+def sync_application_branches(application, branches_data):
+    """
+    Reconcile the saved branches of ``application`` with ``branches_data``.
+
+    Incoming branches are matched to existing ApplicationBranch rows by branch
+    id. Unmatched rows are deleted, new branches are bulk inserted and, for
+    matched rows, only the through-table links that were added or removed are
+    written. Unchanged branches are not touched.
+    """
+    existing = defaultdict(list)
+    for application_branch in ApplicationBranch.objects.filter(
+        application=application
+    ).only('id', 'branch_id').order_by('id'):
+        existing[application_branch.branch_id].append(application_branch)
+
+    matched = []
+    added = []
+    for branch_data in branches_data:
+        candidates = existing.get(branch_data['branch'].pk)
+        if candidates:
+            matched.append((candidates.pop(0), branch_data))
+        else:
+            added.append((application, branch_data))
+
+    removed_ids = [application_branch.pk for rows in existing.values() for application_branch in rows]
+    if removed_ids:
+        ApplicationBranch.objects.filter(pk__in=removed_ids).delete()
+
+    if matched:
+        _sync_branch_selections(matched)
+
+    return bulk_create_application_branches(added)
+
+
+def _sync_branch_selections(matched, batch_size=1000):
+    matched_ids = [application_branch.pk for application_branch, _ in matched]
+
+    for field_name in BRANCH_SELECTION_FIELDS:
+        field = ApplicationBranch._meta.get_field(field_name)
+        through = field.remote_field.through
+        source_column = field.m2m_column_name()
+        target_column = field.m2m_reverse_name()
+
+        desired = {
+            (application_branch.pk, pk)
+            for application_branch, branch_data in matched
+            for pk in _unique_pks(branch_data.get(field_name) or [])
+        }
+
+        stale_ids = []
+        current = set()
+        links = through.objects.filter(
+            **{f"{source_column}__in": matched_ids}
+        ).values_list('id', source_column, target_column)
+        for link_id, source_id, target_id in links:
+            if (source_id, target_id) in desired:
+                current.add((source_id, target_id))
+            else:
+                stale_ids.append(link_id)
+
+        if stale_ids:
+            through.objects.filter(pk__in=stale_ids).delete()
+
+        missing = desired - current
+        if missing:
+            through.objects.bulk_create(
+                [
+                    through(**{source_column: source_id, target_column: target_id})
+                    for source_id, target_id in sorted(missing)
+                ],
+                batch_size=batch_size,
+            )
+
+
+def bulk_upsert_catalog(model, rows, unique_fields, update_fields=None, batch_size=1000):
+    """
+    Insert or update ``(index, instance)`` pairs of a catalog model by natural
+    key, in one existence query and one ``INSERT ... ON CONFLICT DO UPDATE``
+    per batch.
+
+    Text keys are matched case-insensitively, like CatalogResolver does: a
+    row whose key differs from a saved one only in case takes the saved
+    spelling and updates that row instead of adding a second one.
+
+    Returns ``(index, instance, status)`` for every row, where status is
+    ``"created"``, ``"updated"`` or ``"duplicate"``; for repeated keys the
+    last row wins and the earlier ones point at its instance.
+    """
+    fields = [model._meta.get_field(name) for name in unique_fields]
+    key_attnames = [field.attname for field in fields]
+    text_keys = [field.get_internal_type() in ("CharField", "TextField") for field in fields]
+
+    def natural_key(instance):
+        return tuple(
+            value.lower() if is_text and isinstance(value, str) else value
+            for value, is_text in zip((getattr(instance, attname) for attname in key_attnames), text_keys)
+        )
+
+    latest = {}
+    for index, instance in rows:
+        latest[natural_key(instance)] = (index, instance)
+    if not latest:
+        return []
+
+    # Mavjud kalitlar "created"/"updated" ni ajratish va saqlangan yozilishni olish uchun o'qiladi
+    annotations = {}
+    lookups = {}
+    for position, (attname, is_text) in enumerate(zip(key_attnames, text_keys)):
+        alias = f"_natural_key_{position}"
+        annotations[alias] = Lower(attname) if is_text else F(attname)
+        lookups[f"{alias}__in"] = list({key[position] for key in latest})
+    existing = {}
+    for row in model.objects.annotate(**annotations).filter(**lookups).order_by("pk").values_list(
+        *annotations, *key_attnames
+    ):
+        key, saved = tuple(row[:len(key_attnames)]), row[len(key_attnames):]
+        if key in latest:
+            existing.setdefault(key, saved)
+
+    instances = []
+    for key, (_, instance) in latest.items():
+        for attname, value in zip(key_attnames, existing.get(key, ())):
+            setattr(instance, attname, value)
+        instances.append(instance)
+
+    model.objects.bulk_create(
+        instances,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=update_fields or unique_fields,
+    )
+    # bulk_create signal yubormaydi, shuning uchun versiya shu yerda oshiriladi
+    transaction.on_commit(lambda: bump_generation(model))
+
+    results = []
+    for index, instance in rows:
+        key = natural_key(instance)
+        kept_index, kept = latest[key]
+        if kept_index != index:
+            results.append((index, kept, "duplicate"))
+        else:
+            results.append((index, kept, "updated" if key in existing else "created"))
+    return results
@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from apps.applications.requirements import REQUIREMENT_MODELS
+from apps.applications.reference_data import CATALOG_MODELS
+from apps.common.generations import bump_generation
+
+
+def bump_model_generation(sender, **kwargs):
+    # Versiya tranzaksiya tasdiqlangandan keyin oshiriladi, aks holda boshqa jarayon
+    # yangi versiya bilan eski ma'lumotni indeksga yozib qo'yishi mumkin.
+    transaction.on_commit(lambda: bump_generation(sender))
+
+
+# Talablar indeksi ham, ma'lumotnoma katalogi ham shu hisoblagichlardan versiya oladi
+for model in dict.fromkeys(REQUIREMENT_MODELS + CATALOG_MODELS):
+    post_save.connect(bump_model_generation, sender=model, dispatch_uid=f"generation_save_{model._meta.label_lower}")
+    post_delete.connect(bump_model_generation, sender=model, dispatch_uid=f"generation_delete_{model._meta.label_lower}")
@@ -1,3 +1,515 @@
-from django.test import TestCase
+import io
+import csv
+import json
 
-# Create your tests here.
+from django.urls import reverse
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection, transaction, IntegrityError
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from apps.users.models import CustomUser
+from apps.applications.choices import ApplicationStatus
+from apps.applications.services import create_application_branches
+from apps.applications.export import stream_applications_csv, stream_applications_ndjson
+from apps.applications.requirements import clear_requirements_index
+from apps.applications.models import (
+    Region, District, Branch, Specialty, Specialist, Equipment,
+    SpecialistsRequired, EquipmentRequired, EquipmentRequiredItem,
+    Application, ApplicationBranch
+)
+
+
+class CatalogTestData:
+    """Catalog of 30 branches and 3 specialties with specialist and equipment minimums."""
+    branch_count = 30
+
+    @classmethod
+    def setUpTestData(cls):
+        region = Region.objects.create(region_name="Test viloyat")
+        district = District.objects.create(region=region, district_name="Test tuman")
+        cls.branches = Branch.objects.bulk_create([
+            Branch(district=district, branch_name=f"Test filial {i}")
+            for i in range(cls.branch_count)
+        ])
+        cls.specialties = Specialty.objects.bulk_create([
+            Specialty(name=f"Test ixtisoslik {i}") for i in range(3)
+        ])
+        cls.specialists = Specialist.objects.bulk_create([
+            Specialist(title=f"Test mutaxassis {i}") for i in range(6)
+        ])
+        cls.equipment = Equipment.objects.bulk_create([
+            Equipment(name=f"Test uskuna {i}") for i in range(6)
+        ])
+        for i, specialty in enumerate(cls.specialties):
+            SpecialistsRequired.objects.create(
+                specialty=specialty, required_specialists=cls.specialists[i], min_count=1
+            )
+            equipment_required = EquipmentRequired.objects.create(specialty=specialty)
+            EquipmentRequiredItem.objects.create(
+                equipment_required=equipment_required, equipment=cls.equipment[i], min_count=1
+            )
+        cls.user = CustomUser.objects.create(phone_number="+998900001001", is_active=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def branch_payload(self, count, variant=0):
+        # variant 0 va 1 bir xil talablarni turli tanlovlar bilan qondiradi
+        return [
+            {
+                "branch": branch.branch_name,
+                "specialties": [specialty.name for specialty in self.specialties],
+                "selected_specialists": [
+                    specialist.title for specialist in self.specialists[:3 + variant * 3]
+                ],
+                "selected_equipment": [
+                    equipment.name for equipment in self.equipment[:3 + variant * 3]
+                ],
+            }
+            for branch in self.branches[:count]
+        ]
+
+    def application_payload(self, count, number, variant=0):
+        return {
+            "action": "save",
+            "first_name": "Test",
+            "last_name": "Test",
+            "paternal_name": "Test",
+            "phone_number": f"+99890{number:07d}",
+            "email": f"test{number}@example.com",
+            "document_type": "Passport",
+            "full_address": "Toshkent",
+            "branches": self.branch_payload(count, variant),
+        }
+
+
+class ApplicationBranchWriteQueriesTests(CatalogTestData, TestCase):
+    """Create and update run the same number of queries for 1 and 30 branches."""
+
+    def create_application(self, count, number):
+        application = Application.objects.create(
+            user=self.user,
+            first_name="Test",
+            last_name="Test",
+            paternal_name="Test",
+            phone_number=f"+99891{number:07d}",
+            email=f"saved{number}@example.com",
+            document_type="Passport",
+            full_address="Toshkent",
+            status=ApplicationStatus.DRAFT,
+        )
+        create_application_branches(application, [
+            {
+                "branch": branch,
+                "specialties": self.specialties,
+                "selected_specialists": self.specialists[:3],
+                "selected_equipment": self.equipment[:3],
+            }
+            for branch in self.branches[:count]
+        ])
+        return application
+
+    def post(self, payload):
+        return self.client.post(reverse("applications:application-create"), payload, format="json")
+
+    def patch(self, application, payload):
+        url = reverse("applications:application-update-detail", kwargs={"pk": application.pk})
+        return self.client.patch(url, payload, format="json")
+
+    def test_create_queries_do_not_grow_with_branches(self):
+        self.assertEqual(self.post(self.application_payload(1, 1)).status_code, 201)
+
+        with CaptureQueriesContext(connection) as one_branch:
+            response = self.post(self.application_payload(1, 2))
+        self.assertEqual(response.status_code, 201, response.data)
+
+        with self.assertNumQueries(len(one_branch)):
+            response = self.post(self.application_payload(self.branch_count, 3))
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(
+            ApplicationBranch.objects.filter(application_id=response.data["data"]["id"]).count(),
+            self.branch_count,
+        )
+
+    def test_update_queries_do_not_grow_with_branches(self):
+        warm_up = self.create_application(1, 1)
+        self.assertEqual(self.patch(warm_up, {"branches": self.branch_payload(1, variant=1)}).status_code, 200)
+
+        one = self.create_application(1, 2)
+        with CaptureQueriesContext(connection) as one_branch:
+            response = self.patch(one, {"branches": self.branch_payload(1, variant=1)})
+        self.assertEqual(response.status_code, 200, response.data)
+
+        many = self.create_application(self.branch_count, 3)
+        with self.assertNumQueries(len(one_branch)):
+            response = self.patch(many, {"branches": self.branch_payload(self.branch_count, variant=1)})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            ApplicationBranch.objects.filter(application=many, selected_specialists=self.specialists[5]).count(),
+            self.branch_count,
+        )
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class ApplicationDetailQueriesTests(CatalogTestData, TestCase):
+    """The detail GET runs a fixed number of queries however much it returns."""
+    extra_count = 20
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        extra_specialists = Specialist.objects.bulk_create([
+            Specialist(title=f"Qo'shimcha mutaxassis {i}") for i in range(cls.extra_count)
+        ])
+        extra_equipment = Equipment.objects.bulk_create([
+            Equipment(name=f"Qo'shimcha uskuna {i}") for i in range(cls.extra_count)
+        ])
+        for specialty in cls.specialties:
+            SpecialistsRequired.objects.bulk_create([
+                SpecialistsRequired(specialty=specialty, required_specialists=specialist, min_count=1)
+                for specialist in extra_specialists
+            ])
+            EquipmentRequiredItem.objects.bulk_create([
+                EquipmentRequiredItem(
+                    equipment_required=specialty.equipmentrequired, equipment=equipment, min_count=1
+                )
+                for equipment in extra_equipment
+            ])
+        cls.specialists = cls.specialists + extra_specialists
+        cls.equipment = cls.equipment + extra_equipment
+
+    def setUp(self):
+        super().setUp()
+        # bulk_create signal yubormaydi: indeks yangi talablar bilan qayta qurilsin
+        clear_requirements_index()
+
+    def create_application(self, count, number, selected):
+        application = Application.objects.create(
+            user=self.user,
+            first_name="Test",
+            last_name="Test",
+            paternal_name="Test",
+            phone_number=f"+99892{number:07d}",
+            email=f"detail{number}@example.com",
+            document_type="Passport",
+            full_address="Toshkent",
+        )
+        create_application_branches(application, [
+            {
+                "branch": branch,
+                "specialties": self.specialties,
+                "selected_specialists": self.specialists[:selected],
+                "selected_equipment": self.equipment[:selected],
+            }
+            for branch in self.branches[:count]
+        ])
+        return application
+
+    def get(self, application):
+        url = reverse("applications:application-update-detail", kwargs={"pk": application.pk})
+        return self.client.get(url)
+
+    def test_detail_queries_are_fixed(self):
+        small = self.create_application(1, 1, selected=3)
+        large = self.create_application(self.branch_count, 2, selected=len(self.specialists))
+
+        # Birinchi so'rov talablar indeksini quradi
+        self.assertEqual(self.get(small).status_code, 200)
+
+        # ATOMIC_REQUESTS savepoint'i (2), ariza va 6 ta prefetch
+        with self.assertNumQueries(10):
+            response = self.get(small)
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(10):
+            response = self.get(large)
+        self.assertEqual(response.status_code, 200)
+
+        branches = response.data["branches"]
+        self.assertEqual(len(branches), self.branch_count)
+        specialists = branches[0]["selected_specialists_details"]
+        self.assertEqual(len(specialists), len(self.specialists))
+        self.assertEqual(
+            sum("requirements" in specialist for specialist in specialists),
+            self.extra_count + len(self.specialties),
+        )
+
+
+class CatalogListPagingTests(CatalogTestData, TestCase):
+    """Requirement lists keep one row order across OFFSET pages: the ordering, then id."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Bir ixtisoslikka bir nechta talab: tartib kaliti teng qatorlar
+        for specialty in cls.specialties:
+            SpecialistsRequired.objects.bulk_create([
+                SpecialistsRequired(specialty=specialty, required_specialists=specialist)
+                for specialist in cls.specialists[3:]
+            ])
+            EquipmentRequiredItem.objects.bulk_create([
+                EquipmentRequiredItem(equipment_required=specialty.equipmentrequired, equipment=equipment)
+                for equipment in cls.equipment[3:]
+            ])
+        # Yangilangan qatorlar jadval oxiriga ko'chadi: fizik tartib id tartibidan farq qiladi
+        for model in (SpecialistsRequired, EquipmentRequiredItem):
+            ids = list(model.objects.order_by("id").values_list("id", flat=True))
+            model.objects.filter(id__in=ids[::2]).update(min_count=2)
+
+    def walk(self, url_name, **params):
+        ids = []
+        page = 1
+        while True:
+            response = self.client.get(reverse(url_name), {**params, "page": page, "page_size": 2})
+            self.assertEqual(response.status_code, 200)
+            ids += [row["id"] for row in response.data["results"]]
+            if not response.data["next"]:
+                return ids
+            page += 1
+
+    def test_pages_follow_ordering_then_id(self):
+        lists = [
+            ("applications:specialist-required-list", SpecialistsRequired, [
+                (None, ["specialty__name", "required_specialists__title", "id"]),
+                ("specialty", ["specialty", "id"]),
+                ("-specialty", ["-specialty", "id"]),
+            ]),
+            ("applications:equipment-required-list", EquipmentRequiredItem, [
+                (None, ["equipment_required__specialty__name", "equipment__name", "id"]),
+                ("equipment_required__specialty__name", ["equipment_required__specialty__name", "id"]),
+            ]),
+        ]
+        for url_name, model, orderings in lists:
+            for ordering, expected_order in orderings:
+                with self.subTest(url_name=url_name, ordering=ordering):
+                    params = {"ordering": ordering} if ordering else {}
+                    expected = list(model.objects.order_by(*expected_order).values_list("id", flat=True))
+                    self.assertEqual(self.walk(url_name, **params), expected)
+
+
+class CatalogBulkUpsertTests(TestCase):
+    """Catalog natural keys are matched case-insensitively, like CatalogResolver."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(CustomUser.objects.create(phone_number="+998900001002", is_staff=True))
+
+    def test_key_differing_in_case_updates_saved_row(self):
+        specialist = Specialist.objects.create(title="Kardiolog")
+
+        response = self.client.post(
+            reverse("applications:specialist-bulk-upsert"),
+            [{"title": "kardiolog"}, {"title": "KARDIOLOG"}, {"title": "Nevrolog"}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(result["status"], result["id"]) for result in response.data["results"][:2]],
+            [("duplicate", specialist.pk), ("updated", specialist.pk)],
+        )
+        self.assertEqual(response.data["results"][2]["status"], "created")
+        self.assertEqual(
+            sorted(Specialist.objects.values_list("title", flat=True)),
+            ["Kardiolog", "Nevrolog"],
+        )
+
+    def test_branch_key_matches_name_case_insensitively(self):
+        district = District.objects.create(
+            region=Region.objects.create(region_name="Test viloyat"), district_name="Olmazor"
+        )
+        branch = Branch.objects.create(district=district, branch_name="Olmazor 1-filial")
+
+        response = self.client.post(
+            reverse("applications:branch-bulk-upsert"),
+            [{"district_name_input": "Olmazor", "branch_name": "OLMAZOR 1-FILIAL"}],
+            format="json",
+        )
+
+        self.assertEqual(response.data["results"], [{"index": 0, "status": "updated", "id": branch.pk}])
+        self.assertEqual(Branch.objects.get().branch_name, "Olmazor 1-filial")
+
+    def test_single_record_create_rejects_key_differing_in_case(self):
+        Specialty.objects.create(name="Kardiologiya")
+        district = District.objects.create(
+            region=Region.objects.create(region_name="Test viloyat"), district_name="Olmazor"
+        )
+        Branch.objects.create(district=district, branch_name="Olmazor 1-filial")
+
+        response = self.client.post(reverse("applications:specialty-create"), {"name": "KARDIOLOGIYA"}, format="json")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            reverse("applications:branch-create"),
+            {"district_name_input": "Olmazor", "branch_name": "olmazor 1-filial"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Specialty.objects.create(name="kardiologiya")
+
+
+class AdminQueryBudgetTests(TestCase):
+    """Catalog admin changelists and autocompletes run the same number of queries as rows grow."""
+    changelists = [
+        "region", "district", "branch", "specialty", "specialist",
+        "specialistsrequired", "equipment", "equipmentrequired", "applicationbranch",
+    ]
+    # (manba modeli, maydon): admin autocomplete so'rovlari
+    autocompletes = [
+        ("district", "region"),
+        ("branch", "district"),
+        ("applicationbranch", "branch"),
+        ("specialistsrequired", "specialty"),
+        ("specialistsrequired", "required_specialists"),
+    ]
+    catalog_autocompletes = ["branch", "specialties", "selected_specialists", "selected_equipment"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create(
+            phone_number="+998900001003", is_staff=True, is_superuser=True
+        )
+        cls.add_rows(0, 3)
+
+    @classmethod
+    def add_rows(cls, start, count):
+        for i in range(start, start + count):
+            region = Region.objects.create(region_name=f"Viloyat {i}")
+            district = District.objects.create(region=region, district_name=f"Tuman {i}")
+            branch = Branch.objects.create(district=district, branch_name=f"Filial {i}")
+            specialty = Specialty.objects.create(name=f"Ixtisoslik {i}")
+            specialist = Specialist.objects.create(title=f"Mutaxassis {i}")
+            equipment = Equipment.objects.create(name=f"Uskuna {i}", description="Tavsif " * 20)
+            SpecialistsRequired.objects.create(specialty=specialty, required_specialists=specialist)
+            equipment_required = EquipmentRequired.objects.create(specialty=specialty)
+            EquipmentRequiredItem.objects.create(equipment_required=equipment_required, equipment=equipment)
+            application = Application.objects.create(
+                user=cls.admin,
+                first_name="Test",
+                last_name="Test",
+                paternal_name="Test",
+                phone_number=f"+99893{i:07d}",
+                email=f"admin{i}@example.com",
+                document_type="Passport",
+                full_address="Toshkent",
+            )
+            create_application_branches(application, [{
+                "branch": branch,
+                "specialties": [specialty],
+                "selected_specialists": [specialist],
+                "selected_equipment": [equipment],
+            }])
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        cache.clear()
+
+    def requests(self):
+        for model_name in self.changelists:
+            yield reverse(f"admin:applications_{model_name}_changelist"), {}
+            yield reverse(f"admin:applications_{model_name}_changelist"), {"q": "1"}
+        for model_name, field_name in self.autocompletes:
+            params = {"app_label": "applications", "model_name": model_name, "field_name": field_name}
+            yield reverse("admin:autocomplete"), params
+            yield reverse("admin:autocomplete"), {**params, "term": "1"}
+        for field_name in self.catalog_autocompletes:
+            params = {"app_label": "applications", "model_name": "applicationbranch", "field_name": field_name}
+            yield reverse("admin:applications_catalog_autocomplete"), params
+
+    def count_queries(self):
+        counts = {}
+        for url, params in self.requests():
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200, url)
+            counts[url, tuple(sorted(params.items()))] = len(queries)
+        return counts
+
+    def test_query_counts_do_not_grow_with_rows(self):
+        self.count_queries()
+        small = self.count_queries()
+
+        self.add_rows(3, 40)
+        for (url, params), expected in small.items():
+            cache.clear()
+            with self.subTest(url=url, params=params), self.assertNumQueries(expected):
+                response = self.client.get(url, dict(params))
+            self.assertEqual(response.status_code, 200, url)
+
+
+class CatalogAutocompleteCacheTests(TestCase):
+    """Cached branch autocomplete labels follow renamed districts and regions."""
+
+    def setUp(self):
+        admin = CustomUser.objects.create(phone_number="+998900001004", is_staff=True, is_superuser=True)
+        self.client.force_login(admin)
+        cache.clear()
+        region = Region.objects.create(region_name="Toshkent")
+        self.district = District.objects.create(region=region, district_name="Olmazor")
+        Branch.objects.create(district=self.district, branch_name="Olmazor 1-filial")
+
+    def labels(self):
+        response = self.client.get(reverse("admin:applications_catalog_autocomplete"), {
+            "app_label": "applications", "model_name": "applicationbranch", "field_name": "branch",
+        })
+        self.assertEqual(response.status_code, 200)
+        return [result["text"] for result in response.json()["results"]]
+
+    def test_renamed_district_is_not_served_from_cache(self):
+        self.assertEqual(self.labels(), ["Olmazor | Toshkent"])
+
+        # Keshdan: faqat savepoint, sessiya va foydalanuvchi so'rovlari
+        with self.assertNumQueries(4):
+            self.assertEqual(self.labels(), ["Olmazor | Toshkent"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.district.district_name = "Chilonzor"
+            self.district.save()
+        self.assertEqual(self.labels(), ["Chilonzor | Toshkent"])
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+        CATALOG_CACHE_LOCAL_MAX_AGE=0,
+    )
+    def test_per_process_cache_is_bounded_by_local_max_age(self):
+        self.assertEqual(self.labels(), ["Olmazor | Toshkent"])
+
+        # Boshqa jarayondagi tahrir: bu jarayonning hisoblagichi o'zgarmaydi
+        District.objects.filter(pk=self.district.pk).update(district_name="Chilonzor")
+        self.assertEqual(self.labels(), ["Chilonzor | Toshkent"])
+
+
+class ApplicationExportTests(TestCase):
+    """CSV cells that a spreadsheet would run as formulas are neutralized; NDJSON is left as entered."""
+
+    def setUp(self):
+        user = CustomUser.objects.create(phone_number="+998900001005")
+        Application.objects.create(
+            user=user,
+            first_name='=HYPERLINK("http://example.com","x")',
+            last_name="@SUM(A1)",
+            paternal_name="-2+3",
+            phone_number="+998900001005",
+            email="export@example.com",
+            document_type="Passport",
+            full_address="Toshkent",
+        )
+
+    def test_csv_prefixes_formula_cells(self):
+        header, row = list(csv.reader(io.StringIO("".join(stream_applications_csv(Application.objects.all())))))
+        values = dict(zip(header, row))
+        self.assertEqual(values["first_name"], '\'=HYPERLINK("http://example.com","x")')
+        self.assertEqual(values["last_name"], "'@SUM(A1)")
+        self.assertEqual(values["paternal_name"], "'-2+3")
+        self.assertEqual(values["phone_number"], "'+998900001005")
+        self.assertEqual(values["full_address"], "Toshkent")
+
+    def test_ndjson_keeps_values(self):
+        record = json.loads("".join(stream_applications_ndjson(Application.objects.all())))
+        self.assertEqual(record["first_name"], '=HYPERLINK("http://example.com","x")')
+        self.assertEqual(record["phone_number"], "+998900001005")
@@ -0,0 +1,145 @@
+import os
+import hashlib
+
+from django.conf import settings
+from django.utils.translation import gettext as _
+from django.core.files.uploadhandler import StopUpload, TemporaryFileUploadHandler
+
+from rest_framework import serializers
+
+
+# Fayl turi -> (boshlang'ich baytlar, MIME turi, mos kengaytmalar)
+DOCUMENT_SIGNATURES = {
+    'pdf': (b'%PDF-', 'application/pdf', ('pdf',)),
+    'jpg': (b'\xff\xd8\xff', 'image/jpeg', ('jpg', 'jpeg')),
+    'png': (b'\x89PNG\r\n\x1a\n', 'image/png', ('png',)),
+}
+DOCUMENT_HEAD_SIZE = max(len(signature) for signature, _mime, _extensions in DOCUMENT_SIGNATURES.values())
+
+
+def get_document_max_size():
+    return getattr(settings, "APPLICATION_DOCUMENT_MAX_SIZE", 10 * 1024 * 1024)
+
+
+def document_size_error():
+    return _("Fayl hajmi %(size)s MB dan oshmasligi kerak.") % {"size": get_document_max_size() // (1024 * 1024)}
+
+
+def document_type_error():
+    return _("Faqat PDF, JPG va PNG formatlari ruxsat etiladi.")
+
+
+def sniff_document_type(head):
+    """Return ``"pdf"``, ``"jpg"`` or ``"png"`` from the first bytes of a file, or None."""
+    for document_type, (signature, _mime, _extensions) in DOCUMENT_SIGNATURES.items():
+        if head.startswith(signature):
+            return document_type
+    return None
+
+
+def _with_extension(file_name, document_type):
+    root, extension = os.path.splitext(file_name)
+    extensions = DOCUMENT_SIGNATURES[document_type][2]
+    if extension.lower().lstrip('.') in extensions:
+        return file_name
+    return f"{root}.{extensions[0]}"
+
+
+class DocumentUploadHandler(TemporaryFileUploadHandler):
+    """
+    Upload handler for application documents.
+
+    Checks every file while it streams to disk:
+    - a body whose Content-Length cannot fit a document plus the form fields
+      is refused before anything is read;
+    - the upload stops as soon as a file passes the size limit;
+    - the first bytes must be a PDF, JPEG or PNG signature, whatever the file
+      name says.
+    A rejected upload stops reading the body (``StopUpload(connection_reset=True)``)
+    and the request fails with a 400 for the file field.
+
+    Accepted files get ``sha256`` (hex digest of the content) and
+    ``document_type`` attributes, a matching ``content_type`` and a name with
+    the matching extension.
+    """
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # Fayldan tashqari maydonlar DATA_UPLOAD_MAX_MEMORY_SIZE bilan cheklangan
+        allowed = get_document_max_size() + (settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 0)
+        if content_length and content_length > allowed:
+            raise serializers.ValidationError({"document_file": [document_size_error()]})
+        return super().handle_raw_input(input_data, META, content_length, boundary, encoding)
+
+    def new_file(self, field_name, file_name, content_type, content_length, *args, **kwargs):
+        self.error = None
+        self.head = b''
+        self.sha256 = hashlib.sha256()
+        self.document_type = None
+        self.current_field_name = field_name
+        if content_length and content_length > get_document_max_size():
+            self._reject(document_size_error())
+        super().new_file(field_name, file_name, content_type, content_length, *args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > get_document_max_size():
+            self._reject(document_size_error())
+
+        if self.document_type is None and len(self.head) < DOCUMENT_HEAD_SIZE:
+            self.head += raw_data[:DOCUMENT_HEAD_SIZE - len(self.head)]
+            self.document_type = sniff_document_type(self.head)
+            if self.document_type is None and len(self.head) >= DOCUMENT_HEAD_SIZE:
+                self._reject(document_type_error())
+
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        if self.document_type is None:
+            self._reject(document_type_error())
+
+        file = super().file_complete(file_size)
+        file.sha256 = self.sha256.hexdigest()
+        file.document_type = self.document_type
+        file.content_type = DOCUMENT_SIGNATURES[self.document_type][1]
+        file.name = _with_extension(file.name, self.document_type)
+        return file
+
+    def upload_complete(self):
+        if getattr(self, 'error', None):
+            raise serializers.ValidationError({self.current_field_name: [self.error]})
+        return super().upload_complete()
+
+    def _reject(self, message):
+        # Qolgan baytlar o'qilmaydi; xato upload_complete'da qaytariladi
+        self.error = message
+        raise StopUpload(connection_reset=True)
+
+
+class DocumentUploadMixin:
+    """Parse multipart bodies of the view with DocumentUploadHandler only."""
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [DocumentUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+
+def validate_document_file(document_file):
+    """
+    Size and content-type rules for application documents, shared by the
+    create and update serializers. Files that came through
+    DocumentUploadHandler were already checked while streaming; other files
+    are checked here by size and by their first bytes.
+    """
+    if getattr(document_file, 'sha256', None):
+        return document_file
+
+    if document_file.size > get_document_max_size():
+        raise serializers.ValidationError(document_size_error())
+
+    position = document_file.tell()
+    document_file.seek(0)
+    head = document_file.read(DOCUMENT_HEAD_SIZE)
+    document_file.seek(position)
+    if sniff_document_type(head) is None:
+        raise serializers.ValidationError(document_type_error())
+    return document_file
@@ -11,6 +11,8 @@ from apps.applications.api_endpoints import (
     ApplicationCreateAPIView,
     ApplicationListAPIView,
     ApplicationDetailUpdateAPIView,
+    ApplicationExportAPIView,
+    ApplicationDocumentAPIView,
 
     # Specialty
     SpecialtyCreateAPIView,
@@ -41,6 +43,15 @@ from apps.applications.api_endpoints import (
     EquipmentRequiredItemListAPIView,
     EquipmentRequiredItemRetrieveUpdateAPIView,
     EquipmentRequiredItemDestroyAPIView,
+
+    # ReferenceData
+    ReferenceDataAPIView,
+
+    # CatalogBulkUpsert
+    SpecialtyBulkUpsertAPIView,
+    SpecialistBulkUpsertAPIView,
+    EquipmentBulkUpsertAPIView,
+    BranchBulkUpsertAPIView,
 )
 
 app_name = "applications"
@@ -56,6 +67,8 @@ urlpatterns = [
     path("application-create/", ApplicationCreateAPIView.as_view(), name="application-create"),
     path("application-list/", ApplicationListAPIView.as_view(), name="application-list"),
     path("application/<int:pk>/update/", ApplicationDetailUpdateAPIView.as_view(), name="application-update-detail"),
+    path("application/<int:pk>/document/", ApplicationDocumentAPIView.as_view(), name="application-document"),
+    path("application-export/", ApplicationExportAPIView.as_view(), name="application-export"),
 
     # Specialty
     path("specialty-create/", SpecialtyCreateAPIView.as_view(), name="specialty-create"),
@@ -88,4 +101,13 @@ urlpatterns = [
          EquipmentRequiredItemRetrieveUpdateAPIView.as_view(), 
          name="equipment-required-update-detail"),
     path("delete/<int:pk>/equipment-required/", EquipmentRequiredItemDestroyAPIView.as_view(), name="equipment-required-delete"),
+
+    # ReferenceData
+    path("reference-data/", ReferenceDataAPIView.as_view(), name="reference-data"),
+
+    # CatalogBulkUpsert
+    path("specialty-bulk-upsert/", SpecialtyBulkUpsertAPIView.as_view(), name="specialty-bulk-upsert"),
+    path("specialist-bulk-upsert/", SpecialistBulkUpsertAPIView.as_view(), name="specialist-bulk-upsert"),
+    path("equipment-bulk-upsert/", EquipmentBulkUpsertAPIView.as_view(), name="equipment-bulk-upsert"),
+    path("branch-bulk-upsert/", BranchBulkUpsertAPIView.as_view(), name="branch-bulk-upsert"),
 ]
\ No newline at end of file
@@ -1,27 +1,73 @@
-import random
 import string
 from django.conf import settings
-from django.db import IntegrityError
-from django.core.mail import send_mail 
+from django.db import connection
 
+from apps.common.mail import queue_email
 
-def generate_registration_number(length=20):
+
+REGISTRATION_NUMBER_SEQUENCE = "applications_registration_number_seq"
+REGISTRATION_NUMBER_ALPHABET = string.digits + string.ascii_uppercase
+REGISTRATION_NUMBER_WIDTH = 11
+
+
+def registration_check_character(code):
     """
-    Kiritilgan uzunlikda (maks. 128) harflar va raqamlar aralashmasidan iborat
-    registratsiya raqamini hosil qiladi.
+    ISO 7064 MOD 37,36 bo'yicha nazorat belgisini hisoblaydi. Bitta belgidagi
+    har qanday xato va qo'shni belgilar o'rin almashishining aksariyati aniqlanadi.
     """
-    characters = string.ascii_uppercase + string.digits
-    
-    if length > 128:
-        length = 128
-        
-    reg_number = ''.join(random.choice(characters) for i in range(length))
-    return reg_number
+    modulus = len(REGISTRATION_NUMBER_ALPHABET)
+    product = modulus
+    for char in code:
+        total = (product + REGISTRATION_NUMBER_ALPHABET.index(char)) % modulus or modulus
+        product = (total * 2) % (modulus + 1)
+    return REGISTRATION_NUMBER_ALPHABET[(modulus + 1 - product) % modulus]
+
+
+def encode_registration_number(value):
+    """Sequence qiymatini nazorat belgili, belgilangan uzunlikdagi kodga aylantiradi."""
+    base = len(REGISTRATION_NUMBER_ALPHABET)
+    digits = []
+    while value:
+        value, remainder = divmod(value, base)
+        digits.append(REGISTRATION_NUMBER_ALPHABET[remainder])
+    code = ''.join(reversed(digits)).rjust(REGISTRATION_NUMBER_WIDTH, REGISTRATION_NUMBER_ALPHABET[0])
+    if len(code) > REGISTRATION_NUMBER_WIDTH:
+        raise ValueError("Registration number sequence is exhausted.")
+    return code + registration_check_character(code)
+
+
+def is_valid_registration_number(code):
+    code = code.strip().upper()
+    return (
+        len(code) == REGISTRATION_NUMBER_WIDTH + 1
+        and all(char in REGISTRATION_NUMBER_ALPHABET for char in code)
+        and registration_check_character(code[:-1]) == code[-1]
+    )
+
+
+def allocate_registration_numbers(count):
+    """
+    Postgres sequence'dan ``count`` ta registratsiya raqamini ajratadi. Sequence
+    tranzaksiyadan tashqarida ishlaydi, shuning uchun parallel so'rovlar bir-birini
+    kutmaydi va takroriy raqam hosil bo'lmaydi.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(%s) FROM generate_series(1, %s)",
+            [REGISTRATION_NUMBER_SEQUENCE, count],
+        )
+        return [encode_registration_number(value) for (value,) in cursor.fetchall()]
+
+
+def allocate_registration_number():
+    return allocate_registration_numbers(1)[0]
 
 
 def send_application_email(application_instance):
     """
-    Ariza muvaffaqiyatli yuborilganidan so'ng foydalanuvchiga elektron pochta xabarini yuboradi.
+    Ariza muvaffaqiyatli yuborilganidan so'ng foydalanuvchiga yuboriladigan xabarni
+    navbatga (outbox) yozadi. Xabar joriy tranzaksiya bilan birga saqlanadi va
+    ``send_queued_emails`` buyrug'i orqali jo'natiladi.
     """
     
     subject = f"Ariza qabul qilindi: {application_instance.registration_number}"
@@ -32,16 +78,10 @@ def send_application_email(application_instance):
         f"Ariza holatini kuzatib boring."
     )
     recipient_list = [application_instance.email]
-    print(recipient_list)
     
-    try:
-        send_mail(
-            subject=subject, 
-            message=message, 
-            from_email="zarnigor1008@gmail.com",
-            recipient_list=recipient_list,
-            fail_silently=False,
-        )
-        print(f"DEBUG: Muvaffaqiyatli e-mail {application_instance.email} manziliga jo'natildi.")
-    except Exception as e:
-        print(f"CRITICAL ERROR: E-mail yuborishda xato yuz berdi: {e}")
+    return queue_email(
+        subject=subject,
+        message=message,
+        recipient_list=recipient_list,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+    )
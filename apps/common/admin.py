@@ -1,3 +1,21 @@
 from django.contrib import admin
 
-# Register your models here.
+from apps.common.models import EmailOutbox, Blob
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('subject',)
+    readonly_fields = ('created_at', 'sent_at', 'attempts', 'last_error')
+    ordering = ('-id',)
+
+
+@admin.register(Blob)
+class BlobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'size', 'ref_count', 'updated_at')
+    list_filter = ('ref_count',)
+    search_fields = ('name',)
+    readonly_fields = ('name', 'size', 'ref_count', 'created_at', 'updated_at')
+    ordering = ('-id',)
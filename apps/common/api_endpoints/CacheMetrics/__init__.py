@@ -0,0 +1 @@
+from .views import CacheMetricsAPIView
\ No newline at end of file
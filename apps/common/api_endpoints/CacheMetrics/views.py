@@ -0,0 +1,31 @@
+from django.http import HttpResponse
+
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser
+
+from apps.common.response_cache import get_response_cache_stats
+
+
+class CacheMetricsAPIView(APIView):
+    """
+    GET /api/common/cache-metrics/
+
+    Hit/miss counters of the catalog response cache in the Prometheus text format.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        lines = [
+            "# HELP catalog_response_cache_events_total Catalog list responses by cache outcome.",
+            "# TYPE catalog_response_cache_events_total counter",
+        ]
+        for name, events in get_response_cache_stats().items():
+            for event, count in events.items():
+                lines.append(f'catalog_response_cache_events_total{{view="{name}",event="{event}"}} {count}')
+
+        return HttpResponse("\n".join(lines) + "\n", content_type="text/plain; version=0.0.4")
+
+
+__all__ = [
+    "CacheMetricsAPIView"
+]
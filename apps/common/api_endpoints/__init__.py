@@ -0,0 +1,2 @@
+# CacheMetrics
+from .CacheMetrics import * # noqa
\ No newline at end of file
@@ -0,0 +1,90 @@
+import json
+import hashlib
+
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.core.exceptions import PermissionDenied
+from django.contrib.admin.views.autocomplete import AutocompleteJsonView
+
+from apps.common.generations import get_generations
+from apps.common.response_cache import get_catalog_cache_timeout
+
+
+AUTOCOMPLETE_CACHE_KEY = "autocomplete:{digest}"
+
+
+class CachedAutocompleteJsonView(AutocompleteJsonView):
+    """
+    Admin autocomplete view that caches its JSON pages in the default cache.
+
+    Results are cached only when the target model and every model its labels
+    read are listed in ``cache_models``. The label models are the relations
+    the target's ModelAdmin ``select_related()``s (``Branch`` labels show the
+    district and region names). The generation counters of all of them
+    (``apps.common.generations``) are part of the key, so a saved or deleted
+    row, or a renamed district, is seen by the next request. Permissions are
+    checked before the cache is read. Entries live ``CATALOG_CACHE_TIMEOUT``
+    seconds, or at most ``CATALOG_CACHE_LOCAL_MAX_AGE`` without a shared cache
+    (``get_catalog_cache_timeout``).
+    """
+    cache_models = ()
+
+    def get_label_models(self, request):
+        """The target model and the related models read by its labels."""
+        models = [self.model_admin.model]
+        select_related = self.model_admin.get_queryset(request).query.select_related
+
+        def walk(model, tree):
+            for name, subtree in tree.items():
+                related_model = model._meta.get_field(name).related_model
+                models.append(related_model)
+                walk(related_model, subtree)
+
+        if isinstance(select_related, dict):
+            walk(self.model_admin.model, select_related)
+        return list(dict.fromkeys(models))
+
+    def get(self, request, *args, **kwargs):
+        self.term, self.model_admin, self.source_field, to_field_name = self.process_request(request)
+        if not self.has_perm(request):
+            raise PermissionDenied
+
+        model = self.model_admin.model
+        label_models = self.get_label_models(request)
+        if not all(label_model in self.cache_models for label_model in label_models):
+            return self.build_response(to_field_name)
+
+        raw = json.dumps([
+            model._meta.label_lower,
+            [label_model._meta.label_lower for label_model in label_models],
+            get_generations(label_models),
+            self.source_field.model._meta.label_lower,
+            self.source_field.name,
+            to_field_name,
+            self.term.strip().lower(),
+            request.GET.get(self.page_kwarg, "1"),
+        ])
+        key = AUTOCOMPLETE_CACHE_KEY.format(digest=hashlib.md5(raw.encode()).hexdigest())
+        content = cache.get(key)
+        if content is not None:
+            return HttpResponse(content, content_type="application/json")
+
+        response = self.build_response(to_field_name)
+        cache.set(key, response.content, timeout=get_catalog_cache_timeout())
+        return response
+
+    def build_response(self, to_field_name):
+        self.object_list = self.get_queryset()
+        context = self.get_context_data()
+        return JsonResponse({
+            "results": [
+                self.serialize_result(obj, to_field_name)
+                for obj in context["object_list"]
+            ],
+            "pagination": {"more": context["page_obj"].has_next()},
+        })
+
+
+__all__ = [
+    'CachedAutocompleteJsonView',
+]
@@ -0,0 +1,177 @@
+import json
+import datetime
+
+from django.conf import settings
+from django.contrib import admin
+from django.db import connections
+from django.utils import timezone
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+
+def get_exact_count_limit():
+    return getattr(settings, "ADMIN_EXACT_COUNT_LIMIT", 10000)
+
+
+def estimate_count(queryset):
+    """
+    Row count of ``queryset`` from the PostgreSQL planner, without reading
+    the rows: ``pg_class.reltuples`` for an unfiltered table, the top plan
+    node's row estimate for a filtered one. Returns None when there is no
+    estimate (other databases, a table that was never analyzed).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    if not queryset.query.where and not queryset.query.distinct:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples = -1: jadval hali ANALYZE qilinmagan
+        return int(row[0]) if row and row[0] >= 0 else None
+
+    plan = json.loads(queryset.order_by().values("pk").explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for very large admin changelists.
+
+    Rows are counted only up to ``ADMIN_EXACT_COUNT_LIMIT`` (a ``COUNT(*)``
+    over a ``LIMIT`` subquery), so small results get exact page numbers.
+    Past the limit the planner's estimate (``estimate_count``) is used
+    instead of counting the whole result.
+    """
+
+    @cached_property
+    def count(self):
+        limit = get_exact_count_limit()
+        counted = self.object_list.order_by()[:limit + 1].count()
+        if counted <= limit:
+            return counted
+        # Baho eskirgan bo'lsa ham sahifalar soni kamida limit+1 qatordan hisoblanadi
+        return max(estimate_count(self.object_list) or 0, counted)
+
+
+def _truncate(value, kind):
+    value = value.replace(day=1) if kind in ("year", "month") else value
+    value = value.replace(month=1) if kind == "year" else value
+    if isinstance(value, datetime.datetime):
+        value = value.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    return value
+
+
+def _next_bucket(start, kind):
+    if kind == "year":
+        return start.replace(year=start.year + 1)
+    if kind == "month":
+        return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+    return start + datetime.timedelta(days=1)
+
+
+def iter_date_buckets(queryset, field_name, kind):
+    """
+    Yield the years, months or days (``kind``) that have rows in
+    ``queryset``, like ``QuerySet.dates()``/``datetimes()``.
+
+    Instead of truncating and sorting every row, each bucket is found with a
+    ``field >= bucket start ORDER BY field LIMIT 1`` lookup, so an index on
+    the field is read once per bucket that has rows. Datetimes are bucketed
+    in the current time zone.
+    """
+    values = queryset.order_by(field_name).values_list(field_name, flat=True)
+    value = values.first()
+    while value is not None:
+        aware = isinstance(value, datetime.datetime) and timezone.is_aware(value)
+        if aware:
+            value = timezone.localtime(value)
+        start = _truncate(value, kind)
+        end = _next_bucket(start, kind)
+        if aware:
+            start, end = timezone.make_aware(start), timezone.make_aware(end)
+        yield start
+        value = values.filter(**{f"{field_name}__gte": end}).first()
+
+
+class IndexedDateHierarchyQuerySet:
+    """
+    Stand-in for ``cl.queryset`` in the admin ``date_hierarchy`` tag.
+
+    The tag asks for ``Min``/``Max`` of the field and for ``dates()`` or
+    ``datetimes()``; both are answered with ordered ``LIMIT 1`` lookups
+    (``iter_date_buckets``) instead of aggregates over every row.
+    """
+
+    def __init__(self, queryset, field_name):
+        self.queryset = queryset
+        self.field_name = field_name
+
+    def aggregate(self, **kwargs):
+        values = self.queryset.values_list(self.field_name, flat=True)
+        return {
+            "first": values.order_by(self.field_name).first(),
+            "last": values.order_by(f"-{self.field_name}").first(),
+        }
+
+    def dates(self, field_name, kind, order="ASC"):
+        return list(iter_date_buckets(self.queryset, field_name, kind))
+
+    datetimes = dates
+
+
+class IndexedChangeList:
+    """ChangeList wrapper that only replaces ``queryset`` for the date hierarchy."""
+
+    def __init__(self, changelist):
+        self.changelist = changelist
+        self.queryset = IndexedDateHierarchyQuerySet(changelist.queryset, changelist.date_hierarchy)
+
+    def __getattr__(self, name):
+        return getattr(self.changelist, name)
+
+
+class RelatedAdminFieldListFilter(admin.RelatedFieldListFilter):
+    """
+    RelatedFieldListFilter that reads its choices through the related model's
+    ModelAdmin ``get_queryset()``, so labels whose ``__str__`` walks a relation
+    use the ``select_related`` of that admin instead of one query per choice.
+    """
+
+    def field_choices(self, field, request, model_admin):
+        related_model = field.remote_field.model
+        if not model_admin.admin_site.is_registered(related_model):
+            return super().field_choices(field, request, model_admin)
+
+        related_admin = model_admin.admin_site.get_model_admin(related_model)
+        queryset = related_admin.get_queryset(request).complex_filter(field.get_limit_choices_to())
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return [(obj.pk, str(obj)) for obj in queryset]
+
+
+class LargeTableAdminMixin:
+    """
+    ModelAdmin options for tables with millions of rows: estimated counts,
+    no "N total" count query and an index-driven date hierarchy. The
+    ``date_hierarchy`` field and the changelist ``ordering`` should be indexed.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    change_list_template = "admin/large_table_change_list.html"
+
+
+__all__ = [
+    'estimate_count',
+    'EstimatedCountPaginator',
+    'iter_date_buckets',
+    'IndexedDateHierarchyQuerySet',
+    'IndexedChangeList',
+    'RelatedAdminFieldListFilter',
+    'LargeTableAdminMixin',
+]
@@ -0,0 +1,9 @@
+from django.db.models import TextChoices
+from django.utils.translation import gettext_lazy as _
+
+
+class EmailStatus(TextChoices):
+    PENDING = ("pending", _("Pending"))
+    SENDING = ("sending", _("Sending"))
+    SENT = ("sent", _("Sent"))
+    FAILED = ("failed", _("Failed"))
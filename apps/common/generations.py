@@ -0,0 +1,64 @@
+import random
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+GENERATION_KEY = "generation:{label}"
+
+
+def _generation_key(model):
+    return GENERATION_KEY.format(label=model._meta.label_lower)
+
+
+def _seed_generation(key, timeout=None):
+    # Kalit keshdan o'chib ketsa (restart, eviction) hisoblagich tasodifiy qiymatdan
+    # boshlanadi, shunda eski versiya bilan tasodifan mos kelib qolmaydi.
+    cache.add(key, random.getrandbits(31), timeout=timeout)
+    return cache.get(key)
+
+
+def get_counters(keys, timeout=None):
+    """
+    Return the generation counters stored under ``keys``, read with one
+    ``get_many``; a missing counter is seeded with a random value.
+    """
+    found = cache.get_many(keys)
+    return tuple(
+        found[key] if key in found else _seed_generation(key, timeout)
+        for key in keys
+    )
+
+
+def bump_counter(key, timeout=None):
+    try:
+        cache.incr(key)
+    except ValueError:
+        _seed_generation(key, timeout)
+
+
+def generations_are_shared():
+    """
+    True when the default cache is shared by every process. With LocMemCache a
+    counter bumped in one process is not seen by the others, and DummyCache
+    keeps no counter at all; versions built from the counters then say nothing
+    about changes made elsewhere.
+    """
+    return not isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+def get_generations(models):
+    """
+    Return the current generation counter of every model in ``models``,
+    read from the shared cache with a single ``get_many`` call.
+    """
+    return get_counters([_generation_key(model) for model in models])
+
+
+def get_generation(model):
+    return get_generations([model])[0]
+
+
+def bump_generation(model):
+    bump_counter(_generation_key(model))
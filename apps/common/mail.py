@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.core.mail import EmailMessage, get_connection
+
+from apps.common.choices import EmailStatus
+from apps.common.models import EmailOutbox
+
+
+def queue_email(subject, message, recipient_list, from_email=None):
+    """
+    Write an email to the outbox. Runs inside the caller's transaction and does
+    no network I/O; delivery is done by the ``send_queued_emails`` command.
+    """
+    return EmailOutbox.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or "",
+        recipients=list(recipient_list),
+    )
+
+
+def _retry_delay(attempts):
+    base = getattr(settings, "EMAIL_OUTBOX_RETRY_DELAY", 30)
+    max_delay = getattr(settings, "EMAIL_OUTBOX_MAX_RETRY_DELAY", 3600)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), max_delay))
+
+
+def _claim_batch(batch_size, max_attempts):
+    """
+    Lease up to ``batch_size`` due emails to this worker in one short
+    transaction. A leased row is SENDING and its ``next_attempt_at`` is the
+    lease expiry; a row whose lease ran out is due again. Each claim counts
+    as an attempt, so a message that kills its worker is not retried forever.
+    """
+    lease = timedelta(seconds=getattr(settings, "EMAIL_OUTBOX_LEASE", 300))
+    with transaction.atomic():
+        now = timezone.now()
+        EmailOutbox.objects.filter(
+            status=EmailStatus.SENDING,
+            next_attempt_at__lte=now,
+            attempts__gte=max_attempts,
+        ).update(status=EmailStatus.FAILED, last_error="Lease expired")
+
+        batch = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True).filter(
+                status__in=[EmailStatus.PENDING, EmailStatus.SENDING],
+                next_attempt_at__lte=now,
+            ).order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if not batch:
+            return []
+
+        leased_until = now + lease
+        EmailOutbox.objects.filter(id__in=[email.id for email in batch]).update(
+            status=EmailStatus.SENDING,
+            next_attempt_at=leased_until,
+            attempts=F("attempts") + 1,
+        )
+        for email in batch:
+            email.status = EmailStatus.SENDING
+            email.next_attempt_at = leased_until
+            email.attempts += 1
+        return batch
+
+
+def _record_result(email, max_attempts, error=None):
+    # Ijara muddati o'tib, xat boshqa ishchiga berilgan bo'lsa, natija yozilmaydi
+    fields = {"last_error": ""}
+    if error is None:
+        fields.update(status=EmailStatus.SENT, sent_at=timezone.now())
+    elif email.attempts >= max_attempts:
+        fields.update(status=EmailStatus.FAILED, last_error=str(error))
+    else:
+        fields.update(
+            status=EmailStatus.PENDING,
+            next_attempt_at=timezone.now() + _retry_delay(email.attempts),
+            last_error=str(error),
+        )
+    EmailOutbox.objects.filter(
+        id=email.id,
+        status=EmailStatus.SENDING,
+        next_attempt_at=email.next_attempt_at,
+    ).update(**fields)
+
+
+def deliver_queued_emails(batch_size=100, max_attempts=None):
+    """
+    Send one batch of due emails over a single backend connection and record
+    the result of each. Returns the number of emails processed.
+
+    The batch is leased in a short transaction (``_claim_batch``); the
+    messages are sent outside any transaction and each result is written by
+    its own UPDATE, so a message already delivered stays SENT if the worker
+    dies later in the batch. Several workers can drain the outbox at the same
+    time; rows left SENDING by a dead worker are picked up once
+    ``EMAIL_OUTBOX_LEASE`` seconds have passed.
+    """
+    if max_attempts is None:
+        max_attempts = getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 5)
+
+    batch = _claim_batch(batch_size, max_attempts)
+    if not batch:
+        return 0
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        for email in batch:
+            _record_result(email, max_attempts, e)
+        return len(batch)
+
+    try:
+        for email in batch:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email or None,
+                to=email.recipients,
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as e:
+                _record_result(email, max_attempts, e)
+            else:
+                _record_result(email, max_attempts)
+    finally:
+        connection.close()
+    return len(batch)
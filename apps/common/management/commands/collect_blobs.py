@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from apps.common.signals import get_blob_fields
+from apps.common.storage import (
+    content_storage,
+    iter_orphan_files,
+    count_unreferenced_blobs,
+    collect_unreferenced_blobs,
+)
+
+
+class Command(BaseCommand):
+    help = "Delete content-addressed blobs that are no longer referenced, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=24,
+            help="Only collect blobs unreferenced (or files written) longer ago than this.",
+        )
+        parser.add_argument(
+            "--scan",
+            action="store_true",
+            help="Also walk the shard directories for files without a Blob row.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be deleted.")
+
+    def handle(self, *args, **options):
+        grace = timedelta(hours=options["grace_hours"])
+        if options["dry_run"]:
+            total = count_unreferenced_blobs(grace=grace)
+        else:
+            total = 0
+            while True:
+                collected = collect_unreferenced_blobs(batch_size=options["batch_size"], grace=grace)
+                total += collected
+                if collected < options["batch_size"]:
+                    break
+        self.stdout.write(f"Unreferenced blobs: {total}")
+
+        if options["scan"]:
+            directories = sorted({
+                field.generate_filename(None, "x").rpartition("/")[0]
+                for model in apps.get_models()
+                for field in get_blob_fields(model)
+                if isinstance(field.upload_to, str)
+            })
+            orphans = 0
+            for name in iter_orphan_files(directories, grace=grace):
+                orphans += 1
+                if not options["dry_run"]:
+                    content_storage.delete_blob(name)
+            self.stdout.write(f"Orphan files: {orphans}")
+
+        if options["dry_run"]:
+            self.stdout.write("Dry run, nothing was deleted.")
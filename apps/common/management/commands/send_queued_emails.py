@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.common.mail import deliver_queued_emails
+
+
+class Command(BaseCommand):
+    help = "Deliver emails from the outbox in batches, reusing one backend connection per batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--max-attempts", type=int, default=None)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting once it is drained.",
+        )
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when the outbox is empty.")
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            processed = deliver_queued_emails(
+                batch_size=options["batch_size"],
+                max_attempts=options["max_attempts"],
+            )
+            total += processed
+            if processed:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(f"Processed {total} email(s).")
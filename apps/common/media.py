@@ -0,0 +1,145 @@
+import os
+import re
+import mimetypes
+import posixpath
+from urllib.parse import quote
+
+from django.conf import settings
+from django.utils.http import http_date
+from django.utils.cache import get_conditional_response
+from django.http import FileResponse, HttpResponse
+
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class FileRange:
+    """
+    Read-only view of ``length`` bytes of an open file, starting at ``start``.
+
+    ``fileno()`` is kept, so a WSGI server's ``wsgi.file_wrapper`` can still
+    send it with ``sendfile()`` (it starts at the current offset and stops at
+    Content-Length); otherwise it is read in blocks and stops at the end of
+    the range.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        self.file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def _parse_range(header, size):
+    # Faqat bitta diapazon qo'llab-quvvatlanadi; boshqalarida butun fayl yuboriladi
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        length = int(last)
+        return (max(size - length, 0), size - 1) if length and size else ()
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start > end:
+        return ()
+    return start, end
+
+
+def get_file_etag(name, stat):
+    """Strong ETag: the content hash for content-addressed names, else size and mtime."""
+    stem = posixpath.splitext(posixpath.basename(name))[0]
+    if SHA256_RE.match(stem):
+        return f'"{stem}"'
+    return f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+
+
+def serve_file(request, storage, name, filename=None):
+    """
+    Return a response that sends ``name`` from a local ``storage`` to the client.
+
+    With ``MEDIA_SENDFILE_BACKEND = "nginx"`` the transfer is handed to the
+    proxy with ``X-Accel-Redirect`` (under ``MEDIA_ACCEL_REDIRECT_PREFIX``),
+    with ``"xsendfile"`` with ``X-Sendfile``; the proxy then does ranges and
+    conditional requests itself. Without a backend a FileResponse is returned,
+    which WSGI servers send with ``sendfile()``; single byte ranges (206/416),
+    If-Range and If-None-Match/If-Modified-Since (304) are handled here.
+
+    Call it only after the permission checks.
+    """
+    content_type = mimetypes.guess_type(filename or name)[0] or "application/octet-stream"
+    disposition = f"inline; filename*=UTF-8''{quote(filename or posixpath.basename(name))}"
+    backend = getattr(settings, "MEDIA_SENDFILE_BACKEND", None)
+
+    if backend == "nginx":
+        prefix = getattr(settings, "MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = quote(posixpath.join(prefix, name))
+    elif backend == "xsendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = storage.path(name)
+    else:
+        response = _file_response(request, storage.path(name), name, content_type)
+
+    if response.status_code in (200, 206):
+        response["Content-Disposition"] = disposition
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _file_response(request, path, name, content_type):
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        return HttpResponse(status=404)
+
+    stat = os.fstat(file.fileno())
+    etag = get_file_etag(name, stat)
+    last_modified = http_date(stat.st_mtime)
+
+    # Last-Modified soniyalarda yuboriladi: kasr qismi bilan solishtirilsa 304 hech qachon qaytmaydi
+    conditional = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if conditional is not None:
+        file.close()
+        conditional["ETag"] = etag
+        conditional["Last-Modified"] = last_modified
+        return conditional
+
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    if request.method == "GET" and (not if_range or if_range in (etag, last_modified)):
+        byte_range = _parse_range(request.headers.get("Range"), stat.st_size)
+
+    if byte_range == ():
+        file.close()
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{stat.st_size}"
+        return response
+
+    if byte_range:
+        start, end = byte_range
+        response = FileResponse(FileRange(file, start, end - start + 1), status=206, content_type=content_type)
+        response["Content-Length"] = end - start + 1
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+    else:
+        response = FileResponse(file, content_type=content_type)
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = last_modified
+    return response
@@ -1,3 +1,55 @@
 from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+from apps.common.choices import EmailStatus
+
+
+class EmailOutbox(models.Model):
+    subject = models.CharField(max_length=255, verbose_name=_("Subject"))
+    body = models.TextField(verbose_name=_("Body"))
+    from_email = models.CharField(max_length=255, blank=True, verbose_name=_("From email"))
+    recipients = models.JSONField(default=list, verbose_name=_("Recipients"))
+    status = models.CharField(
+        max_length=16,
+        choices=EmailStatus.choices,
+        default=EmailStatus.PENDING,
+        verbose_name=_("Status"))
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_("Attempts"))
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name=_("Next attempt at"))
+    last_error = models.TextField(blank=True, verbose_name=_("Last error"))
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Sent at"))
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+        verbose_name = _("Email outbox")
+        verbose_name_plural = _("Email outbox")
+
+
+class Blob(models.Model):
+    name = models.CharField(max_length=255, unique=True, verbose_name=_("Name"))
+    size = models.PositiveBigIntegerField(default=0, verbose_name=_("Size"))
+    ref_count = models.PositiveIntegerField(default=0, verbose_name=_("Reference count"))
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count})"
+
+    class Meta:
+        indexes = [
+            # Faqat havolasi qolmagan bloblar GC uchun o'qiladi
+            models.Index(
+                fields=["updated_at"],
+                condition=models.Q(ref_count=0),
+                name="blob_unreferenced_idx",
+            ),
+        ]
+        verbose_name = _("Blob")
+        verbose_name_plural = _("Blobs")
@@ -0,0 +1,254 @@
+import json
+import operator
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce
+
+from rest_framework.response import Response
+from rest_framework.filters import OrderingFilter
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+
+
+class CountlessPage:
+    """Page of a count-free query, with the part of Django's Page API that DRF uses."""
+
+    def __init__(self, object_list, number, has_next):
+        self.object_list = object_list
+        self.number = number
+        self._has_next = has_next
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self.number > 1
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class CatalogPagination(PageNumberPagination):
+    """
+    Page number pagination for the catalog lists.
+
+    ``?page_size=`` is capped at ``max_page_size``. With ``?count=false`` the
+    ``COUNT(*)`` query is skipped: one extra row is read to know whether a next
+    page exists and ``count`` is returned as null.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    count_query_param = 'count'
+    count_query_description = 'Set to false to skip counting the results; "count" is then null.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.with_count = request.query_params.get(self.count_query_param, '').lower() not in ('0', 'false', 'no')
+        if self.with_count:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        try:
+            page_number = int(request.query_params.get(self.page_query_param) or 1)
+            if page_number < 1:
+                raise ValueError(page_number)
+        except ValueError:
+            raise NotFound(self.invalid_page_message)
+
+        offset = (page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and page_number != 1:
+            raise NotFound(self.invalid_page_message)
+
+        self.page = CountlessPage(rows[:page_size], page_number, len(rows) > page_size)
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count if self.with_count else None,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['required'] = ['results']
+        response_schema['properties']['count']['nullable'] = True
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.count_query_description,
+                'schema': {'type': 'boolean'},
+            },
+        ]
+
+
+class TiebreakOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that ends every ordering, the view's default and the one
+    picked with ``?ordering=``, with ``id``. Rows with equal sort keys then
+    keep one order, so OFFSET pages of CatalogPagination neither repeat nor
+    skip them.
+    """
+    tiebreaker = 'id'
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering or any(term.lstrip('-') in (self.tiebreaker, 'pk') for term in ordering):
+            return ordering
+        return [*ordering, self.tiebreaker]
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination on the view's ordering plus ``id``.
+
+    Every term of the ordering chosen by the view's OrderingFilter is part of
+    the key and ``id`` breaks ties, so a page is a single range scan:
+    ``WHERE (key..., id) > (last key..., last id) ORDER BY key..., id LIMIT n + 1``.
+    No ``COUNT(*)`` and no OFFSET are ever run. Related fields
+    (``district__district_name``) and nullable ones may be used as keys.
+    Cursors are opaque and stay valid while rows are inserted or deleted.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = '-created_at'
+    tiebreaker = 'id'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+
+        # Kalit: tartib maydonlari va oxirida id, har biri o'z yo'nalishi bilan.
+        # Oldingi sahifa teskari tartibda o'qiladi, keyin qaytadan aylantiriladi.
+        self.keys = []
+        for term in self.ordering:
+            name = term.lstrip('-')
+            if name != self.tiebreaker:
+                self.keys.append((name, term.startswith('-')))
+        self.keys.append((self.tiebreaker, self.ordering[0].startswith('-')))
+
+        self.aliases = []
+        annotations = {}
+        order_by = []
+        for position, (name, descending) in enumerate(self.keys):
+            alias = self._get_key_alias(queryset.model, name, position, annotations)
+            self.aliases.append(alias)
+            order_by.append(('-' if descending != reverse else '') + alias)
+        queryset = queryset.annotate(**annotations).order_by(*order_by)
+
+        if self.cursor is not None:
+            values = self._decode_position(queryset.model, self.cursor.position)
+            queryset = queryset.filter(*self._get_seek_conditions(values, reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        return self.page
+
+    def _get_field(self, model, name):
+        *relations, field_name = name.split('__')
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.get_field(field_name)
+
+    def _get_key_alias(self, model, name, position, annotations):
+        # Oddiy NOT NULL ustun to'g'ridan-to'g'ri ishlatiladi (indeks shu ustunda).
+        # Bog'langan yoki NULL bo'lishi mumkin bo'lgan maydon annotatsiya qilinadi.
+        field = self._get_field(model, name)
+        if '__' not in name and not field.null:
+            return name
+        alias = f'_cursor_key_{position}'
+        expression = F(name)
+        if field.null:
+            empty = '' if field.get_internal_type() in ('CharField', 'TextField') else 0
+            expression = Coalesce(expression, Value(empty))
+        annotations[alias] = expression
+        return alias
+
+    def _get_seek_conditions(self, values, reverse):
+        equal = {}
+        alternatives = []
+        for alias, (_, descending), value in zip(self.aliases, self.keys, values):
+            lookup = 'lt' if descending != reverse else 'gt'
+            alternatives.append(Q(**equal, **{f'{alias}__{lookup}': value}))
+            equal[alias] = value
+
+        # Birinchi shart indeks diapazonini chegaralaydi, ikkinchisi qolgan kalitlarni solishtiradi
+        first_lookup = 'lte' if self.keys[0][1] != reverse else 'gte'
+        return [Q(**{f'{self.aliases[0]}__{first_lookup}': values[0]}), reduce(operator.or_, alternatives)]
+
+    def get_next_link(self):
+        if not (self.has_next and self.page):
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self._encode_position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not (self.has_previous and self.page):
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self._encode_position(self.page[0])))
+
+    def _encode_position(self, instance):
+        values = []
+        for alias in self.aliases:
+            value = getattr(instance, alias)
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            values.append(value)
+        return json.dumps([list(self.ordering), values], separators=(',', ':'))
+
+    def _decode_position(self, model, position):
+        try:
+            ordering, values = json.loads(position)
+            # Kursor boshqa tartib uchun berilgan bo'lsa, uni qabul qilmaymiz
+            if tuple(ordering) != self.ordering or len(values) != len(self.keys):
+                raise ValueError(ordering)
+            return [
+                self._get_field(model, name).to_python(value)
+                for (name, _), value in zip(self.keys, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+__all__ = [
+    'CatalogPagination',
+    'TiebreakOrderingFilter',
+    'KeysetCursorPagination',
+]
@@ -0,0 +1,171 @@
+import json
+import time
+import hashlib
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from apps.common.generations import get_generations, generations_are_shared
+
+
+RESPONSE_CACHE_KEY = "response:{name}:{digest}"
+RESPONSE_CACHE_LOCK_KEY = "response-lock:{name}:{digest}"
+RESPONSE_CACHE_STATS_KEY = "response-stats:{name}:{event}"
+
+# hit - yangi yozuv; stale - eskirgan yozuv qaytarildi, boshqa so'rov yangilayapti;
+# refresh - eskirgan yozuvni shu so'rov yangiladi; miss - yozuv topilmadi.
+RESPONSE_CACHE_EVENTS = ("hit", "stale", "refresh", "miss")
+
+_cache_names = set()
+
+# Hodisalar jarayon xotirasida sanaladi va keshga vaqti-vaqti bilan bitta incr bilan qo'shiladi
+_pending_stats = Counter()
+_stats_lock = threading.Lock()
+_stats_flushed_at = 0.0
+
+
+def _record(name, event):
+    with _stats_lock:
+        _pending_stats[name, event] += 1
+        due = time.monotonic() - _stats_flushed_at >= getattr(settings, "RESPONSE_CACHE_STATS_FLUSH_INTERVAL", 10)
+    if due:
+        _flush_stats()
+
+
+def _flush_stats():
+    global _stats_flushed_at
+
+    with _stats_lock:
+        pending = dict(_pending_stats)
+        _pending_stats.clear()
+        _stats_flushed_at = time.monotonic()
+    for (name, event), count in pending.items():
+        key = RESPONSE_CACHE_STATS_KEY.format(name=name, event=event)
+        if not cache.add(key, count, timeout=None):
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                pass
+
+
+def get_response_cache_stats():
+    """Return ``{cache_name: {event: count}}`` for every cached view, read with one ``get_many``."""
+    _flush_stats()
+    keys = {
+        (name, event): RESPONSE_CACHE_STATS_KEY.format(name=name, event=event)
+        for name in sorted(_cache_names)
+        for event in RESPONSE_CACHE_EVENTS
+    }
+    found = cache.get_many(keys.values())
+    stats = {}
+    for (name, event), key in keys.items():
+        stats.setdefault(name, {})[event] = found.get(key, 0)
+    return stats
+
+
+def get_catalog_cache_timeout(timeout=None):
+    """
+    ``timeout`` (``CATALOG_CACHE_TIMEOUT`` by default), capped at
+    ``CATALOG_CACHE_LOCAL_MAX_AGE`` when ``generations_are_shared()`` is False:
+    another process's edit does not change this process's counters then, so
+    only the entry's age bounds how stale it is.
+    """
+    if timeout is None:
+        timeout = getattr(settings, "CATALOG_CACHE_TIMEOUT", 300)
+    if not generations_are_shared():
+        timeout = min(timeout, getattr(settings, "CATALOG_CACHE_LOCAL_MAX_AGE", 30))
+    return timeout
+
+
+class CachedListMixin:
+    """
+    Cache the ``list()`` response of a read-only catalog view in the default
+    Django cache.
+
+    The key is built from ``cache_query_params`` and the generation counters of
+    ``cache_models``, which the post_save/post_delete handlers bump, so a change
+    to any of those models stops the old entries from being used at once.
+    Entries are fresh for ``CATALOG_CACHE_TIMEOUT`` seconds. After that, for
+    ``CATALOG_CACHE_STALE_TIMEOUT`` more seconds, one request rebuilds the entry
+    while the others keep getting the stale copy.
+
+    Works with any backend that supports ``add``. With a per-process cache
+    (LocMemCache) entries are fresh for at most ``CATALOG_CACHE_LOCAL_MAX_AGE``
+    seconds and never served stale, since edits made by other processes do not
+    reach the counters.
+    """
+    cache_name = None
+    cache_models = ()
+    cache_query_params = ('search', 'ordering', 'page', 'page_size', 'count', 'cursor')
+    cache_timeout = None
+    cache_stale_timeout = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.cache_name:
+            _cache_names.add(cls.cache_name)
+
+    def get_cache_timeout(self):
+        return get_catalog_cache_timeout(self.cache_timeout)
+
+    def get_cache_stale_timeout(self):
+        if not generations_are_shared():
+            return 0
+        if self.cache_stale_timeout is not None:
+            return self.cache_stale_timeout
+        return getattr(settings, "CATALOG_CACHE_STALE_TIMEOUT", 60)
+
+    def get_cache_digest(self, request):
+        params = sorted(
+            (name, value)
+            for name in self.cache_query_params
+            for value in request.query_params.getlist(name)
+        )
+        raw = json.dumps([get_generations(self.cache_models), params], default=str)
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    def list(self, request, *args, **kwargs):
+        digest = self.get_cache_digest(request)
+        key = RESPONSE_CACHE_KEY.format(name=self.cache_name, digest=digest)
+
+        entry = cache.get(key)
+        if entry is not None:
+            fresh_until, data = entry
+            if time.time() < fresh_until:
+                _record(self.cache_name, "hit")
+                return Response(data)
+
+            lock_key = RESPONSE_CACHE_LOCK_KEY.format(name=self.cache_name, digest=digest)
+            if not cache.add(lock_key, 1, timeout=self.get_cache_stale_timeout()):
+                _record(self.cache_name, "stale")
+                return Response(data)
+
+            _record(self.cache_name, "refresh")
+            try:
+                return self._list_and_store(key, request, *args, **kwargs)
+            finally:
+                cache.delete(lock_key)
+
+        _record(self.cache_name, "miss")
+        return self._list_and_store(key, request, *args, **kwargs)
+
+    def _list_and_store(self, key, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            timeout = self.get_cache_timeout()
+            cache.set(
+                key,
+                (time.time() + timeout, response.data),
+                timeout=timeout + self.get_cache_stale_timeout(),
+            )
+        return response
+
+
+__all__ = [
+    'CachedListMixin',
+    'get_catalog_cache_timeout',
+    'get_response_cache_stats',
+]
@@ -0,0 +1,79 @@
+from django.apps import apps
+from django.db.models import FileField
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
+
+from apps.common.storage import ContentAddressedStorage, retain_blob, release_blob
+
+
+_DEFERRED = object()
+
+
+def get_blob_fields(model):
+    """FileFields of ``model`` stored in ContentAddressedStorage."""
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def _file_name(value):
+    return getattr(value, "name", value) or None
+
+
+def remember_blob_names(sender, instance, **kwargs):
+    # Yuklangan qiymat eslab qolinadi, saqlashda qaysi blob almashganini bilish uchun
+    instance._blob_names = {
+        field.attname: _file_name(instance.__dict__[field.attname]) if field.attname in instance.__dict__ else _DEFERRED
+        for field in sender._blob_fields
+    }
+
+
+def load_deferred_blob_names(sender, instance, **kwargs):
+    names = instance._blob_names
+    missing = [
+        field.attname for field in sender._blob_fields
+        if names[field.attname] is _DEFERRED and field.attname in instance.__dict__
+    ]
+    if missing and instance.pk is not None:
+        # Keyinga qoldirilgan maydonga yangi fayl berilgan: eski nom bazadan o'qiladi
+        row = sender._base_manager.filter(pk=instance.pk).values_list(*missing).first() or [None] * len(missing)
+        names.update({attname: value or None for attname, value in zip(missing, row)})
+
+
+def track_blob_references(sender, instance, created, update_fields=None, **kwargs):
+    names = instance._blob_names
+    for field in sender._blob_fields:
+        if update_fields is not None and field.name not in update_fields:
+            continue
+        if field.attname not in instance.__dict__:
+            continue
+
+        previous = None if created else names[field.attname]
+        current = _file_name(instance.__dict__[field.attname])
+        if previous is _DEFERRED or previous == current:
+            continue
+
+        if current:
+            retain_blob(current, field.storage.size(current))
+        if previous:
+            release_blob(previous)
+        names[field.attname] = current
+
+
+def release_blob_references(sender, instance, **kwargs):
+    for field in sender._blob_fields:
+        name = instance._blob_names.get(field.attname)
+        if name and name is not _DEFERRED:
+            release_blob(name)
+
+
+# Blob havolalari ContentAddressedStorage'dagi har bir FileField uchun yuritiladi
+for model in apps.get_models():
+    model._blob_fields = get_blob_fields(model)
+    if not model._blob_fields:
+        continue
+    label = model._meta.label_lower
+    post_init.connect(remember_blob_names, sender=model, dispatch_uid=f"blob_init_{label}")
+    pre_save.connect(load_deferred_blob_names, sender=model, dispatch_uid=f"blob_pre_save_{label}")
+    post_save.connect(track_blob_references, sender=model, dispatch_uid=f"blob_save_{label}")
+    post_delete.connect(release_blob_references, sender=model, dispatch_uid=f"blob_delete_{label}")
@@ -0,0 +1,172 @@
+import os
+import uuid
+import hashlib
+import posixpath
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.core.files.storage import FileSystemStorage
+
+from apps.common.models import Blob
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names every file after the SHA-256 of its content.
+
+    ``documents/scan.pdf`` is stored as ``documents/ab/cd/abcd…ef.pdf``: the
+    ``upload_to`` directory is kept as a namespace, two levels of shard
+    directories keep each directory small, and identical content is written
+    only once. A ``sha256`` attribute on the uploaded file (set by
+    DocumentUploadHandler) is used instead of hashing again.
+
+    Files are written under a temporary name and renamed into place, so a
+    blob is never seen half written. Every stored name has a Blob row whose
+    ``ref_count`` is kept by the model signals in ``apps.common.signals``.
+    ``delete()`` leaves the file alone, since other rows may share it;
+    ``collect_blobs`` deletes blobs nothing refers to any more.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Nom kontentdan olinadi, mavjud fayl esa aynan shu kontentning o'zi
+        return name
+
+    def get_blob_name(self, name, digest):
+        directory = posixpath.dirname(name)
+        extension = posixpath.splitext(name)[1].lower()
+        return posixpath.join(directory, digest[:2], digest[2:4], f"{digest}{extension}")
+
+    def _hash(self, content):
+        sha256 = hashlib.sha256()
+        if hasattr(content, "seek"):
+            content.seek(0)
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        if hasattr(content, "seek"):
+            content.seek(0)
+        return sha256.hexdigest()
+
+    def _save(self, name, content):
+        digest = getattr(content, "sha256", None) or self._hash(content)
+        name = self.get_blob_name(name, digest)
+
+        # Blob qatori "yangilanadi", shunda GC uni hozircha o'chirmaydi
+        if touch_blob(name) and self.exists(name):
+            return name
+
+        temporary_name = super()._save(f"{name}.{uuid.uuid4().hex}.tmp", content)
+        os.replace(self.path(temporary_name), self.path(name))
+        return name
+
+    def delete(self, name):
+        # FieldFile.delete() faqat havolani olib tashlaydi, faylni GC o'chiradi
+        pass
+
+    def delete_blob(self, name):
+        super().delete(name)
+
+
+content_storage = ContentAddressedStorage()
+
+
+def get_content_storage():
+    """Callable ``storage`` for FileFields, so migrations do not store the instance."""
+    return content_storage
+
+
+def touch_blob(name):
+    """Mark a blob as just used; returns whether it has a Blob row."""
+    return Blob.objects.filter(name=name).update(updated_at=timezone.now()) > 0
+
+
+def retain_blob(name, size=0):
+    """Add a reference to a stored blob, creating its Blob row on first use."""
+    table = Blob._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (name, size, ref_count, created_at, updated_at)
+            VALUES (%s, %s, 1, now(), now())
+            ON CONFLICT (name) DO UPDATE
+            SET ref_count = {table}.ref_count + 1, updated_at = now()
+            """,
+            [name, size],
+        )
+
+
+def release_blob(name):
+    """Drop a reference; a blob left with none is deleted by ``collect_blobs``."""
+    Blob.objects.filter(name=name, ref_count__gt=0).update(
+        ref_count=F("ref_count") - 1,
+        updated_at=timezone.now(),
+    )
+
+
+BLOB_GRACE_PERIOD = timedelta(hours=24)
+
+
+def count_unreferenced_blobs(grace=BLOB_GRACE_PERIOD):
+    cutoff = timezone.now() - grace
+    return Blob.objects.filter(ref_count=0, updated_at__lt=cutoff).count()
+
+
+def collect_unreferenced_blobs(batch_size=500, grace=BLOB_GRACE_PERIOD, storage=None):
+    """
+    Delete one batch of blobs whose ``ref_count`` has been 0 for longer than
+    ``grace`` (a timedelta) and return how many were found.
+
+    Rows are locked with ``FOR UPDATE SKIP LOCKED`` and the files are removed
+    before the rows are, inside the same transaction: an upload that touches a
+    blob being collected waits for the lock, finds no row and writes the file
+    again.
+    """
+    storage = storage or content_storage
+    cutoff = timezone.now() - grace
+    with transaction.atomic():
+        blobs = list(
+            Blob.objects.select_for_update(skip_locked=True)
+            .filter(ref_count=0, updated_at__lt=cutoff)
+            .order_by("updated_at")
+            .values_list("id", "name")[:batch_size]
+        )
+        if blobs:
+            for _id, name in blobs:
+                storage.delete_blob(name)
+            Blob.objects.filter(id__in=[blob_id for blob_id, _name in blobs]).delete()
+    return len(blobs)
+
+
+def iter_orphan_files(directories, grace=BLOB_GRACE_PERIOD, storage=None):
+    """
+    Yield stored names under the shard trees of ``directories`` that have no
+    Blob row and are older than ``grace``: leftovers of interrupted writes and
+    of uploads whose transaction was rolled back.
+    """
+    storage = storage or content_storage
+    cutoff = (timezone.now() - grace).timestamp()
+
+    def candidates():
+        for directory in directories:
+            root = storage.path(directory)
+            for path, _dirs, files in os.walk(root):
+                if os.path.relpath(path, root).count(os.sep) != 1:
+                    continue
+                for file_name in files:
+                    full_path = os.path.join(path, file_name)
+                    if os.path.getmtime(full_path) < cutoff:
+                        yield posixpath.join(directory, *os.path.relpath(full_path, root).split(os.sep))
+
+    batch = []
+    for name in candidates():
+        batch.append(name)
+        if len(batch) >= 1000:
+            yield from _without_rows(batch)
+            batch = []
+    yield from _without_rows(batch)
+
+
+def _without_rows(names):
+    known = set(Blob.objects.filter(name__in=names).values_list("name", flat=True))
+    return [name for name in names if name not in known]
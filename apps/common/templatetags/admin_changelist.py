@@ -0,0 +1,24 @@
+from django import template
+from django.contrib.admin.templatetags.base import InclusionAdminNode
+from django.contrib.admin.templatetags.admin_list import date_hierarchy
+
+from apps.common.changelist import IndexedChangeList
+
+
+register = template.Library()
+
+
+def indexed_date_hierarchy(cl):
+    return date_hierarchy(IndexedChangeList(cl))
+
+
+@register.tag(name="indexed_date_hierarchy")
+def indexed_date_hierarchy_tag(parser, token):
+    # Admin'ning date_hierarchy tegi, lekin sanalar indeks bo'yicha topiladi
+    return InclusionAdminNode(
+        parser,
+        token,
+        func=indexed_date_hierarchy,
+        template_name="date_hierarchy.html",
+        takes_context=False,
+    )
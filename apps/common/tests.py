@@ -1,3 +1,395 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import hashlib
+import tempfile
+import datetime
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from apps.common.choices import EmailStatus
+from apps.common.changelist import (
+    EstimatedCountPaginator,
+    IndexedDateHierarchyQuerySet,
+    _next_bucket,
+    iter_date_buckets,
+)
+from apps.common.mail import queue_email, deliver_queued_emails
+from apps.common.media import get_file_etag, serve_file
+from apps.common.models import EmailOutbox, Blob
+from apps.common.storage import content_storage, collect_unreferenced_blobs
+from apps.common.response_cache import _record, get_catalog_cache_timeout, get_response_cache_stats
+from apps.users.models import CustomUser
+from apps.applications.models import Application
+
+
+class OutboxDeliveryTests(TestCase):
+    def queue(self, count):
+        return [queue_email(f"Xat {i}", "Matn", [f"user{i}@example.com"]) for i in range(count)]
+
+    def test_delivers_and_marks_sent(self):
+        self.queue(3)
+        self.assertEqual(deliver_queued_emails(), 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(EmailOutbox.objects.filter(status=EmailStatus.SENT, attempts=1).count(), 3)
+
+    def test_worker_killed_mid_batch_keeps_sent_messages(self):
+        first, second, third = self.queue(3)
+        send = mail.EmailMessage.send
+        calls = []
+
+        def send_then_die(message, *args, **kwargs):
+            calls.append(message)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            return send(message, *args, **kwargs)
+
+        with mock.patch.object(mail.EmailMessage, "send", send_then_die), self.assertRaises(KeyboardInterrupt):
+            deliver_queued_emails()
+
+        first.refresh_from_db()
+        self.assertEqual(first.status, EmailStatus.SENT)
+        self.assertEqual(
+            set(EmailOutbox.objects.filter(id__in=[second.id, third.id]).values_list("status", flat=True)),
+            {EmailStatus.SENDING},
+        )
+        # Ijara muddati tugaguncha boshqa ishchi bu xatlarni olmaydi
+        self.assertEqual(deliver_queued_emails(), 0)
+
+        EmailOutbox.objects.filter(status=EmailStatus.SENDING).update(next_attempt_at=timezone.now())
+        self.assertEqual(deliver_queued_emails(), 2)
+        self.assertEqual(EmailOutbox.objects.filter(status=EmailStatus.SENT).count(), 3)
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_failed_send_is_retried_later_then_given_up(self):
+        email, = self.queue(1)
+        with mock.patch.object(mail.EmailMessage, "send", side_effect=OSError("rad etildi")):
+            self.assertEqual(deliver_queued_emails(max_attempts=2), 1)
+            email.refresh_from_db()
+            self.assertEqual(email.status, EmailStatus.PENDING)
+            self.assertGreater(email.next_attempt_at, timezone.now())
+
+            EmailOutbox.objects.filter(id=email.id).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+            self.assertEqual(deliver_queued_emails(max_attempts=2), 1)
+
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts, email.last_error), (EmailStatus.FAILED, 2, "rad etildi"))
+
+    def test_expired_lease_after_last_attempt_is_failed(self):
+        email, = self.queue(1)
+        EmailOutbox.objects.filter(id=email.id).update(
+            status=EmailStatus.SENDING, attempts=5, next_attempt_at=timezone.now() - timedelta(seconds=1),
+        )
+        self.assertEqual(deliver_queued_emails(), 0)
+        email.refresh_from_db()
+        self.assertEqual(email.status, EmailStatus.FAILED)
+        self.assertEqual(mail.outbox, [])
+
+
+class ResponseCacheTests(TestCase):
+    @override_settings(CATALOG_CACHE_TIMEOUT=300, CATALOG_CACHE_LOCAL_MAX_AGE=30)
+    def test_timeout_is_capped_without_shared_cache(self):
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}):
+            self.assertEqual(get_catalog_cache_timeout(), 30)
+        with override_settings(CACHES={"default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": tempfile.mkdtemp(),
+        }}):
+            self.assertEqual(get_catalog_cache_timeout(), 300)
+
+    @override_settings(RESPONSE_CACHE_STATS_FLUSH_INTERVAL=3600)
+    def test_stats_are_counted_in_memory_and_flushed_on_read(self):
+        before = get_response_cache_stats()["specialty-list"]["hit"]
+        for _ in range(5):
+            _record("specialty-list", "hit")
+        self.assertEqual(get_response_cache_stats()["specialty-list"]["hit"], before + 5)
+
+
+class BlobTestCase(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+
+    def blob_name(self, content, directory="documents", extension=".pdf"):
+        digest = hashlib.sha256(content).hexdigest()
+        return f"{directory}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+    def ref_counts(self):
+        return dict(Blob.objects.values_list("name", "ref_count"))
+
+
+class BlobReferenceTests(BlobTestCase):
+    """The model signals keep Blob.ref_count equal to the rows that point at each file."""
+
+    def create_application(self, number, content=None):
+        user = CustomUser.objects.create(
+            phone_number=f"+99894{number:07d}", username=f"blob{number}", email=f"blob{number}@example.com"
+        )
+        return Application.objects.create(
+            user=user,
+            first_name="Test",
+            last_name="Test",
+            paternal_name="Test",
+            phone_number=f"+99894{number:07d}",
+            email=f"blob{number}@example.com",
+            document_type="Passport",
+            full_address="Toshkent",
+            document_file=ContentFile(content, name="scan.pdf") if content is not None else None,
+        )
+
+    def test_create_replace_clear_and_delete(self):
+        first, second = self.blob_name(b"birinchi"), self.blob_name(b"ikkinchi")
+        application = self.create_application(1, b"birinchi")
+        self.assertEqual(application.document_file.name, first)
+        self.assertTrue(content_storage.exists(first))
+        self.assertEqual(self.ref_counts(), {first: 1})
+
+        application.document_file = ContentFile(b"ikkinchi", name="scan.pdf")
+        application.save()
+        self.assertEqual(self.ref_counts(), {first: 0, second: 1})
+
+        application.document_file = None
+        application.save()
+        self.assertEqual(self.ref_counts(), {first: 0, second: 0})
+
+        application.document_file = ContentFile(b"ikkinchi", name="scan.pdf")
+        application.save()
+        application.delete()
+        self.assertEqual(self.ref_counts(), {first: 0, second: 0})
+        # Fayllarni faqat GC o'chiradi
+        self.assertTrue(content_storage.exists(first))
+
+    def test_identical_uploads_share_one_file(self):
+        name = self.blob_name(b"bir xil")
+        one = self.create_application(1, b"bir xil")
+        two = self.create_application(2, b"bir xil")
+        self.assertEqual(one.document_file.name, two.document_file.name)
+        self.assertEqual(self.ref_counts(), {name: 2})
+        self.assertEqual(os.listdir(os.path.dirname(content_storage.path(name))), [os.path.basename(name)])
+
+        one.delete()
+        self.assertEqual(self.ref_counts(), {name: 1})
+
+    def test_reassigning_a_deferred_field_releases_the_old_blob(self):
+        first, second = self.blob_name(b"eski"), self.blob_name(b"yangi")
+        application = self.create_application(1, b"eski")
+
+        deferred = Application.objects.only("id").get(pk=application.pk)
+        deferred.document_file = ContentFile(b"yangi", name="scan.pdf")
+        deferred.save(update_fields=["document_file"])
+        self.assertEqual(self.ref_counts(), {first: 0, second: 1})
+
+    def test_saving_other_fields_keeps_counts(self):
+        name = self.blob_name(b"hujjat")
+        application = self.create_application(1, b"hujjat")
+        application.first_name = "Boshqa"
+        application.save()
+        application.save(update_fields=["first_name"])
+        self.assertEqual(self.ref_counts(), {name: 1})
+
+
+class BlobCollectionTests(BlobTestCase):
+    """GC deletes only blobs unreferenced past the grace period, and only shard files without a row."""
+
+    def store(self, content, ref_count, age):
+        name = content_storage.save("documents/scan.pdf", ContentFile(content))
+        Blob.objects.update_or_create(name=name, defaults={"ref_count": ref_count})
+        Blob.objects.filter(name=name).update(updated_at=timezone.now() - age)
+        return name
+
+    def write_file(self, name, age):
+        path = content_storage.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(b"x")
+        mtime = (timezone.now() - age).timestamp()
+        os.utime(path, (mtime, mtime))
+
+    def test_collects_only_old_unreferenced_blobs(self):
+        old = self.store(b"eski", 0, timedelta(days=2))
+        recent = self.store(b"yangi", 0, timedelta(hours=1))
+        referenced = self.store(b"ishlatilgan", 1, timedelta(days=2))
+
+        self.assertEqual(collect_unreferenced_blobs(), 1)
+
+        self.assertFalse(content_storage.exists(old))
+        self.assertEqual(set(self.ref_counts()), {recent, referenced})
+        self.assertTrue(content_storage.exists(recent))
+        self.assertTrue(content_storage.exists(referenced))
+
+    def test_scan_deletes_only_orphan_shard_files(self):
+        orphan = self.blob_name(b"yetim")
+        recent_orphan = self.blob_name(b"yangi yetim")
+        legacy = "documents/eski_hujjat.pdf"
+        known = self.store(b"ma'lum", 1, timedelta(days=2))
+        self.write_file(orphan, timedelta(days=2))
+        self.write_file(recent_orphan, timedelta(hours=1))
+        self.write_file(legacy, timedelta(days=30))
+        os.utime(content_storage.path(known), (0, 0))
+
+        call_command("collect_blobs", "--scan", stdout=io.StringIO())
+
+        self.assertFalse(content_storage.exists(orphan))
+        self.assertTrue(content_storage.exists(recent_orphan))
+        self.assertTrue(content_storage.exists(legacy))
+        self.assertTrue(content_storage.exists(known))
+
+
+@override_settings(MEDIA_SENDFILE_BACKEND=None)
+class ServeFileTests(SimpleTestCase):
+    content = b"0123456789"
+
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        self.storage = FileSystemStorage(location=location)
+        self.storage.save("hujjat.pdf", ContentFile(self.content))
+        self.storage.save("bo'sh.pdf", ContentFile(b""))
+        self.etag = get_file_etag("hujjat.pdf", os.stat(self.storage.path("hujjat.pdf")))
+
+    def get(self, name="hujjat.pdf", **headers):
+        response = serve_file(RequestFactory().get("/", headers=headers), self.storage, name)
+        self.addCleanup(response.close)
+        return response
+
+    def body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_whole_file(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.content)
+        self.assertEqual((response["Accept-Ranges"], response["ETag"]), ("bytes", self.etag))
+
+    def test_ranges(self):
+        for header, status, body, content_range in [
+            ("bytes=2-4", 206, b"234", "bytes 2-4/10"),
+            ("bytes=7-", 206, b"789", "bytes 7-9/10"),
+            ("bytes=-3", 206, b"789", "bytes 7-9/10"),
+            ("bytes=-30", 206, self.content, "bytes 0-9/10"),
+            ("bytes=8-30", 206, b"89", "bytes 8-9/10"),
+        ]:
+            with self.subTest(header):
+                response = self.get(Range=header)
+                self.assertEqual(response.status_code, status)
+                self.assertEqual(self.body(response), body)
+                self.assertEqual(response["Content-Range"], content_range)
+                self.assertEqual(int(response["Content-Length"]), len(body))
+
+    def test_unsatisfiable_ranges(self):
+        for name, header, size in [
+            ("hujjat.pdf", "bytes=10-", 10),
+            ("hujjat.pdf", "bytes=5-2", 10),
+            ("hujjat.pdf", "bytes=-0", 10),
+            ("bo'sh.pdf", "bytes=-5", 0),
+            ("bo'sh.pdf", "bytes=0-", 0),
+        ]:
+            with self.subTest(name=name, header=header):
+                response = self.get(name, Range=header)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response["Content-Range"], f"bytes */{size}")
+
+    def test_unsupported_range_sends_whole_file(self):
+        response = self.get(Range="bytes=0-1,4-5")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.content)
+
+    def test_if_range(self):
+        response = self.get(Range="bytes=0-1", **{"If-Range": self.etag})
+        self.assertEqual((response.status_code, self.body(response)), (206, b"01"))
+
+        response = self.get(Range="bytes=0-1", **{"If-Range": '"eski"'})
+        self.assertEqual((response.status_code, self.body(response)), (200, self.content))
+
+    def test_not_modified(self):
+        response = self.get(**{"If-None-Match": self.etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], self.etag)
+
+        response = self.get(**{"If-Modified-Since": response["Last-Modified"]})
+        self.assertEqual(response.status_code, 304)
+
+        self.assertEqual(self.get(**{"If-None-Match": '"eski"'}).status_code, 200)
+
+    def test_missing_file(self):
+        self.assertEqual(self.get("yo'q.pdf").status_code, 404)
+
+
+class DateHierarchyTests(TestCase):
+    moments = [
+        datetime.datetime(2024, 3, 5, 10, 0),
+        datetime.datetime(2024, 12, 31, 23, 0),
+        datetime.datetime(2025, 1, 1, 2, 0),
+        # UTC bo'yicha 2025-12-31, Toshkent vaqti bilan 2026-01-01
+        datetime.datetime(2025, 12, 31, 20, 0, tzinfo=datetime.timezone.utc),
+    ]
+
+    def setUp(self):
+        for moment in self.moments:
+            if timezone.is_naive(moment):
+                moment = timezone.make_aware(moment)
+            EmailOutbox.objects.create(subject="Xat", body="Matn", next_attempt_at=moment)
+
+    def test_next_bucket(self):
+        self.assertEqual(_next_bucket(datetime.date(2024, 12, 1), "month"), datetime.date(2025, 1, 1))
+        self.assertEqual(_next_bucket(datetime.date(2024, 11, 1), "month"), datetime.date(2024, 12, 1))
+        self.assertEqual(_next_bucket(datetime.date(2024, 1, 1), "year"), datetime.date(2025, 1, 1))
+        self.assertEqual(_next_bucket(datetime.date(2024, 2, 29), "day"), datetime.date(2024, 3, 1))
+
+    def test_buckets_match_datetimes(self):
+        queryset = EmailOutbox.objects.all()
+        for kind in ("year", "month", "day"):
+            with self.subTest(kind):
+                self.assertEqual(
+                    list(iter_date_buckets(queryset, "next_attempt_at", kind)),
+                    list(queryset.datetimes("next_attempt_at", kind)),
+                )
+
+    def test_buckets_are_local(self):
+        years = [bucket.year for bucket in iter_date_buckets(EmailOutbox.objects.all(), "next_attempt_at", "year")]
+        self.assertEqual(years, [2024, 2025, 2026])
+
+    def test_one_query_per_bucket(self):
+        with self.assertNumQueries(4):
+            list(iter_date_buckets(EmailOutbox.objects.all(), "next_attempt_at", "year"))
+
+    def test_indexed_queryset(self):
+        queryset = IndexedDateHierarchyQuerySet(EmailOutbox.objects.filter(next_attempt_at__year=2024), "next_attempt_at")
+        self.assertEqual(
+            queryset.aggregate(),
+            {"first": timezone.make_aware(self.moments[0]), "last": timezone.make_aware(self.moments[1])},
+        )
+        self.assertEqual(
+            [bucket.month for bucket in queryset.datetimes("next_attempt_at", "month")], [3, 12]
+        )
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        for i in range(6):
+            queue_email(f"Xat {i}", "Matn", [f"user{i}@example.com"])
+        self.queryset = EmailOutbox.objects.order_by("id")
+
+    @override_settings(ADMIN_EXACT_COUNT_LIMIT=10)
+    def test_exact_count_under_limit(self):
+        paginator = EstimatedCountPaginator(self.queryset, 4)
+        with mock.patch("apps.common.changelist.estimate_count") as estimate, self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 6)
+        estimate.assert_not_called()
+        self.assertEqual(paginator.num_pages, 2)
+
+    @override_settings(ADMIN_EXACT_COUNT_LIMIT=3)
+    def test_estimate_over_limit(self):
+        with mock.patch("apps.common.changelist.estimate_count", return_value=1000):
+            self.assertEqual(EstimatedCountPaginator(self.queryset, 4).count, 1000)
+        # Eskirgan baho sanalgan qatorlardan kam bo'lmaydi
+        with mock.patch("apps.common.changelist.estimate_count", return_value=None):
+            self.assertEqual(EstimatedCountPaginator(self.queryset, 4).count, 4)
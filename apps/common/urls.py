@@ -1,5 +1,9 @@
 from django.urls import path
 
+from apps.common.api_endpoints import CacheMetricsAPIView
+
 app_name = "common"
 
-urlpatterns = []
\ No newline at end of file
+urlpatterns = [
+    path("cache-metrics/", CacheMetricsAPIView.as_view(), name="cache-metrics"),
+]
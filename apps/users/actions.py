@@ -1,26 +1,32 @@
 from django.contrib import admin, messages
-from django.db import transaction
-from django.utils import timezone
-from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils.html import format_html
+
+from apps.users.services import (
+    soft_delete_users,
+    queue_user_deactivation,
+    get_deactivation_sync_limit,
+)
 
-CustomUser = get_user_model()
 
 @admin.action(description="Delete (soft) selected users")
 def deactivate_users(modeladmin, request, queryset):
     """Custom admin action to soft delete users"""
-    deactivated_count = 0
-
-    with transaction.atomic():
-        for user in queryset:
-            if not user.is_deleted:  # Only deactivate active users
-                timestamp = int(timezone.now().timestamp())
-
-                # Update using queryset to bypass validation
-                CustomUser.objects.filter(pk=user.pk).update(
-                    phone_number=f"{user.phone_number}_deleted_{timestamp}",
-                    is_deleted=True,
-                    is_active=False,  # Also deactivate
-                )
-                deactivated_count += 1
+    # Kichik tanlov bitta UPDATE bilan, kattasi fon vazifasi sifatida bajariladi
+    if queryset.filter(is_deleted=False).count() <= get_deactivation_sync_limit():
+        deactivated_count = soft_delete_users(queryset)
+        messages.success(request, f"Successfully deactivated {deactivated_count} user(s).")
+        return
 
-    messages.success(request, f"Successfully deactivated {deactivated_count} user(s).")
\ No newline at end of file
+    job = queue_user_deactivation(queryset, created_by=request.user)
+    url = reverse("admin:users_userdeactivationjob_change", args=[job.pk])
+    messages.info(
+        request,
+        format_html(
+            'Deactivation of {} user(s) was queued as <a href="{}">job #{}</a>; '
+            "it runs in the background and its progress is shown there.",
+            job.total,
+            url,
+            job.pk,
+        ),
+    )
@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
 from apps.users.actions import deactivate_users
-from apps.users.models import CustomUser
+from apps.users.models import CustomUser, UserDeactivationJob
 
 
 @admin.register(CustomUser)
@@ -71,3 +71,32 @@ class UserAdmin(BaseUserAdmin):
         "user_permissions",
     )
 
+
+@admin.register(UserDeactivationJob)
+class UserDeactivationJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "status", "get_progress", "deactivated", "created_by", "created_at", "finished_at")
+    list_filter = ("status",)
+    list_select_related = ("created_by",)
+    readonly_fields = (
+        "status",
+        "total",
+        "processed",
+        "deactivated",
+        "last_error",
+        "created_by",
+        "created_at",
+        "updated_at",
+        "finished_at",
+    )
+    ordering = ("-id",)
+
+    def get_progress(self, obj):
+        percent = obj.processed * 100 // obj.total if obj.total else 100
+        return f"{obj.processed}/{obj.total} ({percent}%)"
+    get_progress.short_description = "Progress"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -2,10 +2,10 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from rest_framework.generics import GenericAPIView
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from django.contrib.auth import login
 
+from apps.users.tokens import FilteredRefreshToken
 from apps.users.api_endpoints.UserLogin.serializers import UserLoginSerializer, UserSerializer
 
 class UserLoginAPIView(GenericAPIView):
@@ -29,7 +29,7 @@ class UserLoginAPIView(GenericAPIView):
         user = serializer.validated_data['user']
         login(request, user)
 
-        refresh = RefreshToken.for_user(user)
+        refresh = FilteredRefreshToken.for_user(user)
 
         return Response({
             'user': UserSerializer(user).data,
@@ -1,7 +1,8 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.users.tokens import FilteredRefreshToken
 
 
 class UserLogoutAPIView(APIView):
@@ -23,7 +24,7 @@ class UserLogoutAPIView(APIView):
         if not refresh_token:
             return Response({"error": "refresh token missing"}, status=400)
         try:
-            token = RefreshToken(refresh_token)
+            token = FilteredRefreshToken(refresh_token)
             token.blacklist()
             return Response(status=204)
         except Exception:
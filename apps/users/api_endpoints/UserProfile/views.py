@@ -2,6 +2,7 @@ from rest_framework import status
 from rest_framework.generics import RetrieveUpdateAPIView
 from rest_framework.permissions import IsAuthenticated
 
+from apps.users.models import CustomUser
 from apps.users.api_endpoints.UserProfile.serializers import GetProfileSerializer
 
 
@@ -20,7 +21,8 @@ class GetProfileAPIView(RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated, ]
 
     def get_object(self):
-        return self.request.user
+        # request.user faqat autentifikatsiya maydonlari bilan keladi, profil uchun to'liq yuklanadi
+        return CustomUser.objects.get(pk=self.request.user.pk)
     
 
 
@@ -0,0 +1,163 @@
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.users.models import CustomUser
+from apps.common.generations import generations_are_shared, get_counters, bump_counter
+
+
+AUTH_USER_CACHE_KEY = "auth-user:{generation}:{version}:{user_id}"
+# Hamma yozuvlar uchun umumiy avlod (ommaviy o'chirish) va har bir foydalanuvchining versiyasi
+AUTH_USER_GENERATION_KEY = "auth-user-generation"
+AUTH_USER_VERSION_KEY = "auth-user-version:{user_id}"
+AUTH_USER_FIELDS = ("id", "is_staff", "is_active", "is_deleted")
+AUTH_USER_LOCAL_CACHE_SIZE = 10000
+
+# Jarayon ichidagi kesh: {user_id: (amal qilish muddati, yozuv)}
+_local_users = {}
+
+
+def get_auth_user_cache_timeout():
+    return getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 60)
+
+
+def get_auth_user_local_cache_timeout():
+    return getattr(settings, "AUTH_USER_LOCAL_CACHE_TIMEOUT", 5)
+
+
+def _version_key(user_id):
+    return AUTH_USER_VERSION_KEY.format(user_id=user_id)
+
+
+def _version_timeout():
+    # Versiya yozuvdan uzoqroq yashaydi; o'chib ketsa tasodifiy qiymatdan boshlanadi
+    return get_auth_user_cache_timeout() * 10
+
+
+def get_auth_user_record(user_id):
+    """
+    Return ``(id, is_staff, is_active, is_deleted)`` of a user, or None when
+    there is no such user.
+
+    Looked up in this process first, then in the shared cache, then with one
+    ``values_list`` query; what is found is kept in both caches. The shared
+    key carries the user's version and the generation of all records, read
+    before the row is, so a record read just before an invalidation is stored
+    under a key nobody reads any more. The shared cache is skipped when it is
+    not shared by all processes (LocMemCache): another process could not
+    drop its copy there when the user changes.
+    """
+    now = time.monotonic()
+    local = _local_users.get(user_id)
+    if local is not None and local[0] > now:
+        return local[1]
+
+    key = None
+    record = None
+    if generations_are_shared():
+        generation, version = get_counters(
+            [AUTH_USER_GENERATION_KEY, _version_key(user_id)], timeout=_version_timeout()
+        )
+        key = AUTH_USER_CACHE_KEY.format(generation=generation, version=version, user_id=user_id)
+        record = cache.get(key)
+    if record is None:
+        record = CustomUser.objects.filter(pk=user_id).values_list(*AUTH_USER_FIELDS).first()
+        if record is None:
+            return None
+        record = tuple(record)
+        if key is not None:
+            cache.set(key, record, timeout=get_auth_user_cache_timeout())
+
+    if len(_local_users) >= AUTH_USER_LOCAL_CACHE_SIZE:
+        _local_users.clear()
+    _local_users[user_id] = (now + get_auth_user_local_cache_timeout(), record)
+    return record
+
+
+def _invalidate_now_and_on_commit(invalidate):
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+def invalidate_auth_users(user_ids):
+    """
+    Retire the cached records of ``user_ids`` now and again once the current
+    transaction commits, by bumping their versions. Other processes keep
+    their local copy for at most ``AUTH_USER_LOCAL_CACHE_TIMEOUT``; without a
+    shared cache they only have that copy (``get_auth_user_record``).
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+
+    def invalidate():
+        for user_id in user_ids:
+            _local_users.pop(user_id, None)
+        if generations_are_shared():
+            for user_id in user_ids:
+                bump_counter(_version_key(user_id), timeout=_version_timeout())
+
+    _invalidate_now_and_on_commit(invalidate)
+
+
+def invalidate_all_auth_users():
+    """
+    Retire every cached record with one generation bump, for updates that do
+    not know which users they changed (``soft_delete_users``).
+    """
+    def invalidate():
+        _local_users.clear()
+        if generations_are_shared():
+            bump_counter(AUTH_USER_GENERATION_KEY)
+
+    _invalidate_now_and_on_commit(invalidate)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that does not read the user row on every request.
+
+    ``request.user`` is a CustomUser with only ``id``, ``is_staff``,
+    ``is_active`` and ``is_deleted`` loaded (``get_auth_user_record``); any
+    other field is loaded by Django on first access, as with ``.only()``.
+    Views that need the whole user (the profile) should load it themselves.
+    Inactive and deleted users are rejected.
+    """
+
+    def get_user(self, validated_token):
+        # Token parol xeshi bilan tekshirilsa, to'liq foydalanuvchi kerak
+        if api_settings.CHECK_REVOKE_TOKEN or api_settings.USER_ID_FIELD != "id":
+            user = super().get_user(validated_token)
+            if user.is_deleted:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            return user
+
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        except (TypeError, ValueError):
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        record = get_auth_user_record(user_id)
+        if record is None or record[3]:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not record[2]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return CustomUser.from_db(CustomUser.objects.db, AUTH_USER_FIELDS, record)
+
+
+__all__ = [
+    'CachedJWTAuthentication',
+    'get_auth_user_record',
+    'invalidate_auth_users',
+    'invalidate_all_auth_users',
+]
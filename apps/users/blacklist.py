@@ -0,0 +1,232 @@
+import math
+import time
+import hashlib
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.common.generations import get_generations, bump_generation, generations_are_shared
+
+
+# Bundan katta id oralig'i alohida kuzatilmaydi: u eskirguncha filtr hamma tokenni bazaga yuboradi.
+BLACKLIST_MAX_GAP = 1000
+
+
+class BloomFilter:
+    """
+    Set of strings that answers "certainly not in the set" or "maybe in the
+    set". Sized for ``capacity`` items at ``error_rate`` false positives;
+    the bit positions of an item come from one BLAKE2b digest.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(capacity, 1024)
+        self.size = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenBlacklistFilter:
+    """
+    Per-process Bloom filter of blacklisted refresh token ``jti`` values.
+
+    ``might_be_blacklisted()`` is False for a token that is certainly not
+    blacklisted; only a True answer needs the exact database check. The
+    filter follows the database through two generation counters in the
+    shared cache:
+
+    - BlacklistedToken is bumped after every blacklisting; the rows above the
+      highest id seen so far are then read;
+    - OutstandingToken is bumped by ``purge_expired_tokens``; the filter is
+      rebuilt without the deleted tokens.
+
+    Transactions may commit out of id order, so an id missing below the
+    highest one read is kept as pending and read again at every sync. While
+    any id is pending every token is reported as "maybe blacklisted". A
+    pending id is dropped ``TOKEN_BLACKLIST_GAP_TIMEOUT`` seconds after the
+    row above it was blacklisted (a rolled back insert or a purged row).
+    The filter also syncs every ``TOKEN_BLACKLIST_SYNC_INTERVAL`` seconds in
+    case a counter bump was lost.
+
+    The filter is rebuilt off the lock: requests go on with the old filter,
+    which still holds every token it had, and the new one is swapped in
+    when ready. Until the first build is done every token is reported as
+    "maybe blacklisted".
+
+    Without a shared cache (LocMemCache, DummyCache) other processes cannot
+    be heard from, so every token is reported as "maybe blacklisted".
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.loaded = 0
+        self.high_water = 0
+        self.pending = {}
+        self.blind_until = None
+        self.generations = None
+        self.synced_at = 0
+        self.rebuilding = False
+
+    def might_be_blacklisted(self, jti):
+        if not generations_are_shared():
+            return True
+        generations = get_generations([BlacklistedToken, OutstandingToken])
+        if None in generations:
+            return True
+
+        with self.lock:
+            rebuild = not self.rebuilding and (self.bloom is None or generations[1] != self.generations[1])
+            if rebuild:
+                self.rebuilding = True
+        if rebuild:
+            try:
+                self._rebuild(generations[1])
+            finally:
+                self.rebuilding = False
+
+        sync_interval = getattr(settings, "TOKEN_BLACKLIST_SYNC_INTERVAL", 10)
+        with self.lock:
+            if self.bloom is None:
+                return True
+            if generations[0] != self.generations[0] or time.monotonic() - self.synced_at >= sync_interval:
+                self._load()
+                if self.loaded > self.bloom.capacity:
+                    # Filtr to'lib qoldi: keyingi so'rov uni qaytadan quradi
+                    self.generations = (self.generations[0], None)
+            self.generations = (generations[0], self.generations[1])
+            if self._has_gaps():
+                return True
+            return jti in self.bloom
+
+    def add(self, jti):
+        with self.lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+
+    def _rebuild(self, generation):
+        error_rate = getattr(settings, "TOKEN_BLACKLIST_FILTER_ERROR_RATE", 0.01)
+        fresh = TokenBlacklistFilter()
+        fresh.bloom = BloomFilter(BlacklistedToken.objects.count() * 2, error_rate)
+        fresh._load()
+        with self.lock:
+            self.bloom = fresh.bloom
+            self.loaded, self.high_water = fresh.loaded, fresh.high_water
+            self.pending, self.blind_until = fresh.pending, fresh.blind_until
+            self.synced_at = fresh.synced_at
+            # Qurish paytida qo'shilgan yozuvlar darhol o'qiladi
+            self.generations = (None, generation)
+
+    def _load(self):
+        now = timezone.now()
+        gap_timeout = timedelta(seconds=getattr(settings, "TOKEN_BLACKLIST_GAP_TIMEOUT", 300))
+        rows = (
+            BlacklistedToken.objects.filter(Q(id__gt=self.high_water) | Q(id__in=list(self.pending)))
+            .order_by("id")
+            .values_list("id", "token__jti", "blacklisted_at")
+        )
+        for token_id, jti, blacklisted_at in rows.iterator(chunk_size=10000):
+            self.bloom.add(jti)
+            if token_id <= self.high_water:
+                self.pending.pop(token_id, None)
+                continue
+            if token_id > self.high_water + 1 and now - blacklisted_at < gap_timeout:
+                self._add_gap(self.high_water + 1, token_id, blacklisted_at + gap_timeout)
+            self.high_water = token_id
+            self.loaded += 1
+        self.synced_at = time.monotonic()
+
+    def _add_gap(self, start, stop, expires_at):
+        if stop - start > BLACKLIST_MAX_GAP:
+            self.blind_until = max(self.blind_until or expires_at, expires_at)
+            return
+        for token_id in range(start, stop):
+            self.pending[token_id] = expires_at
+
+    def _has_gaps(self):
+        now = timezone.now()
+        if self.blind_until is not None and self.blind_until <= now:
+            self.blind_until = None
+        if self.pending:
+            self.pending = {token_id: expires_at for token_id, expires_at in self.pending.items() if expires_at > now}
+        return bool(self.pending) or self.blind_until is not None
+
+
+blacklist_filter = TokenBlacklistFilter()
+
+
+def note_blacklisted(jti):
+    """Add a just blacklisted ``jti`` here and tell the other processes."""
+    blacklist_filter.add(jti)
+    bump_generation(BlacklistedToken)
+
+
+def note_tokens_purged():
+    """Make every process rebuild its filter without the deleted tokens."""
+    bump_generation(OutstandingToken)
+
+
+def purge_expired_tokens(batch_size=1000, pause=0, progress=None):
+    """
+    Delete expired OutstandingToken rows and their BlacklistedToken rows,
+    ``batch_size`` tokens per short transaction, sleeping ``pause`` seconds
+    between batches so the tables stay available to running requests.
+
+    Rows locked by another transaction are skipped and left for the next run.
+    Tokens still within the ``LEEWAY`` of simplejwt are kept. Returns the
+    number of tokens deleted.
+    """
+    leeway = api_settings.LEEWAY
+    if not isinstance(leeway, timedelta):
+        leeway = timedelta(seconds=leeway)
+    expired_before = timezone.now() - leeway
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            token_ids = list(
+                OutstandingToken.objects.select_for_update(skip_locked=True)
+                .filter(expires_at__lt=expired_before)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not token_ids:
+                break
+            BlacklistedToken.objects.filter(token_id__in=token_ids).delete()
+            OutstandingToken.objects.filter(id__in=token_ids).delete()
+        deleted += len(token_ids)
+        if progress:
+            progress(deleted)
+        if pause:
+            time.sleep(pause)
+
+    if deleted:
+        note_tokens_purged()
+    return deleted
+
+
+__all__ = [
+    'BloomFilter',
+    'TokenBlacklistFilter',
+    'blacklist_filter',
+    'note_blacklisted',
+    'note_tokens_purged',
+    'purge_expired_tokens',
+]
@@ -0,0 +1,9 @@
+from django.db.models import TextChoices
+from django.utils.translation import gettext_lazy as _
+
+
+class DeactivationJobStatus(TextChoices):
+    PENDING = ("pending", _("Pending"))
+    RUNNING = ("running", _("Running"))
+    DONE = ("done", _("Done"))
+    FAILED = ("failed", _("Failed"))
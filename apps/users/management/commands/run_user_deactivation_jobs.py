@@ -0,0 +1,40 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.users.services import claim_deactivation_job, run_deactivation_job
+
+
+class Command(BaseCommand):
+    help = "Run queued user deactivation jobs in chunks, saving their progress after every chunk."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--stale-minutes",
+            type=float,
+            default=10,
+            help="Take over running jobs that saved no progress for this long.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for jobs instead of exiting when there are none.",
+        )
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when there are no jobs.")
+
+    def handle(self, *args, **options):
+        stale_after = timedelta(minutes=options["stale_minutes"])
+        while True:
+            job = claim_deactivation_job(stale_after=stale_after)
+            if job is not None:
+                run_deactivation_job(job, chunk_size=options["chunk_size"], progress=self._report)
+                self.stdout.write(self.style.SUCCESS(f"Job #{job.pk}: deactivated {job.deactivated} user(s)."))
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+    def _report(self, job):
+        self.stdout.write(f"Job #{job.pk}: {job.processed}/{job.total}")
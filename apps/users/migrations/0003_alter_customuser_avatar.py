@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:49
+
+import apps.common.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_customuser_is_confirmed_alter_customuser_is_staff'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, storage=apps.common.storage.get_content_storage, upload_to='avatars', verbose_name='Avatar'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:12
+
+import pickle
+
+from django.db import migrations, models
+
+
+def convert_user_ids(apps, schema_editor):
+    # Saqlangan so'rov haqiqiy modelga tegishli bo'lishi kerak (tarixiy model pickle qilinmaydi)
+    from apps.users.models import CustomUser
+
+    UserDeactivationJob = apps.get_model("users", "UserDeactivationJob")
+    for job in UserDeactivationJob.objects.filter(status__in=["pending", "running"]):
+        user_ids = job.user_ids[job.processed:]
+        job.query = pickle.dumps(CustomUser.objects.filter(pk__in=user_ids).query)
+        job.last_id = max(user_ids, default=0)
+        job.save(update_fields=["query", "last_id"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_userdeactivationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userdeactivationjob',
+            name='query',
+            field=models.BinaryField(default=b'', editable=False, verbose_name='Selection'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='userdeactivationjob',
+            name='last_id',
+            field=models.BigIntegerField(default=0, verbose_name='Last ID'),
+        ),
+        migrations.AddField(
+            model_name='userdeactivationjob',
+            name='position',
+            field=models.BigIntegerField(default=0, verbose_name='Position'),
+        ),
+        migrations.RunPython(convert_user_ids, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='userdeactivationjob',
+            name='user_ids',
+        ),
+    ]
@@ -4,6 +4,8 @@ from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 
 from apps.users.managers import CustomUserManager
+from apps.users.choices import DeactivationJobStatus
+from apps.common.storage import get_content_storage
 
 
 class CustomUser(AbstractUser):
@@ -28,7 +30,11 @@ class CustomUser(AbstractUser):
         max_length=30, null=True, blank=True, verbose_name=_("Last name")
     )
     avatar = models.ImageField(
-        upload_to="avatars", null=True, blank=True, verbose_name=_("Avatar")
+        upload_to="avatars",
+        storage=get_content_storage,
+        null=True,
+        blank=True,
+        verbose_name=_("Avatar"),
     )
     is_confirmed = models.BooleanField(default=False, verbose_name=_("Is Confirmed"))
     is_staff = models.BooleanField(default=False, verbose_name=_("Is Staff"))
@@ -58,10 +64,42 @@ class CustomUser(AbstractUser):
 
     def delete_account(self):
         """Soft delete user account"""
-        from django.utils import timezone
+        from apps.users.services import soft_delete_users
 
-        timestamp = int(timezone.now().timestamp())
+        soft_delete_users(CustomUser.objects.filter(pk=self.pk))
+        self.refresh_from_db(fields=["phone_number", "is_deleted", "is_active"])
 
-        self.phone_number = f"{self.phone_number}_deleted_{timestamp}"
-        self.is_deleted = True
-        self.save(update_fields=["phone_number", "is_deleted"])
+
+class UserDeactivationJob(models.Model):
+    query = models.BinaryField(editable=False, verbose_name=_("Selection"))
+    last_id = models.BigIntegerField(default=0, verbose_name=_("Last ID"))
+    position = models.BigIntegerField(default=0, verbose_name=_("Position"))
+    total = models.PositiveIntegerField(default=0, verbose_name=_("Total"))
+    processed = models.PositiveIntegerField(default=0, verbose_name=_("Processed"))
+    deactivated = models.PositiveIntegerField(default=0, verbose_name=_("Deactivated"))
+    status = models.CharField(
+        max_length=16,
+        choices=DeactivationJobStatus.choices,
+        default=DeactivationJobStatus.PENDING,
+        verbose_name=_("Status"))
+    last_error = models.TextField(blank=True, verbose_name=_("Last error"))
+    created_by = models.ForeignKey(
+        CustomUser,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Created by"))
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Finished at"))
+
+    def __str__(self):
+        return f"#{self.pk}: {self.processed}/{self.total}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "updated_at"]),
+        ]
+        verbose_name = _("User deactivation job")
+        verbose_name_plural = _("User deactivation jobs")
@@ -0,0 +1,132 @@
+import pickle
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import CharField, F, Max, Q, Value
+from django.db.models.functions import Concat
+
+from apps.users.choices import DeactivationJobStatus
+from apps.users.models import CustomUser, UserDeactivationJob
+from apps.users.authentication import invalidate_all_auth_users
+
+
+def get_deactivation_sync_limit():
+    return getattr(settings, "USER_DEACTIVATION_SYNC_LIMIT", 5000)
+
+
+def soft_delete_users(queryset):
+    """
+    Soft delete the active users of ``queryset`` with a single ``UPDATE``.
+
+    The phone number gets a ``_deleted_<timestamp>`` suffix, built in SQL, so
+    the number can be registered again; ``is_deleted`` is set and
+    ``is_active`` cleared, and the cached authentication records are
+    retired (``invalidate_all_auth_users``). Returns the number of users
+    deactivated.
+    """
+    suffix = f"_deleted_{int(timezone.now().timestamp())}"
+    deactivated = CustomUser.objects.filter(
+        pk__in=queryset.values("pk"),
+        is_deleted=False,
+    ).update(
+        phone_number=Concat(F("phone_number"), Value(suffix), output_field=CharField()),
+        is_deleted=True,
+        is_active=False,
+    )
+    if deactivated:
+        # update() signal yubormaydi: autentifikatsiya keshi bitta avlod oshirish bilan eskiradi
+        invalidate_all_auth_users()
+    return deactivated
+
+
+def queue_user_deactivation(queryset, created_by=None):
+    """
+    Record a UserDeactivationJob for the active users of ``queryset``; the
+    ``run_user_deactivation_jobs`` command deactivates them in chunks.
+
+    The job keeps the query of the selection and the highest selected id,
+    not the ids themselves; users created later are left out.
+    """
+    queryset = queryset.filter(is_deleted=False)
+    return UserDeactivationJob.objects.create(
+        query=pickle.dumps(queryset.order_by().query),
+        last_id=queryset.aggregate(last_id=Max("pk"))["last_id"] or 0,
+        total=queryset.count(),
+        created_by=created_by,
+    )
+
+
+def get_job_selection(job):
+    """Return the active users selected by ``job`` that it has not reached yet."""
+    queryset = CustomUser.objects.all()
+    queryset.query = pickle.loads(job.query)
+    return queryset.filter(pk__gt=job.position, pk__lte=job.last_id, is_deleted=False).order_by("pk")
+
+
+def claim_deactivation_job(stale_after=timedelta(minutes=10)):
+    """
+    Take the oldest pending job, or a running one whose worker stopped
+    reporting progress ``stale_after`` ago, and mark it running.
+    """
+    with transaction.atomic():
+        job = UserDeactivationJob.objects.select_for_update(skip_locked=True).filter(
+            Q(status=DeactivationJobStatus.PENDING)
+            | Q(status=DeactivationJobStatus.RUNNING, updated_at__lt=timezone.now() - stale_after)
+        ).order_by("id").first()
+        if job is not None:
+            job.status = DeactivationJobStatus.RUNNING
+            job.save(update_fields=["status", "updated_at"])
+        return job
+
+
+def _save_job(job, expected_processed, **fields):
+    """
+    Save ``fields`` of ``job`` only if no other worker saved progress since
+    ``expected_processed`` was read. Returns False if one did.
+    """
+    saved = UserDeactivationJob.objects.filter(pk=job.pk, processed=expected_processed).update(
+        updated_at=timezone.now(), **fields
+    )
+    if saved:
+        for name, value in fields.items():
+            setattr(job, name, value)
+    return bool(saved)
+
+
+def run_deactivation_job(job, chunk_size=1000, progress=None):
+    """
+    Deactivate the users of ``job`` ``chunk_size`` at a time, one transaction
+    per chunk. The progress is saved with every chunk, so the admin shows it
+    and a stopped job goes on from where it was.
+
+    A chunk is committed only if ``processed`` is still the value this
+    worker read; otherwise a worker that took the job over has saved
+    progress, the chunk is rolled back and this worker stops.
+    """
+    try:
+        while True:
+            with transaction.atomic():
+                chunk = list(get_job_selection(job).values_list("pk", flat=True)[:chunk_size])
+                if not chunk:
+                    break
+                deactivated = soft_delete_users(CustomUser.objects.filter(pk__in=chunk))
+                if not _save_job(
+                    job,
+                    job.processed,
+                    position=chunk[-1],
+                    processed=job.processed + len(chunk),
+                    deactivated=job.deactivated + deactivated,
+                ):
+                    # Vazifani boshqa ishchi olgan: bu bo'lak bekor qilinadi
+                    transaction.set_rollback(True)
+                    return job
+            if progress:
+                progress(job)
+    except Exception as e:
+        _save_job(job, job.processed, status=DeactivationJobStatus.FAILED, last_error=str(e))
+        raise
+
+    _save_job(job, job.processed, status=DeactivationJobStatus.DONE, finished_at=timezone.now())
+    return job
@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from apps.users.models import CustomUser
+from apps.users.blacklist import note_blacklisted
+from apps.users.authentication import invalidate_auth_users
+
+
+def invalidate_auth_user(sender, instance, **kwargs):
+    # Keshdagi is_staff/is_active/is_deleted eskirmasligi uchun
+    invalidate_auth_users([instance.pk])
+
+
+post_save.connect(invalidate_auth_user, sender=CustomUser, dispatch_uid="auth_user_cache_save")
+post_delete.connect(invalidate_auth_user, sender=CustomUser, dispatch_uid="auth_user_cache_delete")
+
+
+def note_blacklisted_token(sender, instance, created, **kwargs):
+    # Boshqa jarayonlar filtrni yangi yozuv tasdiqlangandan keyin yangilaydi
+    if created:
+        jti = instance.token.jti
+        transaction.on_commit(lambda: note_blacklisted(jti))
+
+
+post_save.connect(note_blacklisted_token, sender=BlacklistedToken, dispatch_uid="token_blacklist_filter")
@@ -1,3 +1,191 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.urls import reverse
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.db.models.query import QuerySet
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.common.generations import bump_generation
+from apps.users.blacklist import TokenBlacklistFilter, note_tokens_purged
+from apps.users.choices import DeactivationJobStatus
+from apps.users.models import CustomUser, UserDeactivationJob
+from apps.users.services import (
+    soft_delete_users,
+    queue_user_deactivation,
+    claim_deactivation_job,
+    run_deactivation_job,
+)
+from apps.users import authentication
+from apps.users.authentication import get_auth_user_record, invalidate_auth_users
+
+
+@override_settings(CACHES={"default": {
+    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+    "LOCATION": tempfile.mkdtemp(),
+}})
+class TokenBlacklistFilterTests(TestCase):
+    def blacklist(self, token_id, jti, blacklisted_at=None):
+        token = OutstandingToken.objects.create(
+            jti=jti, token=jti, expires_at=timezone.now() + timedelta(days=1),
+        )
+        row = BlacklistedToken.objects.create(id=token_id, token=token)
+        if blacklisted_at is not None:
+            BlacklistedToken.objects.filter(id=token_id).update(blacklisted_at=blacklisted_at)
+        bump_generation(BlacklistedToken)
+        return row
+
+    def test_row_committed_out_of_id_order_is_not_missed(self):
+        blacklist_filter = TokenBlacklistFilter()
+        self.blacklist(1, "first")
+        self.assertFalse(blacklist_filter.might_be_blacklisted("unknown"))
+
+        # 3-yozuv 2-dan oldin tasdiqlandi: 2-id kelguncha filtr hamma tokenni bazaga yuboradi.
+        self.blacklist(3, "third")
+        self.assertTrue(blacklist_filter.might_be_blacklisted("unknown"))
+
+        self.blacklist(2, "late")
+        self.assertTrue(blacklist_filter.might_be_blacklisted("late"))
+        self.assertFalse(blacklist_filter.might_be_blacklisted("unknown"))
+
+    def test_old_gap_is_given_up(self):
+        blacklist_filter = TokenBlacklistFilter()
+        self.blacklist(1, "first")
+        self.assertFalse(blacklist_filter.might_be_blacklisted("unknown"))
+
+        self.blacklist(3, "third", blacklisted_at=timezone.now() - timedelta(hours=1))
+        self.assertTrue(blacklist_filter.might_be_blacklisted("third"))
+        self.assertFalse(blacklist_filter.might_be_blacklisted("unknown"))
+
+    def test_rebuild_runs_outside_the_lock(self):
+        blacklist_filter = TokenBlacklistFilter()
+        self.blacklist(1, "first")
+        self.assertFalse(blacklist_filter.might_be_blacklisted("unknown"))
+
+        rebuild = TokenBlacklistFilter._rebuild
+        answers = []
+
+        def check_then_rebuild(filter_, generation):
+            self.assertFalse(filter_.lock.locked())
+            # Qurilayotganda boshqa so'rovlar eski filtr bilan javob oladi
+            answers.append((filter_.might_be_blacklisted("first"), filter_.might_be_blacklisted("unknown")))
+            return rebuild(filter_, generation)
+
+        note_tokens_purged()
+        self.blacklist(2, "second")
+        with mock.patch.object(TokenBlacklistFilter, "_rebuild", autospec=True, side_effect=check_then_rebuild):
+            self.assertTrue(blacklist_filter.might_be_blacklisted("second"))
+        self.assertEqual(answers, [(True, False)])
+        self.assertFalse(blacklist_filter.might_be_blacklisted("unknown"))
+
+
+@override_settings(CACHES={"default": {
+    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+    "LOCATION": tempfile.mkdtemp(),
+}})
+class AuthUserCacheTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create(phone_number="+998900002001", username="auth1", email="auth1@example.com")
+        authentication._local_users.clear()
+        self.addCleanup(authentication._local_users.clear)
+
+    def reread(self):
+        # Boshqa jarayon: faqat umumiy keshdagi yozuv ko'riladi
+        authentication._local_users.clear()
+        return get_auth_user_record(self.user.pk)
+
+    def test_record_read_before_an_invalidation_is_not_served(self):
+        first = QuerySet.first
+
+        def first_then_deactivate(queryset):
+            row = first(queryset)
+            # Eski qator o'qilgandan keyin boshqa so'rov foydalanuvchini o'chiradi
+            CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+            invalidate_auth_users([self.user.pk])
+            return row
+
+        with mock.patch.object(QuerySet, "first", autospec=True, side_effect=first_then_deactivate):
+            self.assertTrue(get_auth_user_record(self.user.pk)[2])
+
+        self.assertFalse(self.reread()[2])
+
+    def test_soft_delete_retires_cached_records(self):
+        self.assertFalse(get_auth_user_record(self.user.pk)[3])
+        self.assertEqual(self.reread(), get_auth_user_record(self.user.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(soft_delete_users(CustomUser.objects.filter(pk=self.user.pk)), 1)
+        self.assertTrue(self.reread()[3])
+
+
+class UserDeactivationTests(TestCase):
+    def create_users(self, count, start=0):
+        return [
+            CustomUser.objects.create(
+                phone_number=f"+99890{number:07d}", username=f"deact{number}", email=f"deact{number}@example.com"
+            )
+            for number in range(start, start + count)
+        ]
+
+    def deactivate(self, users):
+        admin = CustomUser.objects.create_superuser(
+            phone_number="+998901111111", username="admin", email="admin@example.com", password="x"
+        )
+        self.client.force_login(admin)
+        return self.client.post(
+            reverse("admin:users_customuser_changelist"),
+            {"action": "deactivate_users", "_selected_action": [user.pk for user in users]},
+        )
+
+    def test_delete_account(self):
+        user, = self.create_users(1)
+        user.delete_account()
+        self.assertEqual((user.is_deleted, user.is_active), (True, False))
+        self.assertTrue(user.phone_number.startswith("+998900000000_deleted_"))
+
+    def test_small_selection_is_deactivated_at_once(self):
+        users = self.create_users(3)
+        self.deactivate(users[:2])
+        self.assertEqual(CustomUser.objects.filter(is_deleted=True, is_active=False).count(), 2)
+        self.assertFalse(UserDeactivationJob.objects.exists())
+
+    @override_settings(USER_DEACTIVATION_SYNC_LIMIT=1)
+    def test_large_selection_is_queued(self):
+        users = self.create_users(3)
+        self.deactivate(users)
+        job = UserDeactivationJob.objects.get()
+        self.assertEqual((job.status, job.total, job.last_id), (DeactivationJobStatus.PENDING, 3, users[-1].pk))
+        self.assertFalse(CustomUser.objects.filter(is_deleted=True).exists())
+
+    def test_job_runs_in_chunks_and_skips_later_users(self):
+        users = self.create_users(5)
+        queue_user_deactivation(CustomUser.objects.filter(pk__in=[user.pk for user in users]))
+        later, = self.create_users(1, start=5)
+        job = claim_deactivation_job()
+
+        seen = []
+        run_deactivation_job(job, chunk_size=2, progress=lambda job: seen.append(job.processed))
+
+        self.assertEqual(seen, [2, 4, 5])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.deactivated), (DeactivationJobStatus.DONE, 5, 5))
+        self.assertEqual(CustomUser.objects.filter(is_deleted=True).count(), 5)
+        later.refresh_from_db()
+        self.assertFalse(later.is_deleted)
+
+    def test_worker_stops_when_the_job_was_taken_over(self):
+        users = self.create_users(4)
+        queue_user_deactivation(CustomUser.objects.filter(pk__in=[user.pk for user in users]))
+        job = claim_deactivation_job()
+
+        def take_over(job):
+            # Boshqa ishchi vazifani olib, o'z bo'lagini saqlagan
+            UserDeactivationJob.objects.filter(pk=job.pk).update(processed=3)
+
+        run_deactivation_job(job, chunk_size=2, progress=take_over)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.deactivated), (DeactivationJobStatus.RUNNING, 3, 2))
+        self.assertEqual(CustomUser.objects.filter(is_deleted=True).count(), 2)
@@ -0,0 +1,29 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+
+from apps.users.blacklist import blacklist_filter
+
+
+class FilteredRefreshToken(RefreshToken):
+    """
+    RefreshToken whose blacklist check asks the in-process filter first
+    (``apps.users.blacklist``); the ``BlacklistedToken`` table is queried only
+    when the filter cannot rule the token out.
+    """
+
+    def check_blacklist(self):
+        jti = self.payload.get(api_settings.JTI_CLAIM)
+        if jti is not None and not blacklist_filter.might_be_blacklisted(jti):
+            return
+        super().check_blacklist()
+
+
+class FilteredTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = FilteredRefreshToken
+
+
+__all__ = [
+    'FilteredRefreshToken',
+    'FilteredTokenRefreshSerializer',
+]
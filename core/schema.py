@@ -5,11 +5,26 @@ from rest_framework import permissions
 
 from .generator import BothHttpAndHttpsSchemaGenerator
 
+PAGINATION_DESCRIPTION = """UIC Group
+
+**Pagination.** List endpoints return `{"count", "next", "previous", "results"}`.
+
+* Catalog lists are paged by number: `?page=2&page_size=100` (`page_size` is capped at 500).
+  Add `?count=false` to skip counting the results; `count` is then `null` and `next` is
+  still set while more rows exist.
+* The branch and application lists are paged by cursor: follow the `next`/`previous`
+  links as they are, and set the size with `?page_size=` (at most 200). These
+  responses have no `count`. A cursor is only valid for the `ordering` it was issued
+  with.
+
+`search` and `ordering` work the same way in both modes and are kept in the links.
+"""
+
 schema_view = get_schema_view(
     openapi.Info(
         title="UIC API",
         default_version="v1",
-        description="UIC Group",
+        description=PAGINATION_DESCRIPTION,
         terms_of_service="https://www.google.com/policies/terms/",
         contact=openapi.Contact(email="info@uic.group"),
         license=openapi.License(name="BSD License"),
@@ -36,6 +36,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 LOCAL_APPS = ["apps.users", "apps.applications", "apps.common"]
@@ -136,6 +137,12 @@ STATICFILES_DIRS = (BASE_DIR / "static",)
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Ariza hujjatlari faqat ApplicationDocumentAPIView orqali beriladi. Proksi bo'lsa uzatish unga topshiriladi:
+# "nginx" - X-Accel-Redirect (MEDIA_ACCEL_REDIRECT_PREFIX internal location'i MEDIA_ROOT'ga qaraydi),
+# "xsendfile" - X-Sendfile (Apache/lighttpd). Bo'sh bo'lsa fayl Django'ning o'zidan yuboriladi.
+MEDIA_SENDFILE_BACKEND = os.getenv("MEDIA_SENDFILE_BACKEND") or None
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -150,6 +157,11 @@ EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 EMAIL_USE_SSL = os.getenv("EMAIL_USE_SSL")
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL")
+# Chiquvchi xatlar navbati (send_queued_emails): urinishlar, qayta urinish kutishi va ishchiga ijara muddati
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv("EMAIL_OUTBOX_RETRY_DELAY", 30))
+EMAIL_OUTBOX_MAX_RETRY_DELAY = int(os.getenv("EMAIL_OUTBOX_MAX_RETRY_DELAY", 3600))
+EMAIL_OUTBOX_LEASE = int(os.getenv("EMAIL_OUTBOX_LEASE", 300))
 
 
 CSRF_TRUSTED_ORIGINS = ["http://127.0.0.1:8000", "http://localhost:8000"]
@@ -161,7 +173,7 @@ from core.jazzmin_conf import JAZZMIN_SETTINGS # noqa
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_THROTTLE_CLASSES': [],
     'DEFAULT_THROTTLE_RATES': {},
@@ -169,11 +181,13 @@ REST_FRAMEWORK = {
     'UNAUTHENTICATED_TOKEN': None,
     "DATETIME_FORMAT": "%Y-%m-%d %H:%M:%S",
     "DATETIME_INPUT_FORMATS": ["%Y-%m-%d %H:%M:%S"],
+    'DEFAULT_PAGINATION_CLASS': 'apps.common.pagination.CatalogPagination',
 }
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=40),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=2),
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.tokens.FilteredTokenRefreshSerializer',
 }
 
 SWAGGER_SETTINGS = {
@@ -188,4 +202,31 @@ SWAGGER_SETTINGS = {
     "DOC_EXPANSION": "none",
 }
 
-LOGIN_REDIRECT_URL = '/'
\ No newline at end of file
+LOGIN_REDIRECT_URL = '/'
+# Ma'lumotnoma ro'yxatlari keshi. Bir nechta jarayon uchun fayl keshi:
+# CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache, CACHE_LOCATION=/var/tmp/django_cache
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+CATALOG_CACHE_TIMEOUT = int(os.getenv("CATALOG_CACHE_TIMEOUT", 300))
+CATALOG_CACHE_STALE_TIMEOUT = int(os.getenv("CATALOG_CACHE_STALE_TIMEOUT", 60))
+# Umumiy kesh bo'lmasa, katalog javoblari keshi shuncha soniyadan ortiq saqlanmaydi
+CATALOG_CACHE_LOCAL_MAX_AGE = int(os.getenv("CATALOG_CACHE_LOCAL_MAX_AGE", 30))
+# Javob keshi hisoblagichlari (cache-metrics) keshga har necha soniyada yoziladi
+RESPONSE_CACHE_STATS_FLUSH_INTERVAL = int(os.getenv("RESPONSE_CACHE_STATS_FLUSH_INTERVAL", 10))
+# Umumiy kesh bo'lmasa, ma'lumotnoma katalogi nusxasi shuncha soniyadan keyin qayta quriladi
+REFERENCE_DATA_LOCAL_MAX_AGE = int(os.getenv("REFERENCE_DATA_LOCAL_MAX_AGE", 30))
+# Umumiy kesh bo'lmasa, talablar indeksi ham shuncha soniyadan keyin qayta quriladi
+REQUIREMENTS_INDEX_LOCAL_MAX_AGE = int(os.getenv("REQUIREMENTS_INDEX_LOCAL_MAX_AGE", 30))
+# JWT so'rovlarida foydalanuvchi yozuvi keshi (CachedJWTAuthentication): umumiy kesh va jarayon ichidagi nusxa
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv("AUTH_USER_CACHE_TIMEOUT", 60))
+AUTH_USER_LOCAL_CACHE_TIMEOUT = int(os.getenv("AUTH_USER_LOCAL_CACHE_TIMEOUT", 5))
+
+# Qora ro'yxatdagi refresh tokenlar filtri (apps.users.blacklist): "balki" javoblari ulushi
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = float(os.getenv("TOKEN_BLACKLIST_FILTER_ERROR_RATE", 0.01))
+# Tartibsiz tasdiqlangan yozuvlar uchun bo'sh id qancha kutiladi va filtr har necha soniyada bazadan yangilanadi
+TOKEN_BLACKLIST_GAP_TIMEOUT = int(os.getenv("TOKEN_BLACKLIST_GAP_TIMEOUT", 300))
+TOKEN_BLACKLIST_SYNC_INTERVAL = int(os.getenv("TOKEN_BLACKLIST_SYNC_INTERVAL", 10))
@@ -25,8 +25,10 @@ urlpatterns = [
 
 urlpatterns += swagger_urlpatterns
 
-if not settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# static() faqat DEBUG rejimida ishlaydi; productionda bu fayllarni proksi beradi.
+# Hujjatlar ochiq media manzili orqali berilmaydi, faqat ApplicationDocumentAPIView orqali.
+if settings.DEBUG:
+    urlpatterns += static(f"{settings.MEDIA_URL}avatars/", document_root=settings.MEDIA_ROOT / "avatars")
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
 